@@ -0,0 +1,42 @@
+"""
+Compression benchmark: compares bytes on the wire and CPU cost of gzip for typical result sizes (records of a table
+with a few fields), without compression, with the fast level (1) and with the default level (6). Responses are
+compressed by the server, the client only decompresses them.
+It does not need SurrealDB, usage:
+
+python benchmarks/compression_benchmark.py [max_number_of_records]
+"""
+import gzip
+import json
+import sys
+import time
+
+MAX_COUNT = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+REPEATS = 20
+
+
+def records(count):
+    return [{"id": f"person:{i}", "name": f"John Doe {i}", "email": f"john{i}@example.com", "age": 20 + i % 50,
+             "active": i % 2 == 0, "tags": ["user", "customer"] if i % 3 else ["admin"],
+             "created": f"2024-04-18T11:{i % 60:02}:41.665249Z", "balance": i * 1.25} for i in range(count)]
+
+
+def cpu_per_call(func, data):
+    cpu = time.process_time()
+    for _ in range(REPEATS):
+        result = func(data)
+    return (time.process_time() - cpu) / REPEATS * 1000, result
+
+
+if __name__ == '__main__':
+    print(f"{'records':>8} {'level':>6} {'bytes':>10} {'ratio':>6} {'compress, ms':>13} {'decompress, ms':>15}")
+    count = 1
+    while count <= MAX_COUNT:
+        body = json.dumps({"id": 1, "result": records(count)}).encode()
+        print(f"{count:>8} {'-':>6} {len(body):>10} {1:>6.2f} {0:>13.3f} {0:>15.3f}")
+        for level in (1, 6):
+            compress_ms, compressed = cpu_per_call(lambda data, lvl=level: gzip.compress(data, compresslevel=lvl), body)
+            decompress_ms, _ = cpu_per_call(gzip.decompress, compressed)
+            print(f"{count:>8} {level:>6} {len(compressed):>10} {len(body) / len(compressed):>6.2f} "
+                  f"{compress_ms:>13.3f} {decompress_ms:>15.3f}")
+        count *= 10
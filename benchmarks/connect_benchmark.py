@@ -0,0 +1,35 @@
+"""
+Startup benchmark: opens N websocket connections one by one and then a pool, prints wall and CPU time.
+Start SurrealDB first (see tests/up_db.sh), usage:
+
+python benchmarks/connect_benchmark.py [url] [number_of_connections]
+"""
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from surrealist import DatabaseConnectionsPool, Surreal  # pylint: disable=wrong-import-position
+
+URL = sys.argv[1] if len(sys.argv) > 1 else "http://127.0.0.1:8000"
+COUNT = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+
+def measure(title, func):
+    wall, cpu = time.perf_counter(), time.process_time()
+    result = func()
+    wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+    print(f"{title}: wall {wall:.3f}s, cpu {cpu:.3f}s")
+    return result
+
+
+if __name__ == '__main__':
+    surreal = Surreal(URL, namespace="test", database="test", credentials=("root", "root"))
+    connections = measure(f"{COUNT} connections", lambda: [surreal.connect() for _ in range(COUNT)])
+    for connection in connections:
+        connection.close()
+    pool = measure(f"pool of {COUNT} connections",
+                   lambda: DatabaseConnectionsPool(URL, "test", "test", credentials=("root", "root"),
+                                                   min_connections=COUNT, max_connections=COUNT))
+    pool.close()
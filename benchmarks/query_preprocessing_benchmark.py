@@ -0,0 +1,48 @@
+"""
+Query preprocessing benchmark: compares clean_dates with the previous implementation (not compiled regex on every call)
+on big INSERT queries with and without Surreal dates, and shows the cost of preprocessing turned off (rewrite_dates).
+It does not need SurrealDB, usage:
+
+python benchmarks/query_preprocessing_benchmark.py [number_of_records]
+"""
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from surrealist.ql.statements import Insert  # pylint: disable=wrong-import-position
+from surrealist.utils import clean_dates  # pylint: disable=wrong-import-position
+
+COUNT = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+REPEATS = 20
+
+
+def previous_clean_dates(data: str) -> str:
+    return re.sub(r'["\'](d(["\']).+?)["\']+', r'\1\2', data)
+
+
+def queries(count):
+    records = [{"name": f"John Doe {i}", "email": f"john{i}@example.com", "age": 20 + i % 50,
+                "tags": ["user", "customer"]} for i in range(count)]
+    with_dates = [{**record, "born": "d'2000-01-01T00:00:00Z'"} for record in records]
+    return {"no dates": Insert(None, "person", records).to_str(),
+            "with dates": Insert(None, "person", with_dates).to_str()}
+
+
+def ms_per_call(func, data):
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        func(data)
+    return (time.perf_counter() - start) / REPEATS * 1000
+
+
+if __name__ == '__main__':
+    print(f"{COUNT} records, {REPEATS} repeats")
+    print(f"{'query':>11} {'size, MB':>9} {'previous, ms':>13} {'clean_dates, ms':>16} {'rewrite_dates=False, ms':>24}")
+    for name, query in queries(COUNT).items():
+        previous = ms_per_call(previous_clean_dates, query)
+        current = ms_per_call(clean_dates, query)
+        off = ms_per_call(lambda text: text, query)
+        print(f"{name:>11} {len(query) / 2 ** 20:>9.2f} {previous:>13.3f} {current:>16.3f} {off:>24.3f}")
@@ -0,0 +1,99 @@
+"""
+Result benchmark: compares to_result with the previous implementation (SurrealResult built from **kwargs with a copy of
+each frame) on typical small responses of websocket and http, and shows the memory of one result.
+It does not need SurrealDB, usage:
+
+python benchmarks/result_benchmark.py [number_of_calls]
+"""
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import List
+
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from surrealist.result import SurrealResult, to_result  # pylint: disable=wrong-import-position
+
+COUNT = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+FRAMES = {
+    "ws select": {"id": "b307d67f-b01b-4b71-a319-906fa17b8c72", "result": [{"id": "person:john", "age": 22}]},
+    "ws error": {"id": "b307d67f-b01b-4b71-a319-906fa17b8c72",
+                 "error": {"code": -32000, "message": "There was a problem with the database: Parse error"}},
+    "http query": [{"result": [{"id": "person:john", "age": 22}], "status": "OK", "time": "32.375µs"}],
+    "http 2 queries": [{"result": [1], "status": "OK", "time": "1µs"}, {"result": [2], "status": "OK", "time": "1µs"}],
+}
+
+
+class PreviousResult:
+    """
+    SurrealResult.__init__ before slots, only to compare
+    """
+
+    def __init__(self, **kwargs):
+        self.ws_id = kwargs.pop("id", None)
+        self.result = kwargs.pop("result", None)
+        self.code = kwargs.pop("code", None)
+        self.query = kwargs.pop("query", None)
+        self.status = kwargs.pop("status", "OK")
+        self.time = kwargs.pop("time", None)
+        if "information" in kwargs:
+            self.result = kwargs.pop("information")
+        if "error" in kwargs:
+            self.result = kwargs.pop("error")
+            self.status = "ERR"
+        if "token" in kwargs:
+            self.result = kwargs.pop("token")
+        if self.code and self.code != 200:
+            self.status = "ERR"
+        self.additional_info = kwargs
+        if self.status == "ERR" and isinstance(self.result, dict) and "code" in self.result and \
+                "message" in self.result:
+            self.code = self.result["code"]
+            self.result = self.result["message"]
+        if self.result and isinstance(self.result, str) and "There was a problem with the database:" in self.result:
+            self.result = self.result.split(":", 1)[1].strip()
+
+
+def previous_is_result_inside(a_dict) -> bool:
+    return len(a_dict) in (1, 2) and "result" in a_dict and isinstance(a_dict["result"], List) \
+        and len(a_dict["result"]) == 1 and set(a_dict["result"][0].keys()) == {"time", "status", "result"}
+
+
+def previous_to_result(content):
+    if isinstance(content, List):
+        if len(content) == 1:
+            return PreviousResult(**content[0])
+        return PreviousResult(result=[PreviousResult(**e) for e in content])
+    if previous_is_result_inside(content):
+        res = PreviousResult(**content["result"][0])
+        res.ws_id = content.get("id")
+        return res
+    return PreviousResult(**content)
+
+
+def us_per_call(func, frame):
+    start = time.perf_counter()
+    for _ in range(COUNT):
+        func(frame)
+    return (time.perf_counter() - start) / COUNT * 1_000_000
+
+
+def bytes_per_result(func, frame):
+    tracemalloc.start()
+    results = [func(frame) for _ in range(10_000)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del results
+    return size / 10_000
+
+
+if __name__ == '__main__':
+    print(f"{COUNT} calls, slots: {SurrealResult.__slots__}")
+    print(f"{'frame':>15} {'previous, µs':>13} {'to_result, µs':>14} {'previous, B':>12} {'to_result, B':>13}")
+    for name, frame in FRAMES.items():
+        previous = us_per_call(previous_to_result, frame)
+        current = us_per_call(to_result, frame)
+        previous_size = bytes_per_result(previous_to_result, frame)
+        current_size = bytes_per_result(to_result, frame)
+        print(f"{name:>15} {previous:>13.3f} {current:>14.3f} {previous_size:>12.0f} {current_size:>13.0f}")
@@ -0,0 +1,91 @@
+"""
+Serializer benchmark: compares safe_dumps with the previous implementation (two passes per container, string splicing)
+on nested payloads with record ids, like data of INSERT and CONTENT statements.
+It does not need SurrealDB, usage:
+
+python benchmarks/serializer_benchmark.py [number_of_records]
+"""
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from surrealist import RecordId  # pylint: disable=wrong-import-position
+from surrealist.utils import safe_dumps  # pylint: disable=wrong-import-position
+
+COUNT = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+REPEATS = 3
+
+
+def previous_dumps(data: Any) -> str:
+    if isinstance(data, RecordId):
+        return data.to_valid_string()
+    if isinstance(data, List):
+        return previous_list(data)
+    if isinstance(data, Tuple):
+        return previous_tuple(data)
+    if isinstance(data, Dict):
+        return previous_dict(data)
+    return json.dumps(data)
+
+
+def previous_dict(data: Dict) -> str:
+    ids = {k: v for k, v in data.items() if isinstance(v, (RecordId, List, Dict))}
+    if not ids:
+        return json.dumps(data)
+    without_ids = {k: v for k, v in data.items() if k not in ids}
+    first = json.dumps(without_ids) if without_ids else ""
+    join = ", ".join([f'"{k}": {previous_dumps(v)}' for k, v in ids.items()])
+    first = f"{first.rstrip('}')}, " if first else "{"
+    return f"{first}{join}}}"
+
+
+def previous_list(data: List) -> str:
+    ids = [e for e in data if isinstance(e, (RecordId, List, Dict, Tuple))]
+    if not ids:
+        return json.dumps(data)
+    without_ids = [e for e in data if e not in ids]
+    first = json.dumps(without_ids) if without_ids else ""
+    join = ", ".join(previous_dumps(e) for e in ids)
+    first = f"{first.rstrip(']')}, " if first else "["
+    return f"{first}{join}]"
+
+
+def previous_tuple(values: Tuple) -> str:
+    ids = [e for e in values if isinstance(e, (RecordId, List, Dict, Tuple))]
+    if not ids:
+        return f'({json.dumps(values).lstrip("[").rstrip("]")})'
+    without_ids = [e for e in values if e not in ids]
+    first = json.dumps(without_ids).lstrip("[").rstrip("]")
+    first = f"{first}, " if first else ""
+    join = ", ".join(previous_dumps(e) for e in ids)
+    return f"({first}{join})"
+
+
+def payloads(count):
+    plain = [{"name": f"John Doe {i}", "age": 20 + i % 50, "tags": ["user", "customer"],
+              "address": {"city": "Paris", "zip": f"{i:05}"}} for i in range(count)]
+    with_ids = [{"id": RecordId(f"person:p{i}"), "name": f"John Doe {i}", "age": 20 + i % 50,
+                 "friends": [RecordId(f"person:p{i + 1}"), RecordId(f"person:p{i + 2}")],
+                 "address": {"city": "Paris", "zip": f"{i:05}"}} for i in range(count)]
+    return {"nested, no ids": plain, "nested with ids": with_ids, "flat ids": [RecordId(f"person:p{i}")
+                                                                              for i in range(count)]}
+
+
+def ms_per_call(func, data):
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        func(data)
+    return (time.perf_counter() - start) / REPEATS * 1000
+
+
+if __name__ == '__main__':
+    print(f"{COUNT} records, {REPEATS} repeats")
+    print(f"{'payload':>16} {'previous, ms':>13} {'safe_dumps, ms':>15} {'speedup':>8}")
+    for name, payload in payloads(COUNT).items():
+        previous = ms_per_call(previous_dumps, payload)
+        current = ms_per_call(safe_dumps, payload)
+        print(f"{name:>16} {previous:>13.2f} {current:>15.2f} {previous / current:>8.1f}")
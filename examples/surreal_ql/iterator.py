@@ -15,3 +15,7 @@ with Database("http://127.0.0.1:8000", 'test', 'test', credentials=("user_db", "
         res = next(iterator)  # here, only one query performs at a time, then paused
         if res.count() < 100:  # if we get less than 100, it is mean - no more records
             break
+
+    # keyset pagination: each page starts after the last id of the previous one, so all pages cost the same
+    for result in db.table("user").select().iter(limit=1000, key="id"):
+        print(result.count())
@@ -1,7 +1,9 @@
-from .connections import Connection, HttpConnection, WebSocketConnection
-from .enums import Algorithm, AutoOrNone
+from .connections import (AsyncWebSocketConnection, Connection, HttpConnection,
+                          WebSocketConnection)
+from .enums import Algorithm, AutoOrNone, RoutingPolicy
 from .errors import *
-from .ql import Database, DatabaseConnectionsPool, Table, Where
+from .ql import (AsyncDatabase, AsyncTable, CompiledStatement, Database,
+                 DatabaseConnectionsPool, Param, Table, Where)
 from .record_id import RecordId
 from .result import SurrealResult
 from .surreal import Surreal
@@ -11,4 +13,6 @@ __all__ = ("Surreal", "SurrealResult", "WebSocketConnection", "HttpConnection",
            "HttpClientError", "SurrealConnectionError", "WebSocketConnectionError", "WebSocketConnectionClosedError",
            "ConnectionParametersError", "CompatibilityError", "OperationOnClosedConnectionError", "WrongCallError",
            "Connection", "get_uuid", "Database", "Table", "Where", "DatabaseConnectionsPool", "AutoOrNone",
-           "to_surreal_datetime_str", "to_datetime", "LOG_FORMAT", "Algorithm", "RecordId", "SurrealRecordIdError")
+           "to_surreal_datetime_str", "to_datetime", "LOG_FORMAT", "Algorithm", "RecordId", "SurrealRecordIdError",
+           "AsyncWebSocketConnection", "AsyncDatabase", "AsyncTable", "PoolExhaustedError",
+           "RoutingPolicy", "QueryError", "Param", "CompiledStatement")
@@ -0,0 +1,148 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from itertools import islice
+from logging import getLogger
+from typing import (Any, Callable, Dict, Iterable, Iterator, List, Optional,
+                    Set, Tuple)
+
+from surrealist.errors import PySurrealError, WrongParameterError
+from surrealist.result import SurrealResult
+
+logger = getLogger("surrealist.bulk")
+DEFAULT_CHUNK_SIZE = 1000
+DEFAULT_CONCURRENCY = 4
+DEFAULT_RETRIES = 3
+# delay before the first retry of a chunk, it doubles on each next retry
+RETRY_DELAY = 0.5
+
+
+class BulkInsertReport:
+    """
+    Represents the result of bulk insert: number of inserted and failed rows and chunks, retries, errors and speed
+    """
+
+    def __init__(self):
+        self.rows = 0
+        self.failed_rows = 0
+        self.chunks = 0
+        self.failed_chunks = 0
+        self.retries = 0
+        self.seconds = 0.0
+        self.errors: List[str] = []
+
+    @property
+    def rows_per_second(self) -> float:
+        """
+        Returns the speed of the insert
+
+        :return: number of inserted rows per second
+        """
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def is_error(self) -> bool:
+        """
+        Checks some chunks were not inserted even after all retries
+
+        :return: True if there are failed chunks
+        """
+        return self.failed_chunks > 0
+
+    def __repr__(self):
+        return f"BulkInsertReport(rows={self.rows}, failed_rows={self.failed_rows}, chunks={self.chunks}, " \
+               f"failed_chunks={self.failed_chunks}, retries={self.retries}, seconds={self.seconds:.3f}, " \
+               f"rows_per_second={self.rows_per_second:.1f})"
+
+
+def chunked(records: Iterable[Dict], chunk_size: int) -> Iterator[List[Dict]]:
+    """
+    Lazily splits records into lists of chunk_size records (the last one can be shorter)
+
+    :param records: any iterable, including a generator
+    :param chunk_size: number of records in a chunk
+    :return: iterator of chunks
+    """
+    iterator = iter(records)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _insert_chunk(insert: Callable[[List[Dict]], SurrealResult], chunk: List[Dict],
+                  retries: int) -> Tuple[int, Optional[str]]:
+    """
+    Inserts the chunk, retries on errors
+
+    :return: pair of the number of retries and the last error (None if the chunk was inserted)
+    """
+    error = None
+    for attempt in range(retries + 1):
+        if attempt:
+            time.sleep(RETRY_DELAY * 2 ** (attempt - 1))
+        try:
+            result = insert(chunk)
+        except (PySurrealError, TimeoutError, OSError) as e:
+            error = f"{type(e).__name__}: {e}"
+        else:
+            if not result.is_error():
+                return attempt, None
+            error = str(result.result)
+        logger.warning("Chunk of %s records is not inserted (attempt %s), error: %s", len(chunk), attempt + 1, error)
+    return retries, error
+
+
+def bulk_insert(insert: Callable[[List[Dict]], SurrealResult], records: Iterable[Dict], *,
+                chunk_size: int = DEFAULT_CHUNK_SIZE, concurrency: int = DEFAULT_CONCURRENCY,
+                retries: int = DEFAULT_RETRIES,
+                on_progress: Optional[Callable[[BulkInsertReport], Any]] = None) -> BulkInsertReport:
+    """
+    Inserts records by chunks, up to concurrency chunks are in flight at the same time. Records are consumed lazily,
+    so no more than chunk_size * (concurrency + 1) records are in memory, whatever the size of the input is.
+    A failed chunk is retried with exponential backoff. Note: a retry is not idempotent, if the chunk was inserted,
+    but the response was lost (a timeout or a broken connection), the retry fails with "already exists" error for
+    records with ids (so the chunk is reported as failed, though its records are in the table), records without ids
+    are inserted twice. Check errors of the report in this case
+
+    :param insert: function to insert one chunk, for example, lambda chunk: connection.insert("person", chunk)
+    :param records: any iterable of records, a generator is consumed lazily
+    :param chunk_size: number of records in one request
+    :param concurrency: maximum number of chunks in flight
+    :param retries: number of retries for a failed chunk
+    :param on_progress: optional function to call with the report after each chunk
+    :return: report of the insert
+    :raise WrongParameterError: if chunk_size or concurrency is less than 1, or retries is negative
+    """
+    if chunk_size < 1 or concurrency < 1 or retries < 0:
+        raise WrongParameterError("chunk_size and concurrency should be positive, retries cannot be negative")
+    report = BulkInsertReport()
+    start = time.monotonic()
+
+    def collect(done: Set[Future]):
+        for future in done:
+            size, (retried, error) = futures[future], future.result()
+            del futures[future]
+            report.chunks += 1
+            report.retries += retried
+            if error is None:
+                report.rows += size
+            else:
+                report.failed_chunks += 1
+                report.failed_rows += size
+                report.errors.append(error)
+            report.seconds = time.monotonic() - start
+            if on_progress is not None:
+                on_progress(report)
+
+    futures: Dict[Future, int] = {}
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="surrealist-bulk") as executor:
+        for chunk in chunked(records, chunk_size):
+            if len(futures) >= concurrency:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                collect(done)
+            futures[executor.submit(_insert_chunk, insert, chunk, retries)] = len(chunk)
+        done, _ = wait(futures)
+        collect(done)
+    report.seconds = time.monotonic() - start
+    logger.info("Bulk insert is finished: %s", report)
+    return report
@@ -0,0 +1,355 @@
+"""
+Minimal CBOR (RFC 8949) encoder and decoder with SurrealDB custom tags, used by the CBOR protocol of websocket transport
+
+Refer to: https://surrealdb.com/docs/surrealdb/integration/cbor
+"""
+import datetime
+import re
+import struct
+import uuid
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Tuple, Union
+
+from surrealist.errors import TooManyNestedLevelsError
+from surrealist.record_id import RecordId
+
+TAG_DATETIME_STR = 0
+TAG_NONE = 6
+TAG_TABLE = 7
+TAG_RECORD_ID = 8
+TAG_UUID_STR = 9
+TAG_DECIMAL_STR = 10
+TAG_DATETIME = 12
+TAG_DURATION_STR = 13
+TAG_DURATION = 14
+TAG_UUID = 37
+EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+DURATION_UNITS = {"ns": 1, "us": 1_000, "µs": 1_000, "ms": 1_000_000, "s": 1_000_000_000, "m": 60_000_000_000,
+                  "h": 3_600_000_000_000, "d": 86_400_000_000_000, "w": 604_800_000_000_000,
+                  "y": 31_536_000_000_000_000}
+DURATION_PART = re.compile(r"(\d+)(ns|us|µs|ms|s|m|h|d|w|y)")
+MAX_INT_ID = 2 ** 63
+NESTED_ERROR = "Cant serialize object, too many nested levels"
+
+
+def _head(major: int, value: int, buffer: bytearray):
+    major <<= 5
+    if value < 24:
+        buffer.append(major | value)
+    elif value < 0x100:
+        buffer.append(major | 24)
+        buffer.append(value)
+    elif value < 0x10000:
+        buffer.append(major | 25)
+        buffer += struct.pack(">H", value)
+    elif value < 0x100000000:
+        buffer.append(major | 26)
+        buffer += struct.pack(">I", value)
+    else:
+        buffer.append(major | 27)
+        buffer += struct.pack(">Q", value)
+
+
+def _encode_int(value: int, buffer: bytearray):
+    if value >= 0:
+        if value < 0x10000000000000000:
+            _head(0, value, buffer)
+            return
+        _head(6, 2, buffer)
+        _encode_bytes(value.to_bytes((value.bit_length() + 7) // 8, "big"), buffer)
+        return
+    value = -1 - value
+    if value < 0x10000000000000000:
+        _head(1, value, buffer)
+        return
+    _head(6, 3, buffer)
+    _encode_bytes(value.to_bytes((value.bit_length() + 7) // 8, "big"), buffer)
+
+
+def _encode_str(value: str, buffer: bytearray):
+    data = value.encode("utf-8")
+    _head(3, len(data), buffer)
+    buffer += data
+
+
+def _encode_bytes(value: bytes, buffer: bytearray):
+    _head(2, len(value), buffer)
+    buffer += value
+
+
+def _encode_float(value: float, buffer: bytearray):
+    buffer.append(0xfb)
+    buffer += struct.pack(">d", value)
+
+
+def _encode_list(value: Union[List, Tuple], buffer: bytearray):
+    _head(4, len(value), buffer)
+    for element in value:
+        _encode(element, buffer)
+
+
+def _encode_dict(value: Dict, buffer: bytearray):
+    _head(5, len(value), buffer)
+    for key, element in value.items():
+        _encode(key, buffer)
+        _encode(element, buffer)
+
+
+def _encode_record_id(value: RecordId, buffer: bytearray):
+    _head(6, TAG_RECORD_ID, buffer)
+    buffer.append(0x82)  # array of two elements
+    _encode_str(value.table_part, buffer)
+    id_value = value.value
+    if id_value is None:
+        # the type of the id is unknown, the same as SurrealQL does for person:1, numeric id is a number
+        id_part = value.id_part
+        id_value = int(id_part) if id_part.isascii() and id_part.isdigit() and int(id_part) < MAX_INT_ID else id_part
+    _encode(id_value, buffer)
+
+
+def _encode_datetime(value: datetime.datetime, buffer: bytearray):
+    if value.tzinfo is None:
+        # SurrealDB works with UTC, so we expect naive datetime to be in UTC too
+        value = value.replace(tzinfo=datetime.timezone.utc)
+    delta = value - EPOCH
+    seconds = delta.days * 86_400 + delta.seconds
+    _head(6, TAG_DATETIME, buffer)
+    _encode_list([seconds, delta.microseconds * 1_000], buffer)
+
+
+def _encode_duration(value: datetime.timedelta, buffer: bytearray):
+    _head(6, TAG_DURATION, buffer)
+    _encode_list([value.days * 86_400 + value.seconds, value.microseconds * 1_000], buffer)
+
+
+def _encode_uuid(value: uuid.UUID, buffer: bytearray):
+    _head(6, TAG_UUID, buffer)
+    _encode_bytes(value.bytes, buffer)
+
+
+def _encode_decimal(value: Decimal, buffer: bytearray):
+    _head(6, TAG_DECIMAL_STR, buffer)
+    _encode_str(str(value), buffer)
+
+
+ENCODERS: Dict[type, Callable[[Any, bytearray], None]] = {
+    str: _encode_str, int: _encode_int, float: _encode_float, dict: _encode_dict, list: _encode_list,
+    tuple: _encode_list, bytes: _encode_bytes, bytearray: _encode_bytes, RecordId: _encode_record_id,
+    datetime.datetime: _encode_datetime, datetime.timedelta: _encode_duration, uuid.UUID: _encode_uuid,
+    Decimal: _encode_decimal,
+}
+
+
+def _encode(value: Any, buffer: bytearray):
+    if value is None:
+        buffer.append(0xf6)
+        return
+    if value is True:
+        buffer.append(0xf5)
+        return
+    if value is False:
+        buffer.append(0xf4)
+        return
+    encoder = ENCODERS.get(type(value))
+    if encoder is None:
+        for type_, func in ENCODERS.items():
+            if isinstance(value, type_):
+                encoder = func
+                break
+        else:
+            raise TypeError(f"Object of type {type(value).__name__} is not CBOR serializable")
+    encoder(value, buffer)
+
+
+def encode(value: Any) -> bytes:
+    """
+    Encodes python object to CBOR, RecordId, datetime, timedelta (duration), UUID and Decimal are encoded with
+    SurrealDB tags
+
+    :param value: object to encode
+    :return: CBOR bytes
+    :raise TypeError: if object cannot be encoded
+    :raise TooManyNestedLevelsError: if object is too deep
+    """
+    buffer = bytearray()
+    try:
+        _encode(value, buffer)
+    except RecursionError as e:
+        raise TooManyNestedLevelsError(NESTED_ERROR) from e
+    return bytes(buffer)
+
+
+def parse_duration(text: str) -> datetime.timedelta:
+    """
+    Converts SurrealDB duration string (for example, 1h30m or 1d2h3m4s5ms) to timedelta
+
+    :param text: duration string
+    :return: timedelta object
+    :raise ValueError: if text is not a valid duration
+    """
+    parts = DURATION_PART.findall(text)
+    if not parts or "".join(f"{num}{unit}" for num, unit in parts) != text:
+        raise ValueError(f"Invalid duration: {text}")
+    nanos = sum(int(num) * DURATION_UNITS[unit] for num, unit in parts)
+    return datetime.timedelta(microseconds=nanos // 1_000)
+
+
+def _parse_datetime(text: str) -> datetime.datetime:
+    main, _, fraction = text.rstrip("Z").partition(".")
+    result = datetime.datetime.strptime(main, "%Y-%m-%dT%H:%M:%S")
+    if fraction:
+        result = result.replace(microsecond=int(fraction[:6].ljust(6, "0")))
+    return result.replace(tzinfo=datetime.timezone.utc)
+
+
+def _to_record_id(value: List) -> Union[RecordId, str]:
+    table, id_ = value
+    if isinstance(id_, (str, int, uuid.UUID)):
+        # the type of the id is kept: person:⟨1⟩ is not person:1
+        return RecordId.from_parts(table, id_)
+    # complex ids (arrays and objects) cannot be represented as RecordId
+    return f"{table}:{id_}"
+
+
+def _from_compact(value: List) -> Tuple[int, int]:
+    seconds = value[0] if len(value) > 0 else 0
+    nanos = value[1] if len(value) > 1 else 0
+    return seconds, nanos
+
+
+def _to_datetime(value: List) -> datetime.datetime:
+    seconds, nanos = _from_compact(value)
+    return EPOCH + datetime.timedelta(seconds=seconds, microseconds=nanos // 1_000)
+
+
+def _to_duration(value: List) -> datetime.timedelta:
+    seconds, nanos = _from_compact(value)
+    return datetime.timedelta(seconds=seconds, microseconds=nanos // 1_000)
+
+
+TAGS: Dict[int, Callable[[Any], Any]] = {
+    TAG_DATETIME_STR: _parse_datetime,
+    TAG_NONE: lambda _: None,
+    TAG_TABLE: str,
+    TAG_RECORD_ID: _to_record_id,
+    TAG_UUID_STR: uuid.UUID,
+    TAG_DECIMAL_STR: Decimal,
+    TAG_DATETIME: _to_datetime,
+    TAG_DURATION_STR: parse_duration,
+    TAG_DURATION: _to_duration,
+    TAG_UUID: lambda value: uuid.UUID(bytes=bytes(value)),
+    2: lambda value: int.from_bytes(value, "big"),
+    3: lambda value: -1 - int.from_bytes(value, "big"),
+}
+
+
+class _Decoder:
+    """
+    Decodes one CBOR item from bytes
+    """
+
+    def __init__(self, data: bytes):
+        self._data = data
+        self._pos = 0
+
+    def _read(self, length: int) -> bytes:
+        end = self._pos + length
+        if end > len(self._data):
+            raise ValueError("Unexpected end of CBOR data")
+        chunk = self._data[self._pos:end]
+        self._pos = end
+        return chunk
+
+    def _length(self, info: int) -> int:
+        if info < 24:
+            return info
+        if info == 24:
+            return self._read(1)[0]
+        if info == 25:
+            return struct.unpack(">H", self._read(2))[0]
+        if info == 26:
+            return struct.unpack(">I", self._read(4))[0]
+        if info == 27:
+            return struct.unpack(">Q", self._read(8))[0]
+        if info == 31:
+            return -1
+        raise ValueError(f"Invalid CBOR additional info {info}")
+
+    def _chunks(self, major: int) -> bytes:
+        result = bytearray()
+        while self._data[self._pos] != 0xff:
+            initial = self._read(1)[0]
+            if initial >> 5 != major:
+                raise ValueError("Invalid chunk in indefinite CBOR string")
+            result += self._read(self._length(initial & 0x1f))
+        self._pos += 1
+        return bytes(result)
+
+    def decode(self) -> Any:
+        # pylint: disable=too-many-return-statements, too-many-branches
+        initial = self._read(1)[0]
+        major, info = initial >> 5, initial & 0x1f
+        if major == 7:
+            if info == 20:
+                return False
+            if info == 21:
+                return True
+            if info in (22, 23):
+                return None
+            if info == 25:
+                return struct.unpack(">e", self._read(2))[0]
+            if info == 26:
+                return struct.unpack(">f", self._read(4))[0]
+            if info == 27:
+                return struct.unpack(">d", self._read(8))[0]
+            raise ValueError(f"Unsupported CBOR simple value {info}")
+        length = self._length(info)
+        if major == 0:
+            return length
+        if major == 1:
+            return -1 - length
+        if major == 2:
+            return self._read(length) if length >= 0 else self._chunks(2)
+        if major == 3:
+            return (self._read(length) if length >= 0 else self._chunks(3)).decode("utf-8")
+        if major == 4:
+            if length >= 0:
+                return [self.decode() for _ in range(length)]
+            result = []
+            while self._data[self._pos] != 0xff:
+                result.append(self.decode())
+            self._pos += 1
+            return result
+        if major == 5:
+            result = {}
+            if length >= 0:
+                for _ in range(length):
+                    key = self.decode()
+                    result[key] = self.decode()
+                return result
+            while self._data[self._pos] != 0xff:
+                key = self.decode()
+                result[key] = self.decode()
+            self._pos += 1
+            return result
+        # major == 6, it is a tag
+        value = self.decode()
+        converter = TAGS.get(length)
+        return converter(value) if converter else value
+
+
+def decode(data: Union[bytes, bytearray, memoryview]) -> Any:
+    """
+    Decodes CBOR bytes to python object, SurrealDB tags are converted to RecordId, datetime, timedelta, UUID and Decimal
+
+    :param data: CBOR bytes
+    :return: python object
+    :raise ValueError: if data is not a valid CBOR
+    :raise TooManyNestedLevelsError: if object is too deep
+    """
+    try:
+        return _Decoder(bytes(data)).decode()
+    except RecursionError as e:
+        raise TooManyNestedLevelsError(NESTED_ERROR) from e
+    except (IndexError, struct.error, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid CBOR data: {e}") from e
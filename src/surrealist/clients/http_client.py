@@ -1,25 +1,189 @@
-import json
+import gzip
+import select
+import threading
+import time
 import urllib.parse
-import urllib.request
-from http.client import HTTPResponse, RemoteDisconnected
-from logging import getLogger
-from typing import BinaryIO, Dict, Optional, Tuple, Union
-from urllib.error import HTTPError, URLError
+import zlib
+from collections import deque
+from http.client import (HTTPConnection, HTTPException, HTTPResponse,
+                         HTTPSConnection, RemoteDisconnected)
+from logging import DEBUG, getLogger
+from typing import BinaryIO, Deque, Dict, Optional, Tuple, Union
 
-from surrealist.errors import HttpClientError, TooManyNestedLevelsError
-from surrealist.utils import AC, DB, DEFAULT_TIMEOUT, ENCODING, NS, mask_pass
+from surrealist.codecs import DEFAULT_CODEC, Codec
+from surrealist.errors import HttpClientError
+from surrealist.utils import (AC, DB, DEFAULT_TIMEOUT, ENCODING, NS,
+                              LogValue)
 
 logger = getLogger("surrealist.clients.http")
+ACCEPT_ENCODING = "gzip, deflate"
+DEFAULT_POOL_SIZE = 10
+# SurrealDB (as most servers) closes idle keep-alive connections itself, so we do not keep them too long
+DEFAULT_IDLE_TIMEOUT = 30
+# errors of a keep-alive connection, which was closed by the server while it was idle in the pool
+STALE_ERRORS = (RemoteDisconnected, ConnectionResetError, ConnectionAbortedError, BrokenPipeError)
+# methods, which are safe to repeat, if the connection was broken after the request was sent (RPC uses POST)
+IDEMPOTENT_METHODS = frozenset(("GET", "HEAD", "PUT", "DELETE", "OPTIONS"))
+
+
+def is_dropped(connection: HTTPConnection) -> bool:
+    """
+    Checks an idle keep-alive connection was closed by the server: there is nothing to read from an idle connection,
+    so a readable socket means the server closed it
+
+    :param connection: idle connection
+    :return: True if the connection cannot be reused
+    """
+    if connection.sock is None:
+        return False
+    try:
+        return bool(select.select([connection.sock], [], [], 0)[0])
+    except (OSError, ValueError):
+        return True
+
+
+class KeepAlivePool:
+    """
+    Thread-safe pool of persistent HTTP/1.1 connections to one host. A connection is taken for a request and returned
+    back after its response is read, so the next request goes without TCP (and TLS) handshake.
+
+    There can be more connections in use at the same time, than the size of the pool, but no more than size of them
+    stay idle, extra ones are closed on return. Idle connections older than idle_timeout are closed too.
+    """
+
+    def __init__(self, base_url: str, timeout: int = DEFAULT_TIMEOUT, size: int = DEFAULT_POOL_SIZE,
+                 idle_timeout: float = DEFAULT_IDLE_TIMEOUT):
+        url = urllib.parse.urlparse(base_url)
+        self._scheme = url.scheme
+        self._host = url.hostname
+        self._port = url.port
+        self._timeout = timeout
+        self._size = size
+        self._idle_timeout = idle_timeout
+        self._idle: Deque[Tuple[HTTPConnection, float]] = deque()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> Tuple[HTTPConnection, bool]:
+        """
+        Returns an idle connection or a new one, if there are no idle connections
+
+        :return: pair of the connection and a flag, is it an idle (reused) one
+        :raise HttpClientError: if the scheme of the url is not http or https
+        """
+        now = time.monotonic()
+        with self._lock:
+            while self._idle:
+                # the most recent connection is the least likely to be closed by the server
+                connection, last_used = self._idle.pop()
+                if now - last_used < self._idle_timeout and not is_dropped(connection):
+                    return connection, True
+                connection.close()
+        if self._scheme == "http":
+            return HTTPConnection(self._host, self._port, timeout=self._timeout), False
+        if self._scheme == "https":
+            return HTTPSConnection(self._host, self._port, timeout=self._timeout), False
+        raise HttpClientError(f"Unsupported scheme {self._scheme}, use http or https")
+
+    def release(self, connection: HTTPConnection):
+        """
+        Returns connection to the pool, closes it if the pool is full
+
+        :param connection: connection with a fully read response
+        """
+        with self._lock:
+            if len(self._idle) < self._size:
+                self._idle.append((connection, time.monotonic()))
+                return
+        connection.close()
+
+    def close(self):
+        """
+        Closes all idle connections
+        """
+        with self._lock:
+            idle, self._idle = self._idle, deque()
+        for connection, _ in idle:
+            connection.close()
+
+    def idle_count(self) -> int:
+        """
+        Returns the number of idle connections in the pool
+        """
+        return len(self._idle)
+
+
+class PooledResponse:
+    """
+    Response of the HttpClient, it returns the connection to the pool when the body is read and the response is closed
+    (use it as a context manager)
+    """
+
+    def __init__(self, response: HTTPResponse, connection: HTTPConnection, pool: KeepAlivePool):
+        self._response = response
+        self._connection = connection
+        self._pool = pool
+
+    @property
+    def status(self) -> int:
+        """
+        Returns the status code of the response
+        :return: status code
+        """
+        return self._response.status
+
+    @property
+    def headers(self):
+        """
+        Returns the headers of the response
+        :return: headers as HTTPMessage
+        """
+        return self._response.headers
+
+    def read(self) -> bytes:
+        """
+        Reads the whole body of the response
+        :return: body as bytes
+        """
+        return self._response.read()
+
+    def close(self):
+        """
+        Returns the connection to the pool if the response was fully read and server keeps the connection alive,
+        otherwise closes the connection
+        """
+        if self._connection is None:
+            return
+        connection, self._connection = self._connection, None
+        if self._response.isclosed() and not self._response.will_close:
+            self._pool.release(connection)
+        else:
+            self._response.close()
+            connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_details):
+        self.close()
 
 
 class HttpClient:
     """
-    Http-client for working with http endpoints and abilities of SurrealDB
+    Http-client for working with http endpoints and abilities of SurrealDB. It reuses persistent HTTP/1.1
+    connections from its own bounded pool (pool_size idle connections at most, each of them lives no more than
+    idle_timeout seconds without requests), a connection closed by the server is replaced with a new one.
+
+    If compression is True, the client asks for compressed responses (gzip or deflate), use **read** to decompress
+    them, request bodies are always sent as is
     """
 
     def __init__(self, base_url: str, headers: Optional[Dict] = None, credentials: Optional[Tuple[str, str]] = None,
-                 timeout: int = DEFAULT_TIMEOUT):
+                 timeout: int = DEFAULT_TIMEOUT, codec: Optional[Codec] = None, compression: bool = False,
+                 pool_size: int = DEFAULT_POOL_SIZE, idle_timeout: float = DEFAULT_IDLE_TIMEOUT):
         self._base_url = base_url
+        self._path = urllib.parse.urlparse(base_url).path or "/"
+        self._pool = KeepAlivePool(base_url, timeout, pool_size, idle_timeout)
+        self._codec = codec or DEFAULT_CODEC
         self._credentials = credentials
         self._timeout = timeout
         headers = headers or {}
@@ -27,6 +191,8 @@ class HttpClient:
         headers = {k if k not in (NS, DB) else f"surreal-{k}": v for k, v in headers.items()}
         self._headers = {"Content-Type": "application/json", "Accept": "application/json",
                          "User-Agent": "surrealist http-client", **headers}
+        if compression:
+            self._headers["Accept-Encoding"] = ACCEPT_ENCODING
         self._token = None
 
     def set_token(self, token: str) -> None:
@@ -47,7 +213,7 @@ class HttpClient:
         self._headers = {**self._headers, **params}
         self._headers = {k if k not in (NS, DB) else f"surreal-{k}": v for k, v in self._headers.items()}
 
-    def get(self, path: str = '') -> HTTPResponse:
+    def get(self, path: str = '') -> PooledResponse:
         """
         Represents GET method
         :param path: endpoint to request
@@ -55,7 +221,7 @@ class HttpClient:
         """
         return self.request("GET", None, path)
 
-    def post(self, data: Dict, path: str = '') -> HTTPResponse:
+    def post(self, data: Dict, path: str = '') -> PooledResponse:
         """
         Represents POST method
         :param data: json or bytes data
@@ -64,7 +230,7 @@ class HttpClient:
         """
         return self.request("POST", data, path)
 
-    def put(self, data: Dict, path: str = '') -> HTTPResponse:
+    def put(self, data: Dict, path: str = '') -> PooledResponse:
         """
         Represents POST method
         :param data: json or bytes data
@@ -73,7 +239,7 @@ class HttpClient:
         """
         return self.request("PUT", data, path)
 
-    def patch(self, data: Dict, path: str = '') -> HTTPResponse:
+    def patch(self, data: Dict, path: str = '') -> PooledResponse:
         """
         Represents POST method
         :param data: json or bytes data
@@ -83,47 +249,78 @@ class HttpClient:
         return self.request("PATCH", data, path)
 
     def request(self, method: str, data: Optional[Union[Dict, str, BinaryIO]], path: str = '',
-                type_of_content: str = "JSON") -> Union[HTTPResponse, HTTPError]:
+                type_of_content: str = "JSON") -> PooledResponse:
         """
-        Main method to perform all kinds of requests
+        Main method to perform all kinds of requests, response with any status code is returned, use it as a context
+        manager to return the connection to the pool
 
         :param method: method name
         :param data: data to send
         :param path: endpoint
         :param type_of_content: flag to handle data
         :return: response to use
+        :raise HttpClientError: if cant connect or the connection was broken
         """
-        response = None
         url = f'{self._base_url}{path}'
         options = {'method': method, 'headers': self._headers}
         if method not in ("GET", "DELETE"):
             if type_of_content == "JSON":
-                try:
-                    data_to_send = json.dumps(data, ensure_ascii=False).encode(ENCODING)
-                except RecursionError as e:
-                    logger.error("Cant serialize object, too many nested levels")
-                    raise TooManyNestedLevelsError("Cant serialize object, too many nested levels") from e
+                data_to_send = self._codec.encode(data)
             elif type_of_content == "STR":
                 data_to_send = data.encode(ENCODING)
             else:  # it is a file-like object (BinaryIO)
                 data_to_send = data
             options['data'] = data_to_send
-        try:
-            req = urllib.request.Request(url, **options)
+        if logger.isEnabledFor(DEBUG):
             logger.debug("Request to %s, options: %s, timeout: %d", url, mask_opts(options), self._timeout)
-            response = urllib.request.urlopen(req, timeout=self._timeout)
-            return response
-        except HTTPError as e:
-            logger.error("Http error on request %s, info: %s", url, e)
-            if response:
-                response.close()
-            # we need it to check status code and text on error
-            return e
-        except (URLError, RemoteDisconnected, ConnectionResetError) as e:
-            if response:
-                response.close()
-            logger.error("Error on connecting to %s, info: %s", url, e)
-            raise HttpClientError(f"Error on connecting to '{url}'") from e
+        while True:
+            connection, reused = self._pool.acquire()
+            sent = False
+            try:
+                connection.request(method, f"{self._path}{path}", body=options.get('data'),
+                                   headers=options['headers'])
+                sent = True
+                return PooledResponse(connection.getresponse(), connection, self._pool)
+            except STALE_ERRORS as e:
+                connection.close()
+                # the server closed idle keep-alive connection, so we repeat on another one, but only if the server
+                # did not get the request or the request is safe to repeat
+                repeatable = not sent or method in IDEMPOTENT_METHODS
+                if reused and repeatable and not hasattr(options.get('data'), "read"):
+                    logger.debug("Connection to %s was closed by the server, reconnect", url)
+                    continue
+                logger.error("Error on connecting to %s, info: %s", url, e)
+                raise HttpClientError(f"Error on connecting to '{url}'") from e
+            except (OSError, HTTPException) as e:
+                connection.close()
+                logger.error("Error on connecting to %s, info: %s", url, e)
+                raise HttpClientError(f"Error on connecting to '{url}'") from e
+
+    def close(self):
+        """
+        Closes all idle connections of the client
+        """
+        self._pool.close()
+
+    @staticmethod
+    def read(response: PooledResponse) -> bytes:
+        """
+        Reads the body of the response, decompresses it if it was compressed by the server
+
+        :param response: response of the request method
+        :return: body as bytes
+        """
+        body = response.read()
+        encoding = (response.headers.get("Content-Encoding") or "").lower()
+        if encoding == "gzip":
+            return gzip.decompress(body)
+        if encoding == "deflate":
+            try:
+                return zlib.decompress(body)
+            except zlib.error:
+                # some servers send raw deflate stream without zlib header
+                return zlib.decompress(body, -zlib.MAX_WBITS)
+        return body
 
 
 def mask_opts(options: Dict) -> Dict:
@@ -138,6 +335,6 @@ def mask_opts(options: Dict) -> Dict:
         if key == "headers" and "Authorization" in value:
             value = {**value, "Authorization": "Bearer ******"}
         elif key == "data":
-            value = mask_pass(str(value))
+            value = LogValue(value, mask=True)
         masked_opts[key] = value
     return masked_opts
@@ -1,66 +1,86 @@
-import json
+import random
 import threading
-import time
-from json import JSONDecodeError
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from logging import getLogger
-from queue import Empty, Queue
-from typing import Callable, Dict, Optional
+from typing import Callable, Dict, Optional, Tuple, Union
 
 import websocket
 
-from surrealist.errors import (TooManyNestedLevelsError,
-                               WebSocketConnectionClosedError)
+from surrealist.codecs import DEFAULT_CODEC, Codec
+from surrealist.errors import WebSocketConnectionClosedError
 from surrealist.result import SurrealResult, to_result
-from surrealist.utils import DEFAULT_TIMEOUT, get_uuid, mask_pass
+from surrealist.utils import DEFAULT_TIMEOUT, LogValue, get_uuid
 
 logger = getLogger("surrealist.clients.websocket")
+DEFAULT_RECONNECT_ATTEMPTS = 5
+# exponential backoff between reconnect attempts: 0.1, 0.2, 0.4 ... seconds, but no more than 10 seconds
+RECONNECT_DELAY = 0.1
+MAX_RECONNECT_DELAY = 10
 
 
 class WebSocketClient:
     """
-    Synchronous thread-safe client to work with websockets, always wait a response for message, comparing by id (uuid).
-    Every client creates at least two threads (in and out)
+    Thread-safe client to work with websockets, matches a response to its request by id (uuid).
+    Every client creates at least two threads (in and out).
+
+    Requests can be sent in a blocking way with **send** or pipelined with **submit**, which returns a future at once,
+    so one thread can have a lot of requests in flight on the same socket
+
+    If the connection drops, the client reconnects with exponential backoff (no more than reconnect_attempts times in a
+    row), requests in flight fail at once, new requests wait for the reconnect. After reconnect, on_reconnect is called
+    in a separate thread to restore the session, only its requests are sent until it finishes
     """
 
-    def __init__(self, base_url: str, timeout: int = DEFAULT_TIMEOUT):
+    def __init__(self, base_url: str, timeout: int = DEFAULT_TIMEOUT, codec: Optional[Codec] = None,
+                 reconnect_attempts: int = DEFAULT_RECONNECT_ATTEMPTS,
+                 on_reconnect: Optional[Callable[[], None]] = None):
         self._ws = None
+        self._codec = codec or DEFAULT_CODEC
+        # None - connecting (or reconnecting), True - ready to work, False - closed for good
         self._connected = None
         self._timeout = timeout
         self._base_url = base_url
+        self._callbacks = {}
+        self._messages: Dict[str, Tuple[Future, Dict, Optional[Callable]]] = {}
+        self._reconnect_attempts = reconnect_attempts
+        self._on_reconnect = on_reconnect
+        self._attempt = 0
+        self._was_opened = False
+        self._restoring_thread: Optional[threading.Thread] = None
+        # requests, which were made while reconnecting, they are sent after the session is restored
+        self._delayed: Dict[str, Tuple[Future, Dict, Optional[Callable]]] = {}
+        self._stopped = threading.Event()
+        # notified on open and close, so waiting for the connection state costs no CPU
+        self._state_changed = threading.Condition()
         thread = threading.Thread(target=self.run, daemon=True)
         thread.start()
         logger.debug("Connecting to %s", base_url)
         self._raise_on_wait(lambda: self._connected is True, timeout=timeout,
                             error_text=f"Not connected to {self._base_url}")
-        self._callbacks = {}
-        self._messages: Dict[str, Queue] = {}
         logger.debug("Connected to %s, timeout is %s seconds", base_url, timeout)
 
-    def on_message(self, _ws, message: str):
+    def on_message(self, _ws, message: Union[str, bytes]):
         """
         Called on a message received from the websocket connection.
 
         :param _ws: connection object
-        :param message: string message
+        :param message: string message (or bytes for a binary protocol)
         """
-        logger.debug("Get message %s", message)
+        logger.debug("Get message %s", LogValue(message))
         try:
-            mess = json.loads(message)
-        except JSONDecodeError as je:
-            # Should never happen, all messages via json
-            logger.error("Got non-json response %s", message, exc_info=True)
-            raise ValueError(f"Got non-json response! {message}") from je
-        except RecursionError as e:
-            logger.error("Cant deserialize object, too many nested levels")
-            raise TooManyNestedLevelsError("Cant serialize object, too many nested levels") from e
+            mess = self._codec.loads(message)
+        except ValueError as je:
+            # Should never happen, all messages via chosen protocol
+            logger.error("Got non-%s response %s", self._codec.protocol, message, exc_info=True)
+            raise ValueError(f"Got non-{self._codec.protocol} response! {message}") from je
         if "id" in mess:
-            id_ = mess["id"]
-            self._messages[id_].put_nowait(mess)
+            self._resolve(mess)
         else:
             # no id at top level = live query received
             if 'result' in mess:
                 live_id = mess['result']['id']
-                callback = self._callbacks.get(live_id)
+                callback = self._callbacks.get(str(live_id))
                 if callback:
                     logger.debug("Use callback for %s", live_id)
                     callback(mess)
@@ -83,29 +103,94 @@ class WebSocketClient:
         """
         return bool(self._connected)
 
+    def is_reconnecting(self) -> bool:
+        """
+        Shows is a websocket client lost the connection and tries to reconnect now
+
+        :return: True if reconnecting, False otherwise
+        """
+        return self._connected is None and self._was_opened
+
     def on_open(self, _ws):
         """
         Callback on establishing new connection
         """
-        self._connected = True
+        self._attempt = 0
+        if self._was_opened and self._on_reconnect:
+            logger.info("Reconnected to %s, restoring the session", self._base_url)
+            self._restoring_thread = threading.Thread(target=self._restore, daemon=True)
+            self._restoring_thread.start()
+            return
+        self._was_opened = True
+        self._set_state(True)
 
     def on_close(self, *_ignore):
         """
         Callback on closing websocket connection
         """
-        self._connected = False
+        reconnect = self._was_opened and self._reconnect_attempts > 0 and not self._stopped.is_set()
+        self._set_state(None if reconnect else False)
+        self._fail_pending()
         logger.debug("Close connection to %s", self._base_url)
 
     def run(self):
         """
-        Constantly waiting for messages on websocket connection, runs in separate thread
+        Constantly waiting for messages on websocket connection, runs in separate thread. Reconnects with exponential
+        backoff if the connection was lost
 
         :return: None
         """
-        self._ws = websocket.WebSocketApp(self._base_url, header={'sec-websocket-protocol': 'json'},
-                                          on_open=self.on_open, on_message=self.on_message,
-                                          on_error=self.on_error, on_close=self.on_close)
-        self._ws.run_forever(skip_utf8_validation=True)  # works faster
+        while True:
+            self._ws = websocket.WebSocketApp(self._base_url, header={'sec-websocket-protocol': self._codec.protocol},
+                                              on_open=self.on_open, on_message=self.on_message,
+                                              on_error=self.on_error, on_close=self.on_close)
+            self._ws.run_forever(skip_utf8_validation=True)  # works faster
+            if not self._was_opened:
+                # the first connect failed, nothing to restore
+                self._set_state(False)
+                return
+            if self._connected is False or self._stopped.is_set():
+                return
+            self._attempt += 1
+            if self._attempt > self._reconnect_attempts:
+                logger.error("Cant reconnect to %s after %s attempts", self._base_url, self._reconnect_attempts)
+                self._set_state(False)
+                return
+            delay = min(MAX_RECONNECT_DELAY, RECONNECT_DELAY * 2 ** (self._attempt - 1))
+            # jitter, so a lot of clients do not reconnect at the same moment
+            delay *= random.uniform(0.5, 1.0)
+            logger.warning("Connection to %s lost, reconnect attempt %s in %.2f seconds", self._base_url,
+                           self._attempt, delay)
+            if self._stopped.wait(delay):
+                return
+
+    def _restore(self):
+        # live queries will be registered again with new ids
+        self._callbacks.clear()
+        try:
+            self._on_reconnect()
+        except (WebSocketConnectionClosedError, websocket.WebSocketConnectionClosedException):
+            logger.warning("Connection to %s lost while restoring the session", self._base_url)
+            return
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.error("Cant restore the session on %s, closing. Info: %s", self._base_url, e)
+            self.close()
+            return
+        finally:
+            self._restoring_thread = None
+        with self._state_changed:
+            # the client can be closed while restoring, then its socket is already deleted
+            if not self._stopped.is_set() and self._ws.sock and self._ws.sock.connected:
+                self._set_state(True)
+
+    def _set_state(self, state: Optional[bool]):
+        with self._state_changed:
+            self._connected = state
+            self._state_changed.notify_all()
+        if state is True:
+            self._send_delayed()
+        elif state is False:
+            self._fail_pending()
 
     def send(self, data: Dict, callback: Optional[Callable] = None) -> SurrealResult:
         """
@@ -117,51 +202,140 @@ class WebSocketClient:
         :raise TimeoutError: if no response and time is over
         :raise WebSocketConnectionClosed: if the connection was closed while waiting
         """
+        id_, future = self._submit(data, callback)
+        try:
+            return future.result(timeout=self._timeout)
+        except FutureTimeoutError as exc:
+            self._forget(id_)
+            raise TimeoutError(f"Time exceeded: {self._timeout} seconds, no response received") from exc
+
+    def submit(self, data: Dict, callback: Optional[Callable] = None) -> Future:
+        """
+        Method to send messages to SurrealDB without waiting for a response. It returns a future at once, so you can
+        send a lot of requests on the same socket and collect results later.
+
+        Example:
+        futures = [client.submit({"method": "select", "params": [f"person:{i}"]}) for i in range(100)]
+        results = [future.result(timeout=10) for future in futures]
+
+        Note: the client does not apply its own timeout to a future, use timeout argument of future.result for that.
+        If you do not wait for the result anymore, cancel the future, so the client forgets the request.
+        If the client is reconnecting now, the request will be sent after the session is restored
+
+        :param data: dict with request parameters
+        :param callback: function to call on a live query, it is set only for a live method
+        :return: future, which will contain the result of the request (SurrealResult)
+        """
+        return self._submit(data, callback)[1]
+
+    def _submit(self, data: Dict, callback: Optional[Callable] = None) -> Tuple[str, Future]:
         id_ = get_uuid()
         data = {"id": id_, **data}
+        future = Future()
+        if data['method'] not in ("live", "kill") and "additional" not in data:
+            # nobody waits for a cancelled request, but callbacks of live queries are managed on response anyway
+            future.add_done_callback(lambda done: self._forget(id_) if done.cancelled() else None)
+        if self._connected is not True and threading.current_thread() is not self._restoring_thread:
+            with self._state_changed:
+                if self._connected is False:
+                    raise WebSocketConnectionClosedError("Connection is closed")
+                if self._connected is None:
+                    # the connection is lost, so the request waits for reconnect and session restore
+                    self._delayed[id_] = (future, data, callback)
+                    return id_, future
+        self._send_now(future, data, callback)
+        return id_, future
+
+    def _send_now(self, future: Future, data: Dict, callback: Optional[Callable]):
+        id_ = data["id"]
         to_send = data if "additional" not in data else {k: v for k, v in data.items() if k != "additional"}
+        if self._codec.binary:
+            payload, opcode = self._codec.encode(to_send), websocket.ABNF.OPCODE_BINARY
+            logger.debug("Send data: %s", LogValue(to_send, mask=True))
+        else:
+            payload, opcode = self._codec.dumps(to_send), websocket.ABNF.OPCODE_TEXT
+            logger.debug("Send data: %s", LogValue(payload, mask=True))
+        # the response can come before send returns, so we need to register the future first, under the same lock,
+        # which _fail_pending takes, so the future is not registered after the connection was closed
+        with self._state_changed:
+            if self._connected is False:
+                raise WebSocketConnectionClosedError("Connection is closed")
+            self._messages[id_] = (future, data, callback)
         try:
-            data_string = json.dumps(to_send, ensure_ascii=False)
-        except RecursionError as e:
-            logger.error("Cant serialize object, too many nested levels")
-            raise TooManyNestedLevelsError("Cant serialize object, too many nested levels") from e
-        logger.debug("Send data: %s", mask_pass(data_string))
-        self._messages[id_] = Queue(maxsize=1)
-        self._ws.send(data_string)
-        res = self._get_by_id(id_)
-        if data['method'] in ('live', 'kill') or "additional" in data:
-            if 'error' not in res:
-                # now we know live or kill was successful, so now we need to manage callbacks
-                self._on_success(data, callback, res)
-        return to_result(res)
+            self._ws.send(payload, opcode)
+        except (websocket.WebSocketConnectionClosedException, OSError) as e:
+            # the connection is lost, but the client has not noticed it yet
+            self._messages.pop(id_, None)
+            raise WebSocketConnectionClosedError("Connection is closed") from e
+        except Exception:
+            self._messages.pop(id_, None)
+            raise
+
+    def _send_delayed(self):
+        with self._state_changed:
+            delayed, self._delayed = self._delayed, {}
+        for future, data, callback in delayed.values():
+            if not future.cancelled():
+                try:
+                    self._send_now(future, data, callback)
+                except Exception as e:  # pylint: disable=broad-exception-caught
+                    if future.set_running_or_notify_cancel():
+                        future.set_exception(e)
+
+    def _forget(self, id_: str):
+        self._messages.pop(id_, None)
+        with self._state_changed:
+            self._delayed.pop(id_, None)
+
+    def _resolve(self, message: Dict):
+        pending = self._messages.pop(message["id"], None)
+        if pending is None:
+            logger.warning("Got a response for unknown or expired request: %s", message)
+            return
+        future, data, callback = pending
+        if not future.set_running_or_notify_cancel():
+            # the caller is not interested anymore (future was cancelled), but callbacks should still be managed
+            future = Future()
+        try:
+            if data['method'] in ('live', 'kill') or "additional" in data:
+                if 'error' not in message:
+                    # now we know live or kill was successful, so now we need to manage callbacks
+                    self._on_success(data, callback, message)
+            future.set_result(to_result(message))
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            future.set_exception(e)
+
+    def _fail_pending(self):
+        """
+        Fails all requests which are still waiting for a response, so nobody waits for a closed connection. Requests,
+        which are waiting for reconnect, fail only if the client is closed for good
+        """
+        with self._state_changed:
+            pending, self._messages = self._messages, {}
+            if self._connected is False:
+                pending.update(self._delayed)
+                self._delayed = {}
+        for future, _, _ in pending.values():
+            if future.set_running_or_notify_cancel():
+                future.set_exception(WebSocketConnectionClosedError("Connection closed while a client waits on it"))
 
     def _on_success(self, data: Dict, callback: Callable, result: Dict):
         if data['method'] == 'kill':
             logger.debug("Delete callback for %s", data['params'][0])
-            self._callbacks[data['params'][0]] = None
+            self._callbacks[str(data['params'][0])] = None
         else:
             # custom query returns nested result
             key = result['result'] if data['method'] == 'live' else result['result'][0]['result']
             logger.debug("Set callback for %s", result['result'])
-            self._callbacks[key] = callback
-
-    def _get_by_id(self, id_) -> Dict:
-        try:
-            result = self._messages[id_].get(timeout=self._timeout)
-        except Empty as exc:
-            raise TimeoutError(f"Time exceeded: {self._timeout} seconds, no response received") from exc
-        finally:
-            del self._messages[id_]
-        return result
+            self._callbacks[str(key)] = callback
 
-    def _wait_until(self, predicate, timeout, period=0.0005):
-        must_end = time.time() + timeout
-        while time.time() < must_end:
-            if self._connected is False:
-                return False, "CLOSED"
+    def _wait_until(self, predicate, timeout):
+        with self._state_changed:
+            self._state_changed.wait_for(lambda: self._connected is False or predicate(), timeout)
             if predicate():
                 return True, None
-            time.sleep(period)
+            if self._connected is False:
+                return False, "CLOSED"
         return False, "TIME"
 
     def _raise_on_wait(self, predicate, timeout, error_text):
@@ -186,9 +360,11 @@ class WebSocketClient:
         """
         Close websocket client and close websocket connection, you cannot use this object after close
         """
-        self._connected = False
-        self._ws.close()
-        del self._ws
-        self._messages.clear()
+        self._stopped.set()
+        self._set_state(False)
+        with self._state_changed:
+            self._ws.close()
+            del self._ws
+        self._fail_pending()
         self._callbacks.clear()
         logger.debug("Client is closed connection to %s", self._base_url)
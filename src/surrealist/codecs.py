@@ -0,0 +1,249 @@
+import json
+import uuid
+from logging import getLogger
+from typing import Any, Optional, Union
+
+from surrealist import cbor
+from surrealist.errors import (CompatibilityError, SurrealRecordIdError,
+                               TooManyNestedLevelsError, WrongParameterError)
+from surrealist.record_id import RecordId
+from surrealist.utils import ENCODING
+
+logger = getLogger("surrealist.codecs")
+NESTED_ERROR = "Cant serialize object, too many nested levels"
+# indexes of params, which are record ids or tables for rpc methods
+RECORD_TARGETS = {"select": (0,), "create": (0,), "update": (0,), "upsert": (0,), "insert": (0,),
+                  "insert_relation": (0,), "merge": (0,), "delete": (0,), "patch": (0,), "relate": (0, 2)}
+
+
+class Codec:
+    """
+    Represents the way of encoding and decoding all data on the wire (requests and responses), by default it is the
+    standard json library. Faster libraries can be used, if they are installed: orjson, ujson or msgspec
+
+    Refer to: https://github.com/kotolex/surrealist?tab=readme-ov-file#json-codecs
+    """
+    name = "json"
+    # name of the websocket sub-protocol and the kind of frames to use for it
+    protocol = "json"
+    binary = False
+
+    def dumps(self, data: Any) -> str:
+        """
+        Serializes data to a json string
+        :param data: any json serializable object
+        :return: json string
+        :raise TooManyNestedLevelsError: if the object is too deep to serialize
+        """
+        try:
+            return json.dumps(data, ensure_ascii=False)
+        except RecursionError as e:
+            logger.error(NESTED_ERROR)
+            raise TooManyNestedLevelsError(NESTED_ERROR) from e
+
+    def encode(self, data: Any) -> bytes:
+        """
+        Serializes data to json bytes, ready to send
+        :param data: any json serializable object
+        :return: utf-8 bytes
+        :raise TooManyNestedLevelsError: if the object is too deep to serialize
+        """
+        return self.dumps(data).encode(ENCODING)
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        """
+        Deserializes json string or bytes
+        :param data: json text
+        :return: python object
+        :raise ValueError: if data is not a valid json
+        :raise TooManyNestedLevelsError: if the object is too deep to deserialize
+        """
+        try:
+            return json.loads(data)
+        except RecursionError as e:
+            logger.error(NESTED_ERROR)
+            raise TooManyNestedLevelsError(NESTED_ERROR) from e
+
+    def __repr__(self):
+        return f"{type(self).__name__}(name={self.name})"
+
+
+class OrjsonCodec(Codec):
+    """
+    Codec based on orjson library, it should be installed (pip install orjson)
+    """
+    name = "orjson"
+
+    def __init__(self):
+        try:
+            import orjson  # pylint: disable=import-outside-toplevel
+        except ImportError as e:
+            raise CompatibilityError("orjson is not installed, use pip install orjson") from e
+        self._orjson = orjson
+        self._options = orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, data: Any) -> str:
+        return self.encode(data).decode(ENCODING)
+
+    def encode(self, data: Any) -> bytes:
+        try:
+            return self._orjson.dumps(data, option=self._options)
+        except self._orjson.JSONEncodeError as e:
+            if "Recursion" in str(e):
+                logger.error(NESTED_ERROR)
+                raise TooManyNestedLevelsError(NESTED_ERROR) from e
+            raise
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        try:
+            return self._orjson.loads(data)
+        except RecursionError as e:
+            logger.error(NESTED_ERROR)
+            raise TooManyNestedLevelsError(NESTED_ERROR) from e
+
+
+class UjsonCodec(Codec):
+    """
+    Codec based on ujson library, it should be installed (pip install ujson)
+    """
+    name = "ujson"
+
+    def __init__(self):
+        try:
+            import ujson  # pylint: disable=import-outside-toplevel
+        except ImportError as e:
+            raise CompatibilityError("ujson is not installed, use pip install ujson") from e
+        self._ujson = ujson
+
+    def dumps(self, data: Any) -> str:
+        try:
+            return self._ujson.dumps(data, ensure_ascii=False)
+        except (RecursionError, OverflowError) as e:
+            logger.error(NESTED_ERROR)
+            raise TooManyNestedLevelsError(NESTED_ERROR) from e
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        try:
+            return self._ujson.loads(data)
+        except RecursionError as e:
+            logger.error(NESTED_ERROR)
+            raise TooManyNestedLevelsError(NESTED_ERROR) from e
+
+
+class MsgspecCodec(Codec):
+    """
+    Codec based on msgspec library, it should be installed (pip install msgspec)
+    """
+    name = "msgspec"
+
+    def __init__(self):
+        try:
+            import msgspec  # pylint: disable=import-outside-toplevel
+        except ImportError as e:
+            raise CompatibilityError("msgspec is not installed, use pip install msgspec") from e
+        self._msgspec = msgspec
+        self._encoder = msgspec.json.Encoder()
+        self._decoder = msgspec.json.Decoder()
+
+    def dumps(self, data: Any) -> str:
+        return self.encode(data).decode(ENCODING)
+
+    def encode(self, data: Any) -> bytes:
+        try:
+            return self._encoder.encode(data)
+        except RecursionError as e:
+            logger.error(NESTED_ERROR)
+            raise TooManyNestedLevelsError(NESTED_ERROR) from e
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        try:
+            return self._decoder.decode(data)
+        except self._msgspec.DecodeError as e:
+            raise ValueError(str(e)) from e
+        except RecursionError as e:
+            logger.error(NESTED_ERROR)
+            raise TooManyNestedLevelsError(NESTED_ERROR) from e
+
+
+class CborCodec(Codec):
+    """
+    Codec for the binary CBOR protocol of SurrealDB, works only with websocket transport. RecordId, datetime,
+    timedelta (duration), UUID and Decimal are sent and received as native SurrealDB types, so no string conversion
+    is needed
+
+    Refer to: https://surrealdb.com/docs/surrealdb/integration/cbor
+    """
+    name = "cbor"
+    protocol = "cbor"
+    binary = True
+
+    def dumps(self, data: Any) -> str:
+        raise CompatibilityError("CBOR is a binary protocol, use encode instead")
+
+    def encode(self, data: Any) -> bytes:
+        return cbor.encode(_with_native_targets(data))
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        if isinstance(data, str):
+            raise ValueError(f"Expected CBOR bytes, but got text: {data}")
+        return cbor.decode(data)
+
+
+def _to_record_id(value: Any) -> Any:
+    if isinstance(value, str) and ":" in value:
+        try:
+            return RecordId(value)
+        except (SurrealRecordIdError, ValueError):
+            return value
+    return value
+
+
+def _with_native_targets(data: Any) -> Any:
+    """
+    With json protocol SurrealDB parses strings like "person:john" as record ids, but with CBOR strings are just
+    strings, so we need to send targets of rpc methods as record ids and live query ids as UUIDs
+    """
+    if not isinstance(data, dict) or "method" not in data or not data.get("params"):
+        return data
+    method, params = data["method"], list(data["params"])
+    for index in RECORD_TARGETS.get(method, ()):
+        if index < len(params):
+            params[index] = _to_record_id(params[index])
+    if method == "create" and len(params) > 1 and isinstance(params[1], dict) and "id" in params[1]:
+        params[1] = {**params[1], "id": _to_record_id(params[1]["id"])}
+    if method == "kill" and isinstance(params[0], str):
+        try:
+            params[0] = uuid.UUID(params[0])
+        except ValueError:
+            pass
+    return {**data, "params": params}
+
+
+CODECS = {codec.name: codec for codec in (Codec, OrjsonCodec, UjsonCodec, MsgspecCodec, CborCodec)}
+DEFAULT_CODEC = Codec()
+
+
+def get_codec(codec: Optional[Union[str, Codec]] = None) -> Codec:
+    """
+    Returns codec object by its name. Name "auto" means the fastest installed library: orjson, msgspec, ujson and
+    standard json at last
+
+    :param codec: name of the codec (json, orjson, ujson, msgspec, cbor, auto) or codec object itself, None means json
+    :return: codec object
+    :raise CompatibilityError: if the library for the codec is not installed
+    :raise WrongParameterError: if there is no codec with such name
+    """
+    if codec is None:
+        return DEFAULT_CODEC
+    if isinstance(codec, Codec):
+        return codec
+    if codec == "auto":
+        for name in ("orjson", "msgspec", "ujson"):
+            try:
+                return CODECS[name]()
+            except CompatibilityError:
+                continue
+        return DEFAULT_CODEC
+    if codec not in CODECS:
+        raise WrongParameterError(f"Unknown codec {codec}, use one of: {', '.join(CODECS)}, auto")
+    return DEFAULT_CODEC if codec == Codec.name else CODECS[codec]()
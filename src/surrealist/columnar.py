@@ -0,0 +1,330 @@
+from importlib import import_module
+from typing import Any, Dict, Iterable, List, Optional
+
+from surrealist.errors import CompatibilityError, WrongParameterError
+
+# kinds of columns from the narrowest, a column is widened when it gets values of a wider kind
+NULL, BOOL, INT, FLOAT, OBJECT = "null", "bool", "int", "float", "object"
+NUMPY_TYPES = {NULL: "object", BOOL: "bool", INT: "int64", FLOAT: "float64", OBJECT: "object"}
+# values in buffers for nulls, nulls themselves are in the mask
+FILLERS = {NULL: None, BOOL: False, INT: 0, FLOAT: 0.0, OBJECT: None}
+DEFAULT_CAPACITY = 1024
+# numpy kinds of dtypes (bool, int, unsigned int and float), which hints of Arrow and pandas types are used for
+NUMERIC = "biuf"
+
+
+def import_optional(name: str):
+    """
+    Imports optional dependency for columnar export
+
+    :param name: name of the package: numpy, pyarrow or pandas
+    :return: module
+    :raise CompatibilityError: if the package is not installed
+    """
+    try:
+        return import_module(name)
+    except ImportError as e:
+        raise CompatibilityError(f"{name} is not installed, use pip install {name}") from e
+
+
+def infer_kind(values: Iterable[Any]) -> str:
+    """
+    Returns the narrowest kind of column for values, None is null in any kind
+
+    :param values: values of the column
+    :return: one of null, bool, int, float or object
+    """
+    kind = NULL
+    for value in values:
+        if value is not None:
+            kind = widen(kind, _kind_of(value))
+            if kind == OBJECT:
+                break
+    return kind
+
+
+def _kind_of(value: Any) -> str:
+    kind = type(value)
+    if kind is bool:
+        return BOOL
+    if kind is int:
+        return INT
+    if kind is float:
+        return FLOAT
+    return OBJECT
+
+
+def widen(first: str, second: str) -> str:
+    """
+    Returns the kind of column, which can keep values of both kinds: ints and floats are floats, any other mix
+    (bools and numbers too) is object
+
+    :param first: kind of column
+    :param second: kind of new values
+    :return: common kind
+    """
+    if second in (first, NULL):
+        return first
+    if first == NULL:
+        return second
+    if {first, second} == {INT, FLOAT}:
+        return FLOAT
+    return OBJECT
+
+
+def to_columns(records: List[Dict], fields: Optional[List[str]] = None) -> Dict[str, List]:
+    """
+    Converts records to columns of plain python lists, it needs no dependencies
+
+    :param records: list of records (dicts)
+    :param fields: fields to take, all fields of all records (in order of appearance) by default
+    :return: dict of field name and list of its values, None for records without this field
+    :raise WrongParameterError: if a record is not a dict
+    """
+    _check_records(records)
+    if fields is None:
+        fields = list(dict.fromkeys(key for record in records for key in record))
+    return {field: [record.get(field) for record in records] for field in fields}
+
+
+def arrow_dtypes(types: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Converts Arrow types of fields to numpy dtypes of column buffers, only bool and numeric types are converted,
+    other fields are inferred
+
+    :param types: Arrow types for fields, for example, {"age": pyarrow.int32()}
+    :return: numpy dtypes for fields
+    :raise CompatibilityError: if numpy is not installed
+    """
+    np = import_optional("numpy")
+    dtypes = {}
+    for field, type_ in (types or {}).items():
+        try:
+            dtype = np.dtype(type_.to_pandas_dtype())
+        except NotImplementedError:
+            continue
+        if dtype.kind in NUMERIC:
+            dtypes[field] = dtype
+    return dtypes
+
+
+def pandas_dtypes(dtypes: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Converts pandas dtypes of fields (including nullable ones, like "Int64") to numpy dtypes of column buffers, only
+    bool and numeric types are converted, other fields are inferred
+
+    :param dtypes: pandas dtypes for fields, for example, {"age": "Int64"}
+    :return: numpy dtypes for fields
+    :raise CompatibilityError: if numpy or pandas is not installed
+    """
+    np = import_optional("numpy")
+    pd = import_optional("pandas")
+    result = {}
+    for field, dtype in (dtypes or {}).items():
+        dtype = pd.api.types.pandas_dtype(dtype)
+        dtype = getattr(dtype, "numpy_dtype", dtype)
+        if isinstance(dtype, np.dtype) and dtype.kind in NUMERIC:
+            result[field] = dtype
+    return result
+
+
+def _check_records(records: List) -> None:
+    for record in records:
+        if not isinstance(record, dict):
+            raise WrongParameterError(f"Only records (objects) can be converted to columns, got {record!r}")
+
+
+class _Column:
+    """
+    Growable numpy buffer of one field with the mask of nulls, the buffer is preallocated and doubled when it is full
+    """
+    __slots__ = ("_np", "kind", "hinted", "data", "mask")
+
+    def __init__(self, np, capacity: int, dtype: Optional[Any] = None):
+        self._np = np
+        self.hinted = dtype is not None
+        self.kind = NULL
+        self.data = np.empty(capacity, dtype=dtype if self.hinted else NUMPY_TYPES[NULL])
+        self.mask = None
+
+    def _reserve(self, size: int, used: int):
+        if size <= len(self.data):
+            return
+        capacity = max(size, 2 * len(self.data))
+        data = self._np.empty(capacity, dtype=self.data.dtype)
+        data[:used] = self.data[:used]
+        self.data = data
+        if self.mask is not None:
+            mask = self._np.zeros(capacity, dtype=bool)
+            mask[:used] = self.mask[:used]
+            self.mask = mask
+
+    def put(self, values: List, start: int):
+        """
+        Puts values to the buffer from the start position, widens the buffer if values do not fit its kind
+        """
+        if not self.hinted:
+            kind = widen(self.kind, infer_kind(values))
+            if kind != self.kind:
+                if self.kind == NULL:
+                    # all previous values are nulls in the mask
+                    self.data = self._np.full(len(self.data), FILLERS[kind], dtype=NUMPY_TYPES[kind])
+                else:
+                    self.data = self.data.astype(NUMPY_TYPES[kind])
+                self.kind = kind
+        end = start + len(values)
+        self._reserve(end, start)
+        if None in values and (self.hinted or self.kind != OBJECT):
+            if self.mask is None:
+                self.mask = self._np.zeros(len(self.data), dtype=bool)
+            filler = FILLERS[self.kind] if not self.hinted else self._np.zeros(1, dtype=self.data.dtype)[0]
+            nulls = [value is None for value in values]
+            self.mask[start:end] = nulls
+            values = [filler if null else value for value, null in zip(values, nulls)]
+        self.data[start:end] = values
+
+    def fill_nulls(self, start: int, end: int):
+        """
+        Marks values from start to end as nulls, for the field, which is absent in the records
+        """
+        self._reserve(end, start)
+        if self.kind == OBJECT and not self.hinted:
+            self.data[start:end] = None
+            return
+        if self.mask is None:
+            self.mask = self._np.zeros(len(self.data), dtype=bool)
+        self.mask[start:end] = True
+
+    def nulls(self, size: int):
+        """
+        Returns the mask of nulls or None if there are no nulls
+        """
+        if self.mask is None or not self.mask[:size].any():
+            return None
+        return self.mask[:size]
+
+
+class ColumnBuilder:
+    """
+    Collects records page by page directly to preallocated numpy column buffers: values of each field are put to
+    its buffer, no intermediate structures are kept between pages. The schema is inferred from values (bool, int64,
+    float64 or object) and widened, if the next page does not fit it, dtypes hints fix the type of the field.
+    Result can be exported to numpy arrays, Arrow RecordBatch or pandas DataFrame.
+
+    Example: builder = ColumnBuilder(); builder.append(result.result); frame = builder.to_pandas()
+    """
+
+    def __init__(self, dtypes: Optional[Dict[str, Any]] = None, fields: Optional[List[str]] = None,
+                 capacity: int = DEFAULT_CAPACITY):
+        """
+        :param dtypes: numpy dtypes for fields, for example, {"age": "int32"}, other fields are inferred
+        :param fields: fields to take, all fields of all records (in order of appearance) by default
+        :param capacity: initial number of rows in buffers, they grow when needed
+        :raise CompatibilityError: if numpy is not installed
+        """
+        self._np = import_optional("numpy")
+        self._dtypes = dtypes or {}
+        self._fields = fields
+        self._capacity = max(capacity, 1)
+        self._columns: Dict[str, _Column] = {}
+        self.size = 0
+        for field in fields or ():
+            self._add(field)
+
+    def _add(self, field: str) -> _Column:
+        column = _Column(self._np, self._capacity, self._dtypes.get(field))
+        self._columns[field] = column
+        if self.size:
+            column.fill_nulls(0, self.size)
+        return column
+
+    def append(self, records: List[Dict]) -> "ColumnBuilder":
+        """
+        Puts records of one page to column buffers
+
+        :param records: list of records (dicts)
+        :return: the builder itself
+        :raise WrongParameterError: if a record is not a dict
+        """
+        if not records:
+            return self
+        _check_records(records)
+        if self._fields is None:
+            for field in dict.fromkeys(key for record in records for key in record):
+                if field not in self._columns:
+                    self._add(field)
+        start, end = self.size, self.size + len(records)
+        for field, column in self._columns.items():
+            column.put([record.get(field) for record in records], start)
+        self.size = end
+        return self
+
+    def to_numpy(self) -> Dict[str, Any]:
+        """
+        Returns columns as numpy arrays. Nulls of int columns make them float64 with NaN, nulls of other columns are
+        None in object arrays. Columns with a dtype hint keep the dtype: nulls are NaN, NaT or None, if the dtype has
+        them, zeros otherwise
+
+        :return: dict of field name and numpy array
+        """
+        result = {}
+        for field, column in self._columns.items():
+            data = column.data[:self.size]
+            nulls = column.nulls(self.size)
+            if nulls is not None:
+                if not column.hinted:
+                    data = data.astype("float64" if column.kind in (INT, FLOAT) else "object")
+                    data[nulls] = None
+                elif data.dtype.kind in "fmMO":
+                    data = data.copy()
+                    data[nulls] = None
+            result[field] = data
+        return result
+
+    def to_arrow(self, types: Optional[Dict[str, Any]] = None):
+        """
+        Returns columns as Arrow RecordBatch, nulls are nulls of Arrow
+
+        :param types: Arrow types for fields, for example, {"age": pyarrow.int32()}
+        :return: pyarrow.RecordBatch
+        :raise CompatibilityError: if pyarrow is not installed
+        """
+        pa = import_optional("pyarrow")
+        types = types or {}
+        arrays = []
+        for field, column in self._columns.items():
+            data, nulls = column.data[:self.size], column.nulls(self.size)
+            if column.kind == NULL and not column.hinted:
+                arrays.append(pa.nulls(self.size, type=types.get(field, pa.null())))
+            elif data.dtype == object:
+                values = data.tolist()
+                if nulls is not None:
+                    values = [None if null else value for value, null in zip(values, nulls.tolist())]
+                arrays.append(pa.array(values, type=types.get(field)))
+            else:
+                arrays.append(pa.array(data, mask=nulls, type=types.get(field)))
+        return pa.RecordBatch.from_arrays(arrays, names=list(self._columns))
+
+    def to_pandas(self, dtypes: Optional[Dict[str, Any]] = None):
+        """
+        Returns columns as pandas DataFrame
+
+        :param dtypes: pandas dtypes for fields, for example, {"age": "Int64"}, applied with astype
+        :return: pandas.DataFrame
+        :raise CompatibilityError: if pandas is not installed
+        """
+        pd = import_optional("pandas")
+        frame = pd.DataFrame(self.to_numpy(), copy=False)
+        if not dtypes:
+            return frame
+        frame = frame.astype(dtypes)
+        for field in dtypes:
+            column = self._columns.get(field)
+            if column is None or not column.hinted:
+                continue
+            nulls = column.nulls(self.size)
+            # nulls of hinted columns are zeros in buffers, they are restored, if the pandas dtype has them
+            if nulls is not None and (frame[field].dtype.kind in "fmMO" or
+                                      isinstance(frame[field].dtype, pd.api.extensions.ExtensionDtype)):
+                frame.loc[nulls, field] = None
+        return frame
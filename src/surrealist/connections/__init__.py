@@ -1,5 +1,6 @@
+from .async_ws_connection import AsyncWebSocketConnection
 from .connection import Connection
 from .http_connection import HttpConnection
 from .ws_connection import WebSocketConnection
 
-__all__ = ("Connection", "WebSocketConnection", "HttpConnection")
+__all__ = ("Connection", "WebSocketConnection", "HttpConnection", "AsyncWebSocketConnection")
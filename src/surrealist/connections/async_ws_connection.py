@@ -0,0 +1,483 @@
+import asyncio
+from functools import partial, wraps
+from logging import getLogger
+from typing import (Any, Callable, Dict, Iterable, List, Optional, Tuple,
+                    Union)
+
+from surrealist.bulk import (DEFAULT_CHUNK_SIZE, DEFAULT_CONCURRENCY,
+                             DEFAULT_RETRIES, BulkInsertReport)
+from surrealist.clients.ws_client import DEFAULT_RECONNECT_ATTEMPTS
+from surrealist.codecs import Codec
+from surrealist.connections.rpc import (count_query, count_result,
+                                        create_request, create_result,
+                                        data_request, info_query,
+                                        many_statements, patch_request,
+                                        query_request, query_result,
+                                        relate_request, remove_table_query,
+                                        run_request, select_result,
+                                        table_request, tables_result)
+from surrealist.connections.ws_connection import WebSocketConnection
+from surrealist.enums import Transport
+from surrealist.errors import OperationOnClosedConnectionError
+from surrealist.result import SurrealResult, split_result
+from surrealist.utils import DEFAULT_TIMEOUT, LogValue, StrOrRecord
+
+logger = getLogger("surrealist.connections.async_websocket")
+
+
+def async_connected(func):
+    """
+    Decorator for coroutine methods to make sure the underlying connection is alive (connected to DB)
+
+    :param func: coroutine method to decorate
+    :raise OperationOnClosedConnectionError: if connection is already closed
+    """
+
+    @wraps(func)
+    async def wrapped(*args, **kwargs):
+        # args[0] is a self-argument in methods
+        if not args[0].is_connected():
+            message = "Your connection is already closed"
+            logger.error(message, exc_info=False)
+            raise OperationOnClosedConnectionError(message)
+        return await func(*args, **kwargs)
+
+    return wrapped
+
+
+class AsyncWebSocketConnection:
+    """
+    Represents asyncio-native websocket transport, it has the same methods as Connection, but all of them are
+    coroutines. No thread is used per request: every request is pipelined on one socket and awaited without blocking
+    the event loop. Requests of the session (use, let, unset, live queries and kill) are rare, they are sent by the
+    underlying WebSocketConnection in the default executor, so the session is restored after reconnect as well.
+
+    Use **connect** coroutine (or **async_connect** of Surreal object) to create it.
+
+    Example:
+    connection = await AsyncWebSocketConnection.connect("ws://127.0.0.1:8000/rpc", {"NS": "test", "DB": "test"},
+                                                        ("root", "root"))
+    result = await connection.select("person")
+
+    Callbacks for live queries can be plain functions or coroutine functions, the latter will be scheduled on the
+    event loop, which created the connection
+    """
+
+    def __init__(self, connection: WebSocketConnection, loop: Optional[asyncio.AbstractEventLoop] = None):
+        """
+        Wraps already established websocket connection, in most cases you should use **connect** instead
+
+        :param connection: active websocket connection
+        :param loop: event loop to schedule coroutine callbacks on
+        """
+        self._connection = connection
+        self._timeout = connection.timeout
+        self._loop = loop
+
+    @classmethod
+    async def connect(cls, url: str, db_params: Optional[Dict] = None, credentials: Optional[Tuple[str, str]] = None,
+                      timeout: int = DEFAULT_TIMEOUT, codec: Optional[Codec] = None,
+                      reconnect_attempts: int = DEFAULT_RECONNECT_ATTEMPTS) -> "AsyncWebSocketConnection":
+        """
+        Creates a new connection, parameters are the same as for WebSocketConnection
+
+        :return: connected object
+        :raise SurrealConnectionError: if cant connect with specified parameters
+        """
+        loop = asyncio.get_running_loop()
+        # handshake and signin happen only once, so it is ok to use executor here
+        connection = await loop.run_in_executor(None, lambda: WebSocketConnection(url, db_params, credentials,
+                                                                                  timeout, codec, reconnect_attempts))
+        return cls(connection, loop)
+
+    @property
+    def connection(self) -> WebSocketConnection:
+        """
+        Returns the underlying websocket connection
+
+        :return: WebSocketConnection object
+        """
+        return self._connection
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_details):
+        await self.close()
+
+    def is_connected(self) -> bool:
+        """
+        Checks the connection is still alive and usable
+
+        :return: True if connection is usable, False otherwise
+        """
+        return self._connection.is_connected()
+
+    async def close(self):
+        """
+        Closes the connection. You can not and should not use a connection object after that
+        """
+        # closing waits for the reader thread of the client, so it should not block the event loop
+        await self._in_executor(self._connection.close)
+
+    def transport(self) -> Transport:
+        """
+        Returns the transport type for websocket connection
+        """
+        return Transport.WEBSOCKET
+
+    async def _use_rpc(self, data: Dict) -> SurrealResult:
+        future = self._connection.submit(data)
+        try:
+            result = await asyncio.wait_for(asyncio.wrap_future(future), self._timeout)
+        except asyncio.TimeoutError as exc:
+            # the client forgets the cancelled request, so a late response is dropped
+            future.cancel()
+            raise TimeoutError(f"Time exceeded: {self._timeout} seconds, no response received") from exc
+        logger.info("Got result: %s", LogValue(result))
+        return result
+
+    @staticmethod
+    async def _in_executor(method: Callable, *args) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(None, partial(method, *args))
+
+    def _wrap_callback(self, callback: Optional[Callable]) -> Optional[Callable]:
+        if callback is None or not asyncio.iscoroutinefunction(callback):
+            return callback
+        loop = self._loop or asyncio.get_running_loop()
+        return lambda message: asyncio.run_coroutine_threadsafe(callback(message), loop)
+
+    @async_connected
+    async def use(self, namespace: str, database: Optional[str] = None) -> SurrealResult:
+        """
+        Asynchronous analog of **use** of WebSocketConnection, both namespace and database are required
+
+        :param namespace: name of the namespace to use
+        :param database: name of the database to use
+        :return: result of request
+        :raise CompatibilityError: if database is not specified
+        """
+        return await self._in_executor(self._connection.use, namespace, database)
+
+    @async_connected
+    async def let(self, name: str, value: Any) -> SurrealResult:
+        """
+        Asynchronous analog of **let** of Connection
+
+        :param name: name for the variable (without $ sign!)
+        :param value: value for the variable
+        :return: result of request
+        """
+        return await self._in_executor(self._connection.let, name, value)
+
+    @async_connected
+    async def unset(self, name: str) -> SurrealResult:
+        """
+        Asynchronous analog of **unset** of Connection
+
+        :param name: name for the variable (without $ sign!)
+        :return: result of request
+        """
+        return await self._in_executor(self._connection.unset, name)
+
+    @async_connected
+    async def info(self) -> SurrealResult:
+        """
+        Asynchronous analog of **info** of Connection
+
+        :return: result of the query
+        """
+        logger.info("Query-Operation: INFO")
+        return await self._use_rpc({"method": "info"})
+
+    @async_connected
+    async def version(self) -> SurrealResult:
+        """
+        Asynchronous analog of **version** of Connection
+
+        :return: result of request
+        """
+        logger.info("Operation: VERSION")
+        return await self._use_rpc({"method": "version"})
+
+    @async_connected
+    async def query(self, query: str, variables: Optional[Dict] = None,
+                    rewrite_dates: Optional[bool] = None) -> SurrealResult:
+        """
+        Asynchronous analog of **query** of Connection
+
+        :param query: any SurrealQL query to execute
+        :param variables: a set of variables used by the query
+        :param rewrite_dates: move Surreal dates (d'...') out of quotes in the query, None to use rewrite_dates of the
+        underlying connection (True by default)
+        :return: result of request
+        """
+        rewrite_dates = self._connection.rewrite_dates if rewrite_dates is None else rewrite_dates
+        data = query_request(query, variables, rewrite_dates)
+        return query_result(await self._use_rpc(data), data)
+
+    @async_connected
+    async def query_many(self, queries: List[str], variables: Optional[Dict] = None,
+                         rewrite_dates: Optional[bool] = None) -> List[SurrealResult]:
+        """
+        Asynchronous analog of **query_many** of Connection
+
+        :param queries: texts of statements, each of them should be one SurrealQL statement
+        :param variables: a set of variables used by the statements
+        :param rewrite_dates: move Surreal dates (d'...') out of quotes, None to use rewrite_dates of the connection
+        :return: list of results, one for each statement
+        :raise WrongParameterError: if there are no queries or a query has a few statements
+        """
+        queries = many_statements(queries)
+        return split_result(await self.query("\n".join(queries), variables, rewrite_dates), queries)
+
+    @async_connected
+    async def select(self, table_name: str, record_id: Optional[StrOrRecord] = None) -> SurrealResult:
+        """
+        Asynchronous analog of **select** of Connection
+
+        :param table_name: table name or table name with record_id to select
+        :param record_id: optional parameter, if it exists it will transform table_name to "table_name:record_id"
+        :return: result of request
+        """
+        return select_result(await self._use_rpc(table_request("select", table_name, record_id)))
+
+    @async_connected
+    async def create(self, table_name: str, data: Dict, record_id: Optional[StrOrRecord] = None) -> SurrealResult:
+        """
+        Asynchronous analog of **create** of Connection
+
+        :param table_name: table name or table name with record_id to create
+        :param data: dict with data to create
+        :param record_id: optional parameter, it can be string or record_id object
+        :return: result of request
+        """
+        return create_result(await self._use_rpc(create_request(table_name, data, record_id)))
+
+    @async_connected
+    async def update(self, table_name: str, data: Dict, record_id: Optional[StrOrRecord] = None) -> SurrealResult:
+        """
+        Asynchronous analog of **update** of Connection
+
+        :param table_name: table name or table name with record_id to update
+        :param data: dict with data to create
+        :param record_id: optional parameter, if it exists it will transform table_name to "table_name:record_id"
+        :return: result of request
+        """
+        return await self._use_rpc(data_request("update", table_name, data, record_id))
+
+    @async_connected
+    async def upsert(self, table_name: str, data: Dict, record_id: Optional[StrOrRecord] = None) -> SurrealResult:
+        """
+        Asynchronous analog of **upsert** of Connection
+
+        :param table_name: table name or table name with record_id to upsert
+        :param data: dict with data to create
+        :param record_id: optional parameter, if it exists it will transform table_name to "table_name:record_id"
+        :return: result of request
+        """
+        return await self._use_rpc(data_request("upsert", table_name, data, record_id))
+
+    @async_connected
+    async def insert(self, table_name: str, data: Union[List, Dict]) -> SurrealResult:
+        """
+        Asynchronous analog of **insert** of Connection
+
+        :param table_name: table name to insert
+        :param data: dict or list(many records) with data to create
+        :return: result of request
+        """
+        return await self._use_rpc(data_request("insert", table_name, data))
+
+    @async_connected
+    async def bulk_insert(self, table_name: str, records: Iterable[Dict], *, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                          concurrency: int = DEFAULT_CONCURRENCY, retries: int = DEFAULT_RETRIES,
+                          on_progress: Optional[Callable[[BulkInsertReport], Any]] = None) -> BulkInsertReport:
+        """
+        Asynchronous analog of **bulk_insert** of Connection: chunks are pipelined on the socket by the underlying
+        connection in the default executor, so the event loop is not blocked. Note: records are consumed and
+        on_progress is called in threads of the executor
+
+        :param table_name: name of the table
+        :param records: any iterable of records (dicts), for example, a generator
+        :param chunk_size: number of records in one request
+        :param concurrency: maximum number of requests in flight
+        :param retries: number of retries for a failed chunk
+        :param on_progress: optional function to call with the report after each chunk
+        :return: report with numbers of inserted and failed rows and speed (rows_per_second)
+        """
+        return await self._in_executor(partial(self._connection.bulk_insert, table_name, records,
+                                               chunk_size=chunk_size, concurrency=concurrency, retries=retries,
+                                               on_progress=on_progress))
+
+    @async_connected
+    async def insert_relation(self, table_name: Optional[str], data: Dict) -> SurrealResult:
+        """
+        Asynchronous analog of **insert_relation** of Connection
+
+        :param table_name: The name of the relation table to insert into
+        :param data: dict containing the data for the new relation record, including in, out, and any additional fields
+        :return: result of request
+        """
+        return await self._use_rpc(data_request("insert_relation", table_name, data))
+
+    @async_connected
+    async def merge(self, table_name: str, data: Dict, record_id: Optional[StrOrRecord] = None) -> SurrealResult:
+        """
+        Asynchronous analog of **merge** of Connection
+
+        :param table_name: table name or table name with record_id to merge
+        :param data: dict with data to add
+        :param record_id: optional parameter, if it exists it will transform table_name to "table_name:record_id"
+        :return: result of request
+        """
+        return await self._use_rpc(data_request("merge", table_name, data, record_id))
+
+    @async_connected
+    async def patch(self, table_name: str, data: Union[Dict, List], record_id: Optional[StrOrRecord] = None,
+                    return_diff: bool = False) -> SurrealResult:
+        """
+        Asynchronous analog of **patch** of Connection
+
+        :param table_name: table name or table name with record_id to patch
+        :param data: list with json-patch data
+        :param record_id: optional parameter, if it exists it will transform table_name to "table_name:record_id"
+        :param return_diff: True if you want to get only DIFF info, False for a standard results
+        :return: result of request
+        """
+        return await self._use_rpc(patch_request(table_name, data, record_id, return_diff))
+
+    @async_connected
+    async def delete(self, table_name: str, record_id: Optional[StrOrRecord] = None) -> SurrealResult:
+        """
+        Asynchronous analog of **delete** of Connection
+
+        :param table_name: table name or table name with record_id to delete
+        :param record_id: optional parameter, if it exists it will transform table_name to "table_name:record_id"
+        :return: result of request
+        """
+        return await self._use_rpc(table_request("delete", table_name, record_id))
+
+    @async_connected
+    async def relate(self, relate_to: str, relation_table: str, relate_from: str,
+                     data: Optional[Dict] = None) -> SurrealResult:
+        """
+        Asynchronous analog of **relate** of Connection
+
+        :param relate_to: The record to relate to
+        :param relation_table: name of the relation table
+        :param relate_from: The record to relate from
+        :param data: dict containing the data for the new record
+        :return: result of request
+        """
+        return await self._use_rpc(relate_request(relate_to, relation_table, relate_from, data))
+
+    @async_connected
+    async def run(self, func_name: str, version: Optional[str] = None, args: Optional[List] = None) -> SurrealResult:
+        """
+        Asynchronous analog of **run** of Connection
+
+        :param func_name: The name of the function or model to execute
+        :param version: optional parameter, the version of the function or model to execute
+        :param args: The list of arguments to pass to the function or model.
+        :return: result of request
+        """
+        return await self._use_rpc(run_request(func_name, version, args))
+
+    @async_connected
+    async def live(self, table_name: str, callback: Callable[[Dict], Any], return_diff: bool = False) -> SurrealResult:
+        """
+        Asynchronous analog of **live** of WebSocketConnection, callback can be a coroutine function
+
+        :param table_name: name of the table to observe
+        :param callback: a function to call on any incoming event. It should take one argument - a dict
+        :param return_diff: True if you want to get only DIFF info on table events, False for a standard results
+        :return: result of request with the live_id in 'result' field
+        """
+        return await self._in_executor(self._connection.live, table_name, self._wrap_callback(callback), return_diff)
+
+    @async_connected
+    async def custom_live(self, custom_query: str, callback: Callable[[Dict], Any]) -> SurrealResult:
+        """
+        Asynchronous analog of **custom_live** of WebSocketConnection, callback can be a coroutine function
+
+        :param custom_query: full LIVE SELECT query text
+        :param callback: a function to call on any incoming event. It should take one argument - a dict
+        :return: result of request with the live_id in 'result' field
+        """
+        return await self._in_executor(self._connection.custom_live, custom_query, self._wrap_callback(callback))
+
+    @async_connected
+    async def kill(self, live_query_id: str) -> SurrealResult:
+        """
+        Asynchronous analog of **kill** of WebSocketConnection
+
+        :param live_query_id: id for the query to kill
+        :return: result of request
+        """
+        return await self._in_executor(self._connection.kill, live_query_id)
+
+    @async_connected
+    async def count(self, table_name: str) -> SurrealResult:
+        """
+        Asynchronous analog of **count** of Connection
+
+        :param table_name: name of the table
+        :return: result containing count
+        """
+        return count_result(await self.query(count_query(table_name)))
+
+    @async_connected
+    async def table_info(self, table_name: str, structured: bool = False) -> SurrealResult:
+        """
+        Asynchronous analog of **table_info** of Connection
+
+        :param table_name: name of the table
+        :param structured: if True returns data in structured view (use STRUCTURE statement)
+        :return: full table information
+        """
+        return await self.query(info_query(f"TABLE {table_name}", structured))
+
+    @async_connected
+    async def db_info(self, structured: bool = False) -> SurrealResult:
+        """
+        Asynchronous analog of **db_info** of Connection
+
+        :param structured: if True, return data in structured view (use STRUCTURE statement)
+        :return: full database information
+        """
+        return await self.query(info_query("DB", structured))
+
+    @async_connected
+    async def db_tables(self) -> SurrealResult:
+        """
+        Asynchronous analog of **db_tables** of Connection
+
+        :return: list of all tables names
+        """
+        logger.info("Query-Operation: DB_TABLES")
+        return tables_result(await self.db_info())
+
+    @async_connected
+    async def is_table_exists(self, table_name: str) -> bool:
+        """
+        Asynchronous analog of **is_table_exists** of Connection
+
+        :param table_name: name of the table, we do not expect record_id here
+        :return: True if table exists, False otherwise
+        """
+        return table_name in (await self.db_tables()).result
+
+    @async_connected
+    async def remove_table(self, table_name: str, if_exists: bool = True) -> SurrealResult:
+        """
+        Asynchronous analog of **remove_table** of Connection
+
+        :param table_name: the name of the table,
+        :param if_exists: if True, will use IF EXISTS statement for the query
+        :return: result of the query
+        """
+        return await self.query(remove_table_query(table_name, if_exists))
+
+    def __repr__(self):
+        return f"AsyncWebSocketConnection(url={self._connection.url}, connected={self.is_connected()})"
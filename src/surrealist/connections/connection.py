@@ -1,15 +1,25 @@
 from abc import ABC, abstractmethod
 from functools import wraps
 from logging import getLogger
-from typing import Any, Callable, Dict, List, Optional, Tuple, Union
-
+from typing import (Any, Callable, Dict, Iterable, List, Optional, Tuple,
+                    Union)
+
+from surrealist.bulk import (DEFAULT_CHUNK_SIZE, DEFAULT_CONCURRENCY,
+                             DEFAULT_RETRIES, BulkInsertReport, bulk_insert)
+from surrealist.connections.rpc import (count_query, count_result,
+                                        create_request, create_result,
+                                        data_request, info_query,
+                                        many_statements, patch_request,
+                                        query_request, query_result,
+                                        relate_request, remove_table_query,
+                                        run_request, select_result,
+                                        table_request, tables_result)
 from surrealist.enums import Transport
 from surrealist.errors import (OperationOnClosedConnectionError,
                                WrongParameterError)
-from surrealist.record_id import RecordId
-from surrealist.result import SurrealResult
-from surrealist.utils import (AC, DB, DEFAULT_TIMEOUT, NS, StrOrRecord,
-                              clean_dates, get_table_or_record_id, mask_pass)
+from surrealist.result import SurrealResult, split_result
+from surrealist.utils import (AC, DB, DEFAULT_TIMEOUT, NS, LogValue,
+                              StrOrRecord)
 
 logger = getLogger("surrealist.connection")
 LINK = "https://github.com/kotolex/surrealist?tab=readme-ov-file#recursion-and-json-in-python"
@@ -53,6 +63,8 @@ class Connection(ABC):
         self._connected = False
         self._timeout = timeout
         self._token = None
+        # move Surreal dates (d'...') out of quotes in query texts, turn it off if your queries have no such dates
+        self.rewrite_dates = True
 
     def close(self):
         """
@@ -90,11 +102,7 @@ class Connection(ABC):
         :param table_name: name of the table
         :return: result containing count, like SurrealResult(id='', error=None, result=[{'count': 1}], time='123.333µs')
         """
-        logger.info("Query-Operation: COUNT. Table: %s", table_name)
-        result = self.query(f"SELECT count() FROM {table_name} GROUP ALL;")
-        if not result.is_error():
-            result.result = self._get_count(result.result)
-        return result
+        return count_result(self.query(count_query(table_name)))
 
     @connected
     def table_info(self, table_name: str, structured: bool = False) -> SurrealResult:
@@ -109,7 +117,7 @@ class Connection(ABC):
         :param structured: if True returns data in structured view (use STRUCTURE statement). Note: experimental!
         :return: full table information
         """
-        return self._info(f"TABLE {table_name}", structured)
+        return self.query(info_query(f"TABLE {table_name}", structured))
 
     @connected
     def db_info(self, structured: bool = False) -> SurrealResult:
@@ -123,7 +131,7 @@ class Connection(ABC):
         :param structured: if True, return data in structured view (use STRUCTURE statement). Note: experimental!
         :return: full database information
         """
-        return self._info("DB", structured)
+        return self.query(info_query("DB", structured))
 
     @connected
     def ns_info(self, structured: bool = False) -> SurrealResult:
@@ -137,7 +145,7 @@ class Connection(ABC):
         :param structured: if True, return data in structured view (use STRUCTURE statement). Note: experimental!
         :return: full namespace information
         """
-        return self._info("NS", structured)
+        return self.query(info_query("NS", structured))
 
     @connected
     def root_info(self, structured: bool = False) -> SurrealResult:
@@ -151,13 +159,7 @@ class Connection(ABC):
         :param structured: if True, return data in structured view (use STRUCTURE statement). Note: experimental!
         :return: information about root
         """
-        return self._info("ROOT", structured)
-
-    def _info(self, type_: str, structured: bool = False) -> SurrealResult:
-        if structured:
-            type_ = f"{type_} STRUCTURE"
-        logger.info("Query-Operation: %s_INFO", type_)
-        return self.query(f"INFO FOR {type_};")
+        return self.query(info_query("ROOT", structured))
 
     @connected
     def session_info(self) -> SurrealResult:
@@ -198,9 +200,7 @@ class Connection(ABC):
         :return: list of all tables names
         """
         logger.info("Query-Operation: DB_TABLES")
-        res: SurrealResult = self.db_info()
-        res.result = list(res.result["tables"].keys())
-        return res
+        return tables_result(self.db_info())
 
     @connected
     def is_table_exists(self, table_name: str) -> bool:
@@ -229,9 +229,7 @@ class Connection(ABC):
         :param if_exists: if True, will use IF EXISTS statement for the query
         :return: result of the query
         """
-        logger.info("Query-Operation: REMOVE. Table name %s", table_name)
-        add = "" if not if_exists else "IF EXISTS"
-        return self.query(f"REMOVE TABLE {add} {table_name};")
+        return self.query(remove_table_query(table_name, if_exists))
 
     @connected
     def show_changes(self, table_name: str, since: str, limit: int = 10) -> SurrealResult:
@@ -285,7 +283,7 @@ class Connection(ABC):
         if access is not None:
             params[AC] = access
         data = {"method": "signin", "params": [params]}
-        logger.info("Operation: SIGNIN. Data: %s", mask_pass(str(params)))
+        logger.info("Operation: SIGNIN. Data: %s", LogValue(params, mask=True))
         return self._use_rpc(data)
 
     @abstractmethod
@@ -319,7 +317,7 @@ class Connection(ABC):
         :return: result of request
         """
         data = {"method": "let", "params": [name, value]}
-        logger.info("Operation: LET. Name: %s, Value: %s", name, value)
+        logger.info("Operation: LET. Name: %s, Value: %s", name, LogValue(value))
         return self._use_rpc(data)
 
     @connected
@@ -399,7 +397,7 @@ class Connection(ABC):
             raise WrongParameterError("Query parameter should be a dictionary with 3 fields\n"
                                       "Please see https://surrealdb.com/docs/surrealdb/integration/rpc#graphql")
         data = {"method": "graphql", "params": [query, {"pretty": pretty}]}
-        logger.info("Operation: GRAPHQL. Query: %s, pretty: %s", query, pretty)
+        logger.info("Operation: GRAPHQL. Query: %s, pretty: %s", LogValue(query), pretty)
         result = self._use_rpc(data)
         return result
 
@@ -421,16 +419,7 @@ class Connection(ABC):
         :param args: The list of arguments to pass to the function or model.
         :return: result of request
         """
-        data = {"method": "run", "params": [func_name]}
-        if version is not None:
-            data["params"].append(version)
-        if args is not None:
-            if len(data["params"]) == 1:
-                data["params"].append(None)
-            data["params"].append(args)
-        logger.info("Operation: RUN. Function: %s, version: %s, args: %s", func_name, version, args)
-        result = self._use_rpc(data)
-        return result
+        return self._use_rpc(run_request(func_name, version, args))
 
     @connected
     def version(self) -> SurrealResult:
@@ -470,13 +459,7 @@ class Connection(ABC):
         :param record_id: optional parameter, if it exists it will transform table_name to "table_name:record_id"
         :return: result of request
         """
-        table_name = get_table_or_record_id(table_name, record_id)
-        data = {"method": "select", "params": [table_name]}
-        logger.info("Operation: SELECT. Table: %s", table_name)
-        result = self._use_rpc(data)
-        if not isinstance(result.result, List) and not result.is_error():
-            result.result = [result.result] if result.result else []
-        return result
+        return select_result(self._use_rpc(table_request("select", table_name, record_id)))
 
     @connected
     def create(self, table_name: str, data: Dict, record_id: Optional[StrOrRecord] = None) -> SurrealResult:
@@ -502,16 +485,7 @@ class Connection(ABC):
         :param record_id: optional parameter, it can be string or record_id object
         :return: result of request
         """
-        if record_id is not None:
-            if isinstance(record_id, str):
-                record_id = RecordId(record_id, table=table_name)
-            data["id"] = record_id.to_valid_string()
-        _data = {"method": "create", "params": [table_name, data]}
-        logger.info("Operation: CREATE. Table: %s, data: %s", table_name, data)
-        result = self._use_rpc(_data)
-        if isinstance(result.result, List) and len(result.result) == 1:
-            result.result = result.result[0]
-        return result
+        return create_result(self._use_rpc(create_request(table_name, data, record_id)))
 
     @connected
     def update(self, table_name: str, data: Dict, record_id: Optional[StrOrRecord] = None) -> SurrealResult:
@@ -540,10 +514,7 @@ class Connection(ABC):
         :param record_id: optional parameter, if it exists it will transform table_name to "table_name:record_id"
         :return: result of request
         """
-        table_name = get_table_or_record_id(table_name, record_id)
-        _data = {"method": "update", "params": [table_name, data]}
-        logger.info("Operation: UPDATE. Table: %s, data: %s", table_name, data)
-        return self._use_rpc(_data)
+        return self._use_rpc(data_request("update", table_name, data, record_id))
 
     @connected
     def upsert(self, table_name: str, data: Dict, record_id: Optional[StrOrRecord] = None) -> SurrealResult:
@@ -570,10 +541,7 @@ class Connection(ABC):
         :param record_id: optional parameter, if it exists it will transform table_name to "table_name:record_id"
         :return: result of request
         """
-        table_name = get_table_or_record_id(table_name, record_id)
-        _data = {"method": "upsert", "params": [table_name, data]}
-        logger.info("Operation: UPSERT. Table: %s, data: %s", table_name, data)
-        return self._use_rpc(_data)
+        return self._use_rpc(data_request("upsert", table_name, data, record_id))
 
     @connected
     def insert(self, table_name: str, data: Union[List, Dict]) -> SurrealResult:
@@ -596,9 +564,33 @@ class Connection(ABC):
         :param data: dict or list(many records) with data to create
         :return: result of request
         """
-        _data = {"method": "insert", "params": [table_name, data]}
-        logger.info("Operation: INSERT. Table: %s, data: %s", table_name, data)
-        return self._use_rpc(_data)
+        return self._use_rpc(data_request("insert", table_name, data))
+
+    @connected
+    def bulk_insert(self, table_name: str, records: Iterable[Dict], *, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                    concurrency: int = DEFAULT_CONCURRENCY, retries: int = DEFAULT_RETRIES,
+                    on_progress: Optional[Callable[[BulkInsertReport], Any]] = None) -> BulkInsertReport:
+        """
+        This method inserts a lot of records by chunks with **insert** method, chunks are sent in parallel (websocket
+        connection pipelines them on one socket, a pool spreads them over its connections). Records are consumed
+        lazily, so memory is bounded whatever the size of the input is. Failed chunks are retried, see **bulk_insert**
+        of surrealist.bulk about retries of chunks, which were inserted, but the response was lost
+
+        Example:
+        connection.bulk_insert("person", ({"name": f"John {i}"} for i in range(1_000_000)), chunk_size=5000)
+
+        :param table_name: table name to insert
+        :param records: any iterable of records (dicts), for example, a generator
+        :param chunk_size: number of records in one request
+        :param concurrency: maximum number of requests in flight
+        :param retries: number of retries for a failed chunk
+        :param on_progress: optional function to call with the report after each chunk
+        :return: report with numbers of inserted and failed rows and speed (rows_per_second)
+        """
+        logger.info("Operation: BULK INSERT. Table: %s, chunk size: %s, concurrency: %s", table_name, chunk_size,
+                    concurrency)
+        return bulk_insert(lambda chunk: self.insert(table_name, chunk), records, chunk_size=chunk_size,
+                           concurrency=concurrency, retries=retries, on_progress=on_progress)
 
     @connected
     def insert_relation(self, table_name: Optional[str], data: [Dict]) -> SurrealResult:
@@ -620,10 +612,7 @@ class Connection(ABC):
         :param data: dict containing the data for the new relation record, including in, out, and any additional fields
         :return: result of request
         """
-        data = {"method": "insert_relation", "params": [table_name, data]}
-        logger.info("Operation: INSERT-RELATION. Table: %s, data: %s", table_name, data)
-        result = self._use_rpc(data)
-        return result
+        return self._use_rpc(data_request("insert_relation", table_name, data))
 
     @connected
     def merge(self, table_name: str, data: Dict, record_id: Optional[StrOrRecord] = None) -> SurrealResult:
@@ -644,10 +633,7 @@ class Connection(ABC):
         :param record_id: optional parameter, if it exists it will transform table_name to "table_name:record_id"
         :return: result of request
         """
-        table_name = get_table_or_record_id(table_name, record_id)
-        _data = {"method": "merge", "params": [table_name, data]}
-        logger.info("Operation: MERGE. Table: %s, data: %s", table_name, data)
-        return self._use_rpc(_data)
+        return self._use_rpc(data_request("merge", table_name, data, record_id))
 
     @connected
     def delete(self, table_name: str, record_id: Optional[StrOrRecord] = None) -> SurrealResult:
@@ -669,10 +655,7 @@ class Connection(ABC):
         :param record_id: optional parameter, if it exists it will transform table_name to "table_name:record_id"
         :return: result of request
         """
-        table_name = get_table_or_record_id(table_name, record_id)
-        _data = {"method": "delete", "params": [table_name]}
-        logger.info("Operation: DELETE. Table: %s", table_name)
-        return self._use_rpc(_data)
+        return self._use_rpc(table_request("delete", table_name, record_id))
 
     @connected
     def patch(self, table_name: str, data: Union[Dict, List], record_id: Optional[StrOrRecord] = None,
@@ -700,16 +683,11 @@ class Connection(ABC):
         :param return_diff: True if you want to get only DIFF info, False for a standard results
         :return: result of request
         """
-        table_name = get_table_or_record_id(table_name, record_id)
-        params = [table_name, data]
-        if return_diff:
-            params.append(return_diff)
-        _data = {"method": "patch", "params": params}
-        logger.info("Operation: PATCH. Table: %s, data: %s, use DIFF: %s", table_name, data, return_diff)
-        return self._use_rpc(_data)
+        return self._use_rpc(patch_request(table_name, data, record_id, return_diff))
 
     @connected
-    def query(self, query: str, variables: Optional[Dict] = None) -> SurrealResult:
+    def query(self, query: str, variables: Optional[Dict] = None,
+              rewrite_dates: Optional[bool] = None) -> SurrealResult:
         """
         This method used for execute a custom SurrealQL query
 
@@ -724,17 +702,31 @@ class Connection(ABC):
 
         :param query: any SurrealQL query to execute
         :param variables: a set of variables used by the query
+        :param rewrite_dates: move Surreal dates (d'...') out of quotes in the query, None to use rewrite_dates of the
+        connection (True by default)
         :return: result of request
         """
-        query = clean_dates(query)
-        params = [query]
-        if variables is not None:
-            params.append(variables)
-        data = {"method": "query", "params": params}
-        logger.info("Operation: QUERY. Query: %s, variables: %s", query, variables)
-        result = self._use_rpc(data)
-        result.query = params[0] if len(params) == 1 else params
-        return result
+        data = query_request(query, variables, self.rewrite_dates if rewrite_dates is None else rewrite_dates)
+        return query_result(self._use_rpc(data), data)
+
+    @connected
+    def query_many(self, queries: List[str], variables: Optional[Dict] = None,
+                   rewrite_dates: Optional[bool] = None) -> List[SurrealResult]:
+        """
+        This method executes many statements in one request (one round trip) without a transaction, each statement gets
+        its own result with its status and time, so an error of one statement does not cancel others
+
+        Example:
+        connection.query_many(["SELECT * FROM article;", "SELECT * FROM author WHERE name = $name;"], {"name": "John"})
+
+        :param queries: texts of statements, each of them should be one SurrealQL statement
+        :param variables: a set of variables used by the statements
+        :param rewrite_dates: move Surreal dates (d'...') out of quotes, None to use rewrite_dates of the connection
+        :return: list of results, one for each statement
+        :raise WrongParameterError: if there are no queries or a query has a few statements
+        """
+        queries = many_statements(queries)
+        return split_result(self.query("\n".join(queries), variables, rewrite_dates), queries)
 
     @connected
     def relate(self, relate_to: str, relation_table: str, relate_from: str,
@@ -753,13 +745,7 @@ class Connection(ABC):
         :param data: dict containing the data for the new record
         :return: result of request
         """
-        full_data = {"method": "relate", "params": [relate_to, relation_table, relate_from]}
-        if data is not None:
-            full_data["params"].append(data)
-        logger.info("Operation: RELATE. Relate_to: %s, relation_table: %s, relate_from: %s, data: %s", relate_to,
-                    relation_table, relate_from, data)
-        result = self._use_rpc(full_data)
-        return result
+        return self._use_rpc(relate_request(relate_to, relation_table, relate_from, data))
 
     @abstractmethod
     def import_data(self, path) -> SurrealResult:
@@ -809,12 +795,3 @@ class Connection(ABC):
 
         Refer to: https://docs.surrealdb.com/docs/cli/ml/export
         """
-
-    def _get_count(self, res) -> int:
-        if not res:
-            return 0
-        if 'count' in res:
-            return res['count']
-        if 'result' in res:
-            return self._get_count(res["result"])
-        return self._get_count(res[0])
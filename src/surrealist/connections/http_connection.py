@@ -3,12 +3,14 @@ from pathlib import Path
 from typing import Any, BinaryIO, Dict, Optional, Tuple, Union
 
 from surrealist.clients.http_client import HttpClient
+from surrealist.codecs import DEFAULT_CODEC, Codec
 from surrealist.connections.connection import Connection, connected
 from surrealist.enums import Transport
 from surrealist.errors import (CompatibilityError, HttpClientError,
                                HttpConnectionError, SurrealConnectionError)
 from surrealist.result import SurrealResult, to_result
-from surrealist.utils import AC, DB, DEFAULT_TIMEOUT, ENCODING, HTTP_OK, NS
+from surrealist.utils import (AC, DB, DEFAULT_TIMEOUT, ENCODING, HTTP_OK, NS,
+                              LogValue)
 
 logger = getLogger("surrealist.connections.http")
 
@@ -22,16 +24,23 @@ class HttpConnection(Connection):
     Refer to surrealist documentation: https://github.com/kotolex/surrealist?tab=readme-ov-file#transports
     Refer to: https://docs.surrealdb.com/docs/integration/http
 
-    Each method call creates a new http short-live connection.
+    Http connections are persistent (keep-alive) and reused from the pool of the http client, so a method call does not
+    need a new TCP handshake.
 
     On creating, this object tries to create a connection with specified data and will raise exception on fail.
     """
 
     def __init__(self, url: str, db_params: Optional[Dict] = None, credentials: Tuple[str, str] = None,
-                 timeout: int = DEFAULT_TIMEOUT):
+                 timeout: int = DEFAULT_TIMEOUT, codec: Optional[Codec] = None, compression: bool = False):
         super().__init__(db_params, credentials, timeout)
         self._url = url
-        self._http_client = HttpClient(url, headers=db_params, credentials=credentials, timeout=timeout)
+        self._codec = codec or DEFAULT_CODEC
+        if self._codec.binary:
+            message = f"Codec {self._codec.name} can be used only with websocket transport"
+            logger.error(message)
+            raise CompatibilityError(message)
+        self._http_client = HttpClient(url, headers=db_params, credentials=credentials, timeout=timeout,
+                                       codec=self._codec, compression=compression)
         self._sign(credentials, db_params, url)
         self._connected = True
         masked_creds = None if not credentials else (credentials[0], "******")
@@ -39,7 +48,7 @@ class HttpConnection(Connection):
 
     def _use_rpc(self, data) -> SurrealResult:
         _, text = self._rpc(data)
-        return to_result(text)
+        return to_result(text, self._codec)
 
     def _sign(self, credentials, db_params, url):
         user, password, ns, db, ac = None, None, None, None, None
@@ -69,6 +78,14 @@ class HttpConnection(Connection):
         """
         return Transport.HTTP
 
+    def close(self):
+        """
+        Closes the connection and all persistent http connections of it. You can not and should not use a connection
+        object after that
+        """
+        super().close()
+        self._http_client.close()
+
     @connected
     def import_data(self, path: Union[str, Path]) -> SurrealResult:
         """
@@ -85,7 +102,7 @@ class HttpConnection(Connection):
         with open(path, 'rb') as file:
             logger.info("Operation: IMPORT. Path: %s", path)
             _, text = self._simple_request("POST", "import", file, type_of_content="FILE")
-        return to_result(text)
+        return to_result(text, self._codec)
 
     @connected
     def export(self) -> str:
@@ -117,7 +134,7 @@ class HttpConnection(Connection):
         with open(path, 'rb') as file:
             logger.info("Operation: ML IMPORT. Path: %s", path)
             _, text = self._simple_request("POST", "ml/import", file.read().decode(ENCODING), type_of_content="STR")
-        return to_result(text)
+        return to_result(text, self._codec)
 
     @connected
     def ml_export(self, name: str, version: str) -> str:
@@ -212,9 +229,9 @@ class HttpConnection(Connection):
 
     def _simple_get(self, endpoint: str) -> Tuple[int, str]:
         with self._http_client.get(endpoint) as resp:
-            status, text = resp.status, resp.read().decode(ENCODING)
+            status, text = resp.status, self._http_client.read(resp).decode(ENCODING)
             _body = "is empty" if not text else text
-            logger.info("Response from /%s, status_code: %s, body: %s", endpoint, status, _body)
+            logger.info("Response from /%s, status_code: %s, body: %s", endpoint, status, LogValue(_body))
             return status, text
 
     def _rpc(self, data: Union[Dict, str]) -> Tuple[int, str]:
@@ -223,11 +240,11 @@ class HttpConnection(Connection):
     def _simple_request(self, method, endpoint: str, data: Union[Dict, str, BinaryIO],
                         type_of_content: str = "JSON") -> Tuple[int, str]:
         with self._http_client.request(method, data, endpoint, type_of_content=type_of_content) as resp:
-            status, text = resp.status, resp.read().decode(ENCODING)
+            status, text = resp.status, self._http_client.read(resp).decode(ENCODING)
             if type_of_content == "FILE":
                 data.close()
             _body = "is empty" if not text else text
-            logger.info("Response from /%s, status_code: %s, body %s", endpoint, status, _body)
+            logger.info("Response from /%s, status_code: %s, body %s", endpoint, status, LogValue(_body))
         return status, text
 
 
@@ -1,64 +1,145 @@
-from functools import wraps
+import time
+from collections import deque
 from logging import getLogger
 from os import cpu_count
-from queue import Queue
-from threading import Thread
-from typing import Any, Callable, Dict, Optional, Tuple
+from threading import Event, Lock, Thread
+from typing import Any, Callable, Deque, Dict, Optional, Tuple, Union
 
+from surrealist.codecs import Codec
 from surrealist.connections.connection import Connection
+from surrealist.connections.pool_stats import PoolStats
+from surrealist.connections.pooled_methods import (SESSION_METHODS,
+                                                   PooledMethods, PoolSession)
 from surrealist.enums import Transport
-from surrealist.errors import OperationOnClosedConnectionError
+from surrealist.errors import (OperationOnClosedConnectionError,
+                               PoolExhaustedError, PySurrealError)
 from surrealist.result import SurrealResult
 from surrealist.surreal import Surreal
 from surrealist.utils import DEFAULT_TIMEOUT
 
 CORES_COUNT = cpu_count()
 logger = getLogger("surrealist.connection.pool")
+# delays between attempts to replace an evicted connection, if SurrealDB is not available
+REPLACE_DELAY = 0.5
+MAX_REPLACE_DELAY = 30
+# how often the pool looks for idle and expired connections, if idle_timeout or max_lifetime is used
+RECYCLE_INTERVAL = 1
+DEFAULT_METRICS_INTERVAL = 10
+# methods, which start a live query, the query is linked to the connection it was started on
+LIVE_METHODS = ("live", "custom_live")
+# error results of SurrealDB (not exceptions) are counted with this type name
+ERROR_RESULT = "ErrorResult"
+
+
+def report_metrics(stopped: Event, interval: float, callback: Callable[[Dict], Any], stats: Callable[[], Dict]):
+    """
+    Calls the callback with stats every interval seconds until stopped, it runs in a separate thread of a pool
+
+    :param stopped: event of closing the pool
+    :param interval: seconds between calls
+    :param callback: function to call with stats
+    :param stats: function, which returns stats of the pool
+    """
+    while not stopped.wait(interval):
+        try:
+            callback(stats())
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.error("Error in metrics callback: %s", e)
 
 
-def connected_and_pooled(func):
+class _Waiter:
     """
-    Wrapper to check if pool is connected ad delegate work to underlying connections
-    :param func: function to wrap
+    A caller waiting for a free connection, returned connections are handed to waiters in FIFO order
     """
+    __slots__ = ("event", "connection")
 
-    @wraps(func)
-    def wrapped(*args, **kwargs):
-        # args[0] is a self-argument in methods
-        if not args[0].is_connected():
-            message = "Your pool is already closed"
-            logger.error(message, exc_info=False)
-            raise OperationOnClosedConnectionError(message)
-        return args[0]._execute(func.__name__, *args[1:], **kwargs)
-
-    return wrapped
+    def __init__(self):
+        self.event = Event()
+        self.connection: Optional[Connection] = None
 
 
-class Pool:
+class Pool(PooledMethods):
     """
     Represents a pool of connections, which is creating a bunch of database connections on start and delegating all
     tasks to the first non-busy connection. So, if there are no more connections in the pool, it tries to create a new
     one if the maximum is not exceeded. If the maximum of connections is reached and no more connections to work with -
-    client will be blocked until the first connection finishes the task and appears at the pool.
+    client will wait (first come, first served) until a connection finishes the task and appears at the pool, but no
+    longer than acquire_timeout seconds (timeout of the pool by default), then PoolExhaustedError is raised.
+
+    Connections are validated on checkout and on return: a closed connection is evicted from the pool and replaced
+    with a new one in the background. If health_check_interval (in seconds) is specified, idle connections are pinged
+    periodically and evicted if the ping fails.
+
+    If idle_timeout (in seconds) is specified, connections which were not used for so long are closed until the pool
+    shrinks back to the minimum. If max_lifetime (in seconds) is specified, older connections are closed and replaced
+    with new ones, when they are idle (so no request is interrupted). Connections with live queries are pinned: they are
+    never closed by idle timeout or lifetime, because live queries would stop.
+
+    All methods of Connection are available, methods of the session (use, let and unset) are applied to every
+    connection of the pool (before its next request) and to connections created later. A live query is killed on
+    the connection, which runs it.
+
+    Use stats method to get the telemetry of the pool, or specify metrics_callback to get it every metrics_interval
+    seconds.
     """
 
     def __init__(self, first_connection: Connection, url: str, namespace: Optional[str] = None,
                  database: Optional[str] = None, access: Optional[str] = None, credentials: Tuple[str, str] = None,
                  use_http: bool = False, timeout: int = DEFAULT_TIMEOUT, min_connections: int = CORES_COUNT,
-                 max_connections: int = 50):
+                 max_connections: int = 50, codec: Optional[Union[str, Codec]] = None,
+                 compression: bool = False, health_check_interval: Optional[float] = None,
+                 idle_timeout: Optional[float] = None, max_lifetime: Optional[float] = None,
+                 acquire_timeout: Optional[float] = None, metrics_callback: Optional[Callable[[Dict], Any]] = None,
+                 metrics_interval: float = DEFAULT_METRICS_INTERVAL):
         self._options = {
             "url": url, "namespace": namespace, "database": database, "access": access, "credentials": credentials,
-            "use_http": use_http, "timeout": timeout
+            "use_http": use_http, "timeout": timeout, "codec": codec, "compression": compression
         }
         self._timeout = timeout
         self._url = url
         self._min = min_connections if min_connections > 1 else 2
-        self._max = max_connections if max_connections <= 50 else 50
-        self._main = Queue(maxsize=self._max)
-        self._main.put_nowait(first_connection)
+        self._max = max(max_connections, self._min)
+        self._idle: Deque[Connection] = deque([first_connection])
+        self._waiters: Deque[_Waiter] = deque()
+        self._acquire_timeout = acquire_timeout if acquire_timeout is not None else timeout
         self._counter = 1
+        self._lock = Lock()
+        self._checkouts = 0
+        self._waits = 0
+        self._timeouts = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._last_error: Optional[Exception] = None
+        self._stats = PoolStats()
+        self._stats.created = 1
+        now = time.monotonic()
+        # creation and last usage time of each connection
+        self._created: Dict[Connection, float] = {first_connection: now}
+        self._last_used: Dict[Connection, float] = {first_connection: now}
+        # the session of the pool (use, let and unset) and stamps of its changes, which each connection got: the last
+        # stamp of the whole session, the stamp of use and the stamp of each variable
+        self._session = PoolSession()
+        self._synced: Dict[Connection, int] = {}
+        self._used: Dict[Connection, int] = {}
+        self._applied: Dict[Connection, Dict[str, int]] = {}
+        # live query id -> connection, which runs the query, so kill goes to the same connection
+        self._lives: Dict[str, Connection] = {}
+        self._idle_timeout = idle_timeout
+        self._max_lifetime = max_lifetime
+        self._stopped = Event()
+        self._evictions = 0
+        self._replacements = 0
+        self._failed_health_checks = 0
         self._connected = True
         self._start()
+        self._health_check_interval = health_check_interval
+        if health_check_interval:
+            Thread(target=self._check_health, daemon=True).start()
+        if idle_timeout is not None or max_lifetime is not None:
+            Thread(target=self._recycle, daemon=True).start()
+        if metrics_callback is not None:
+            Thread(target=report_metrics, args=(self._stopped, metrics_interval, metrics_callback, self.stats),
+                   daemon=True).start()
 
     def transport(self) -> Transport:
         """
@@ -76,27 +157,266 @@ class Pool:
         """
         return self._counter
 
+    def health_stats(self) -> Dict[str, int]:
+        """
+        Returns counters of the self-healing: how many connections were evicted, how many of them were replaced and how
+        many health checks (pings of idle connections) failed
+
+        :return: dict with evictions, replacements and failed_health_checks counters
+        """
+        return {"evictions": self._evictions, "replacements": self._replacements,
+                "failed_health_checks": self._failed_health_checks}
+
+    def wait_stats(self) -> Dict[str, Union[int, float]]:
+        """
+        Returns statistics of waiting for a free connection: number of checkouts, how many of them had to wait and how
+        many timed out, how many callers are waiting now, total, average and maximum wait time in seconds
+
+        :return: dict with checkouts, waits, timeouts, waiting, total_wait, average_wait and max_wait
+        """
+        return {"checkouts": self._checkouts, "waits": self._waits, "timeouts": self._timeouts,
+                "waiting": len(self._waiters), "total_wait": self._total_wait,
+                "average_wait": self._total_wait / self._waits if self._waits else 0.0, "max_wait": self._max_wait}
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns a snapshot of the pool telemetry: number of busy, idle and waiting for a connection, wait time
+        percentiles, latency percentiles and errors of each method, errors by type and connection churn. All durations
+        are in seconds
+
+        :return: dict with the statistics
+        """
+        idle = len(self._idle)
+        return {
+            "connections": self._counter, "busy": max(self._counter - idle, 0), "idle": idle,
+            "waiting": len(self._waiters), "min_connections": self._min, "max_connections": self._max,
+            "wait": {**self._stats.wait.snapshot(), "timeouts": self._timeouts},
+            "methods": self._stats.methods_snapshot(),
+            "errors": dict(self._stats.errors),
+            "churn": {"created": self._stats.created, "closed": self._stats.closed, **self.health_stats()},
+        }
+
     def _start(self):
         for _ in range(self._min - 1):
             self._create_new_connection()
         logger.info("Created %s connections", self._min)
 
-    def _create_new_connection(self):
-        if self._counter < self._max:
-            conn = Surreal(**self._options).connect()
-            self._main.put_nowait(conn)
+    def _create_new_connection(self) -> bool:
+        with self._lock:
+            if self._counter >= self._max:
+                return False
+            # reserve the place before connecting, so concurrent threads do not exceed the maximum
             self._counter += 1
+        try:
+            conn = Surreal(**self._options).connect()
+        except Exception:
+            with self._lock:
+                self._counter -= 1
+            raise
+        if not self._connected:
+            # the pool was closed while connecting
+            conn.close()
+            return False
+        now = time.monotonic()
+        self._created[conn] = now
+        self._last_used[conn] = now
+        self._stats.created += 1
+        self._checkin(conn)
+        return True
+
+    def _grow(self):
+        try:
+            self._create_new_connection()
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            self._last_error = e
+            logger.error("Cannot create new connection for the pool, info: %s", e)
+
+    def _checkout(self) -> Connection:
+        """
+        Takes a free connection or waits for it no longer than acquire timeout, waiters are served in FIFO order
+
+        :return: connection to use
+        :raise PoolExhaustedError: if no connection was got during acquire timeout
+        :raise OperationOnClosedConnectionError: if the pool was closed while waiting
+        """
+        start = time.monotonic()
+        with self._lock:
+            self._checkouts += 1
+            if self._idle and not self._waiters:
+                self._stats.wait.observe(0.0)
+                # the most recently used connection, so surplus ones stay idle and can be closed by idle timeout
+                return self._idle.pop()
+            waiter = _Waiter()
+            self._waiters.append(waiter)
+            grow = self._counter < self._max
+        if grow:
+            Thread(target=self._grow, daemon=True).start()
+        waiter.event.wait(self._acquire_timeout)
+        waited = time.monotonic() - start
+        with self._lock:
+            self._waits += 1
+            self._total_wait += waited
+            self._max_wait = max(self._max_wait, waited)
+            self._stats.wait.observe(waited)
+            if waiter.connection is not None:
+                return waiter.connection
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+            if not self._connected:
+                raise OperationOnClosedConnectionError("The pool was closed while waiting for a connection")
+            self._timeouts += 1
+        message = f"No free connection in {self._acquire_timeout} seconds, {self._counter} connections are busy"
+        if self._last_error is not None:
+            message = f"{message}, last error on creating a connection: {self._last_error}"
+        logger.error(message)
+        raise PoolExhaustedError(message)
+
+    def _checkin(self, connection: Connection):
+        """
+        Hands the connection to the first waiter or returns it to idle connections
+        """
+        with self._lock:
+            if self._connected:
+                if self._waiters:
+                    waiter = self._waiters.popleft()
+                    waiter.connection = connection
+                    waiter.event.set()
+                else:
+                    self._idle.append(connection)
+                return
+        # the pool is closed, the connection finished its task and can be closed too
+        self._remove(connection)
+
+    def _take_idle(self) -> Optional[Connection]:
+        """
+        Takes the least recently used idle connection for maintenance, if any
+        """
+        with self._lock:
+            return self._idle.popleft() if self._idle else None
+
+    def _remove(self, connection: Connection):
+        """
+        Closes connection, which was taken from the pool, and forgets it
+        """
+        with self._lock:
+            self._counter -= 1
+            self._stats.closed += 1
+            for live_id in [live_id for live_id, owner in self._lives.items() if owner is connection]:
+                del self._lives[live_id]
+        self._created.pop(connection, None)
+        self._last_used.pop(connection, None)
+        self._synced.pop(connection, None)
+        self._used.pop(connection, None)
+        self._applied.pop(connection, None)
+        try:
+            connection.close()
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.debug("Error on closing connection: %s", e)
+
+    def _evict(self, connection: Connection, reason: str):
+        """
+        Removes a broken connection from the pool and starts its replacement in the background
+
+        :param connection: connection to remove, it is not in the queue now
+        :param reason: reason for logging
+        """
+        with self._lock:
+            self._evictions += 1
+        logger.warning("Connection is evicted from the pool, reason: %s", reason)
+        self._remove(connection)
+        if self._connected:
+            Thread(target=self._replace, daemon=True).start()
+
+    def _replace(self, evicted: bool = True):
+        delay = REPLACE_DELAY
+        while self._connected:
+            try:
+                if self._create_new_connection() and evicted:
+                    with self._lock:
+                        self._replacements += 1
+                    logger.info("Evicted connection is replaced")
+                return
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                logger.error("Cannot replace evicted connection, next attempt in %s seconds, info: %s", delay, e)
+            if self._stopped.wait(delay):
+                return
+            delay = min(delay * 2, MAX_REPLACE_DELAY)
+
+    @staticmethod
+    def _is_healthy(connection: Connection) -> bool:
+        if not connection.is_connected():
+            return False
+        try:
+            return not connection.version().is_error()
+        except (PySurrealError, TimeoutError, OSError) as e:
+            logger.warning("Health check failed: %s", e)
+            return False
+
+    def _check_health(self):
+        """
+        Pings idle connections every health_check_interval seconds until the pool is closed
+        """
+        while not self._stopped.wait(self._health_check_interval):
+            for _ in range(len(self._idle)):
+                connection = self._take_idle()
+                if connection is None:
+                    break
+                if self._is_healthy(connection):
+                    self._checkin(connection)
+                    continue
+                with self._lock:
+                    self._failed_health_checks += 1
+                self._evict(connection, "health check failed")
+
+    def _is_pinned(self, connection: Connection) -> bool:
+        # live queries are linked to the connection, it should not be closed while they are alive
+        with self._lock:
+            return connection in self._lives.values()
+
+    def _is_expired(self, connection: Connection, now: float) -> bool:
+        return self._max_lifetime is not None and now - self._created.get(connection, now) >= self._max_lifetime \
+            and not self._is_pinned(connection)
+
+    def _recycle(self):
+        """
+        Closes idle connections over the minimum and replaces expired ones until the pool is closed
+        """
+        interval = min(value for value in (self._idle_timeout, self._max_lifetime, RECYCLE_INTERVAL)
+                       if value is not None)
+        while not self._stopped.wait(interval):
+            for _ in range(len(self._idle)):
+                connection = self._take_idle()
+                if connection is None:
+                    break
+                now = time.monotonic()
+                if self._is_expired(connection, now):
+                    logger.info("Connection reached max lifetime %s seconds, recycle it", self._max_lifetime)
+                    self._remove(connection)
+                    # a new connection can wait for the timeout, when the server is down, so do not block the loop
+                    Thread(target=self._replace, kwargs={"evicted": False}, daemon=True).start()
+                elif self._idle_timeout is not None and self._counter > self._min and \
+                        now - self._last_used.get(connection, now) >= self._idle_timeout and \
+                        not self._is_pinned(connection):
+                    logger.info("Connection is idle for %s seconds, close it", self._idle_timeout)
+                    self._remove(connection)
+                else:
+                    self._checkin(connection)
 
     def close(self):
         """
         Closes the pool. You cannot and should not use a Pool object after that
         """
-        self._connected = False
+        with self._lock:
+            self._connected = False
+            waiters, self._waiters = self._waiters, deque()
+            idle, self._idle = self._idle, deque()
+        self._stopped.set()
         logger.info("Signal to close pool")
-        while not self._main.empty():
-            # we need to gently wait for connection to finish the task
-            conn = self._main.get(timeout=self._timeout)
-            conn.close()
+        for waiter in waiters:
+            waiter.event.set()
+        # busy connections finish their tasks and are closed on return
+        for connection in idle:
+            self._remove(connection)
         logger.info("The Pool was closed")
 
     def __enter__(self):
@@ -113,100 +433,104 @@ class Pool:
         """
         return self._connected
 
+    def _sync_session(self, connection: Connection):
+        """
+        Applies changes of the pool session (use, let and unset), which this connection has not got yet
+        """
+        if self._synced.get(connection) == self._session.stamp:
+            return
+        with self._lock:
+            stamp, use, variables = self._session.stamp, self._session.use, dict(self._session.variables)
+        if use is not None and self._used.get(connection) != use[0]:
+            logger.debug("Apply use of the pool session to the connection")
+            connection.use(*use[1], **use[2])
+            self._used[connection] = use[0]
+        applied = self._applied.setdefault(connection, {})
+        for variable, (changed, args, kwargs) in variables.items():
+            if applied.get(variable) != changed:
+                logger.debug("Apply let %s of the pool session to the connection", variable)
+                connection.let(*args, **kwargs)
+                applied[variable] = changed
+        for variable in [variable for variable in applied if variable not in variables]:
+            logger.debug("Apply unset %s of the pool session to the connection", variable)
+            connection.unset(variable)
+            del applied[variable]
+        self._synced[connection] = stamp
+
+    def _remember_session(self, connection: Connection, name: str, args: Tuple, kwargs: Dict):
+        with self._lock:
+            synced = self._synced.get(connection) == self._session.stamp
+            variable = self._session.remember(name, args, kwargs)
+            stamp = self._session.stamp
+        if name == "use":
+            self._used[connection] = stamp
+        elif name == "let":
+            self._applied.setdefault(connection, {})[variable] = stamp
+        else:
+            self._applied.setdefault(connection, {}).pop(variable, None)
+        if synced:
+            # the connection got all previous changes, so it has the whole session now
+            self._synced[connection] = stamp
+
+    def _kill(self, owner: Connection, live_query_id: str) -> SurrealResult:
+        """
+        Kills the live query on the connection, which runs it. The connection is not checked out, it can be busy with
+        another request: websocket connections (only they have live queries) can be used by many threads at once
+        """
+        start = time.monotonic()
+        result = owner.kill(live_query_id)
+        self._stats.observe_call("kill", time.monotonic() - start, ERROR_RESULT if result.is_error() else "")
+        if not result.is_error():
+            with self._lock:
+                self._lives.pop(str(live_query_id), None)
+        return result
+
     def _execute(self, name, *args, **kwargs) -> SurrealResult:
         """
         Here is the main "magic", this method checks if pool is empty (no more free connections) and if so - creates new
-        connection. Then it waits until the first non-busy connection and delegates work to it, calling in method.
-        After that - always put connection back to pool
+        connection. Then it waits until the first non-busy and alive connection and delegates work to it, calling in
+        method. After that - always put connection back to pool, if it is still alive
 
         :param name: name of the connection method to call, for example, "query"
         :param args: args to call
         :param kwargs: keyword args to call
         :return: result of the query
+        :raise PoolExhaustedError: if no connection is free during acquire timeout
         """
-        if self._main.empty():
-            Thread(target=self._create_new_connection, daemon=True).start()
-        connection = self._main.get()
+        if name == "kill":
+            live_query_id = args[0] if args else kwargs["live_query_id"]
+            owner = self._lives.get(str(live_query_id))
+            if owner is not None:
+                return self._kill(owner, live_query_id)
+        connection = self._checkout()
+        while not connection.is_connected():
+            self._evict(connection, "connection is closed")
+            connection = self._checkout()
+        start = time.monotonic()
+        error = ""
         try:
+            self._sync_session(connection)
             result = getattr(connection, name)(*args, **kwargs)
+            if isinstance(result, SurrealResult) and result.is_error():
+                error = ERROR_RESULT
+            elif name in SESSION_METHODS:
+                self._remember_session(connection, name, args, kwargs)
+            elif name in LIVE_METHODS:
+                with self._lock:
+                    self._lives[str(result.result)] = connection
+        except Exception as e:
+            error = type(e).__name__
+            raise
         finally:
-            self._main.put_nowait(connection)
+            now = time.monotonic()
+            self._stats.observe_call(name, now - start, error)
+            self._last_used[connection] = now
+            if not connection.is_connected():
+                self._evict(connection, "connection was closed during the call")
+            elif self._is_expired(connection, now):
+                logger.info("Connection reached max lifetime %s seconds, recycle it", self._max_lifetime)
+                self._remove(connection)
+                Thread(target=self._replace, args=(False,), daemon=True).start()
+            else:
+                self._checkin(connection)
         return result
-
-    @connected_and_pooled
-    def query(self, query: str, variables: Optional[Dict] = None) -> SurrealResult:
-        """
-        This method used for execute a custom SurrealQL query
-
-        Refer to: https://docs.surrealdb.com/docs/integration/websocket#query
-
-        For SurrealQL refer to: https://docs.surrealdb.com/docs/surrealql/overview
-
-        Example:
-        websocket_connection.query("SELECT * FROM article;") # gets all records from article table
-        websocket_connection.query("SELECT * FROM type::table($tb);", {"tb": "article"}) # gets all records from
-        article table using variable tb to specify table
-
-        :param query: any SurrealQL query to execute
-        :param variables: a set of variables used by the query
-        :return: result of request
-        """
-
-    @connected_and_pooled
-    def db_info(self) -> SurrealResult:
-        """
-        Returns info about a current database. You should have permissions for this action.
-
-        Actually converts to QL "INFO FOR DB" to use in **query** method.
-
-        Refer to: https://docs.surrealdb.com/docs/surrealql/statements/info
-
-        :return: full database information
-        """
-
-    @connected_and_pooled
-    def db_tables(self) -> SurrealResult:
-        """
-        Returns all tables names in the current database. You should have permissions for this action.
-
-        Actually call **db_info** and parse tables attribute there.
-
-        :return: list of all tables names
-        """
-
-    @connected_and_pooled
-    def custom_live(self, custom_query: str, callback: Callable[[Dict], Any]) -> SurrealResult:
-        """
-        This method can be used to initiate custom live query - a real-time selection from a table with filters and
-        other features of Live Query. Works only for websockets.
-
-        Refer to: https://surrealdb.com/docs/surrealdb/surrealql/statements/live
-
-        Please see surrealist documentation: https://github.com/kotolex/surrealist?tab=readme-ov-file#live-query
-
-        Note: all results, DIFF, formats etc. should be specified in the query itself
-        """
-
-    @connected_and_pooled
-    def kill(self, live_query_id: str) -> SurrealResult:
-        """
-        This method is used to terminate a running live query by id
-
-        Refer to: https://docs.surrealdb.com/docs/surrealql/statements/kill
-        """
-
-    @connected_and_pooled
-    def count(self, table_name: str) -> SurrealResult:
-        """
-        Returns records count for given table. You should have permissions for this action.
-        Actually converts to QL "SELECT count() FROM {table_name} GROUP ALL;" to use in **query** method.
-
-        Refer to: https://docs.surrealdb.com/docs/surrealql/functions/count
-
-        Note: returns zero if table does not exist, if you need to check table existence use **is_table_exists**
-
-        Note: if you specify table_name with recordID like "person:john" you will get count of fields in record
-
-        :param table_name: name of the table
-        :return: result containing count, like SurrealResult(id='', error=None, result=[{'count': 1}], time='123.333µs')
-        """
@@ -0,0 +1,99 @@
+from bisect import bisect_left
+from typing import Dict, List
+
+# upper bounds of histogram buckets in seconds: 0.1 ms, 0.2 ms, 0.4 ms ... 52 s
+BOUNDS = tuple(0.0001 * 2 ** i for i in range(20))
+PERCENTILES = (50, 90, 99)
+
+
+class Histogram:
+    """
+    Latency histogram with fixed exponential buckets, it is cheap enough to be always on: one bisect and a few
+    increments per observation without locks. Under heavy contention a few observations can be lost, which is fine for
+    telemetry. Percentiles are estimated as upper bounds of buckets, so they are accurate to a factor of 2
+    """
+
+    def __init__(self):
+        self._counts: List[int] = [0] * (len(BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        """
+        Adds a value (in seconds) to the histogram
+
+        :param value: duration in seconds
+        """
+        self._counts[bisect_left(BOUNDS, value)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def percentile(self, percent: float) -> float:
+        """
+        Returns estimation of the percentile
+
+        :param percent: percentile to get, for example, 99
+        :return: upper bound of the bucket with the percentile or the maximum, zero for an empty histogram
+        """
+        if not self.count:
+            return 0.0
+        rank = self.count * percent / 100
+        seen = 0
+        for index, count in enumerate(self._counts):
+            seen += count
+            if seen >= rank and count:
+                return min(BOUNDS[index], self.max) if index < len(BOUNDS) else self.max
+        return self.max
+
+    def snapshot(self) -> Dict[str, float]:
+        """
+        Returns count, average, maximum and main percentiles (p50, p90, p99) of the histogram
+
+        :return: dict with statistics, all durations are in seconds
+        """
+        result = {"count": self.count, "average": self.total / self.count if self.count else 0.0, "max": self.max}
+        for percent in PERCENTILES:
+            result[f"p{percent}"] = self.percentile(percent)
+        return result
+
+
+class PoolStats:
+    """
+    Telemetry of a pool: wait time for a connection, latency and errors of each method (query, select, insert...) and
+    connection churn
+    """
+
+    def __init__(self):
+        self.wait = Histogram()
+        self.methods: Dict[str, Histogram] = {}
+        self.method_errors: Dict[str, int] = {}
+        self.errors: Dict[str, int] = {}
+        self.created = 0
+        self.closed = 0
+
+    def observe_call(self, name: str, duration: float, error: str = ""):
+        """
+        Stores the duration and the error (if any) of a call of a method
+
+        :param name: name of the method, for example, "query"
+        :param duration: duration of the call in seconds
+        :param error: type name of the error, empty string if the call was successful
+        """
+        histogram = self.methods.get(name)
+        if histogram is None:
+            histogram = self.methods.setdefault(name, Histogram())
+        histogram.observe(duration)
+        if error:
+            self.method_errors[name] = self.method_errors.get(name, 0) + 1
+            self.errors[error] = self.errors.get(error, 0) + 1
+
+    def methods_snapshot(self) -> Dict[str, Dict]:
+        """
+        Returns latency statistics and errors count for each called method
+
+        :return: dict of method name to its statistics
+        """
+        return {name: {**histogram.snapshot(), "errors": self.method_errors.get(name, 0)}
+                for name, histogram in list(self.methods.items())}
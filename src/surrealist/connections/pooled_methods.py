@@ -0,0 +1,345 @@
+from abc import ABC, abstractmethod
+from functools import wraps
+from logging import getLogger
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from surrealist.bulk import (DEFAULT_CHUNK_SIZE, DEFAULT_CONCURRENCY,
+                             DEFAULT_RETRIES, BulkInsertReport, bulk_insert)
+from surrealist.errors import OperationOnClosedConnectionError
+from surrealist.result import SurrealResult
+from surrealist.utils import StrOrRecord
+
+logger = getLogger("surrealist.connection.pool")
+# methods, which change the session of a connection, they are applied to all connections of the pool
+SESSION_METHODS = ("use", "let", "unset")
+
+
+def connected_and_pooled(func):
+    """
+    Wrapper to check if pool is connected ad delegate work to underlying connections
+    :param func: function to wrap
+    """
+
+    @wraps(func)
+    def wrapped(*args, **kwargs):
+        # args[0] is a self-argument in methods
+        if not args[0].is_connected():
+            message = "Your pool is already closed"
+            logger.error(message, exc_info=False)
+            raise OperationOnClosedConnectionError(message)
+        # _execute is the internal hook of the pool, see PooledMethods
+        return args[0]._execute(func.__name__, *args[1:], **kwargs)  # pylint: disable=protected-access
+
+    return wrapped
+
+
+class PooledMethods(ABC):
+    """
+    Parent for pools, contains methods of connection, which are delegated to underlying connections by _execute, see
+    Connection for their parameters and results.
+
+    _execute is the internal hook of pools: each pool implements it to choose a connection, it is called by the
+    connected_and_pooled wrapper and by RoutingPool for pools of its nodes, users should call the named methods instead
+    """
+
+    @abstractmethod
+    def is_connected(self) -> bool:
+        """
+        Checks the pool is still alive and usable
+
+        :return: True if pool is usable, False otherwise
+        """
+
+    @abstractmethod
+    def _execute(self, name, *args, **kwargs) -> SurrealResult:
+        """
+        Delegates the call of the method to an underlying connection
+
+        :param name: name of the connection method to call, for example, "query"
+        :param args: args to call
+        :param kwargs: keyword args to call
+        :return: result of the query
+        """
+
+    @connected_and_pooled
+    def count(self, table_name: str) -> SurrealResult:
+        """
+        Same as **count** of Connection, runs on one of the connections of the pool
+        """
+
+    @connected_and_pooled
+    def table_info(self, table_name: str, structured: bool = False) -> SurrealResult:
+        """
+        Same as **table_info** of Connection, runs on one of the connections of the pool
+        """
+
+    @connected_and_pooled
+    def db_info(self, structured: bool = False) -> SurrealResult:
+        """
+        Same as **db_info** of Connection, runs on one of the connections of the pool
+        """
+
+    @connected_and_pooled
+    def ns_info(self, structured: bool = False) -> SurrealResult:
+        """
+        Same as **ns_info** of Connection, runs on one of the connections of the pool
+        """
+
+    @connected_and_pooled
+    def root_info(self, structured: bool = False) -> SurrealResult:
+        """
+        Same as **root_info** of Connection, runs on one of the connections of the pool
+        """
+
+    @connected_and_pooled
+    def session_info(self) -> SurrealResult:
+        """
+        Same as **session_info** of Connection, runs on one of the connections of the pool
+        """
+
+    @connected_and_pooled
+    def info(self) -> SurrealResult:
+        """
+        Same as **info** of Connection, runs on one of the connections of the pool
+        """
+
+    @connected_and_pooled
+    def db_tables(self) -> SurrealResult:
+        """
+        Same as **db_tables** of Connection, runs on one of the connections of the pool
+        """
+
+    @connected_and_pooled
+    def is_table_exists(self, table_name: str) -> bool:
+        """
+        Same as **is_table_exists** of Connection, runs on one of the connections of the pool
+        """
+
+    @connected_and_pooled
+    def remove_table(self, table_name: str, if_exists: bool = True) -> SurrealResult:
+        """
+        Same as **remove_table** of Connection, runs on one of the connections of the pool
+        """
+
+    @connected_and_pooled
+    def show_changes(self, table_name: str, since: str, limit: int = 10) -> SurrealResult:
+        """
+        Same as **show_changes** of Connection, runs on one of the connections of the pool
+        """
+
+    @connected_and_pooled
+    def use(self, namespace: str, database: Optional[str] = None) -> SurrealResult:
+        """
+        Same as **use** of Connection, the pool applies it to all its connections
+        """
+
+    @connected_and_pooled
+    def let(self, name: str, value: Any) -> SurrealResult:
+        """
+        Same as **let** of Connection, the pool applies it to all its connections
+        """
+
+    @connected_and_pooled
+    def unset(self, name: str) -> SurrealResult:
+        """
+        Same as **unset** of Connection, the pool applies it to all its connections
+        """
+
+    @connected_and_pooled
+    def live(self, table_name: str, callback: Callable[[Dict], Any], return_diff: bool = False) -> SurrealResult:
+        """
+        Same as **live** of Connection, the live query stays on the connection, which started it
+        """
+
+    @connected_and_pooled
+    def custom_live(self, custom_query: str, callback: Callable[[Dict], Any]) -> SurrealResult:
+        """
+        Same as **custom_live** of Connection, the live query stays on the connection, which started it
+        """
+
+    @connected_and_pooled
+    def kill(self, live_query_id: str) -> SurrealResult:
+        """
+        Same as **kill** of Connection, it goes to the connection, which runs the live query
+        """
+
+    @connected_and_pooled
+    def graphql(self, query: Dict, pretty: Optional[bool] = False) -> SurrealResult:
+        """
+        Same as **graphql** of Connection, runs on one of the connections of the pool
+        """
+
+    @connected_and_pooled
+    def run(self, func_name: str, version: Optional[str] = None, args: Optional[List] = None) -> SurrealResult:
+        """
+        Same as **run** of Connection, runs on one of the connections of the pool
+        """
+
+    @connected_and_pooled
+    def version(self) -> SurrealResult:
+        """
+        Same as **version** of Connection, runs on one of the connections of the pool
+        """
+
+    @connected_and_pooled
+    def select(self, table_name: str, record_id: Optional[StrOrRecord] = None) -> SurrealResult:
+        """
+        Same as **select** of Connection, runs on one of the connections of the pool
+        """
+
+    @connected_and_pooled
+    def create(self, table_name: str, data: Dict, record_id: Optional[StrOrRecord] = None) -> SurrealResult:
+        """
+        Same as **create** of Connection, runs on one of the connections of the pool
+        """
+
+    @connected_and_pooled
+    def update(self, table_name: str, data: Dict, record_id: Optional[StrOrRecord] = None) -> SurrealResult:
+        """
+        Same as **update** of Connection, runs on one of the connections of the pool
+        """
+
+    @connected_and_pooled
+    def upsert(self, table_name: str, data: Dict, record_id: Optional[StrOrRecord] = None) -> SurrealResult:
+        """
+        Same as **upsert** of Connection, runs on one of the connections of the pool
+        """
+
+    @connected_and_pooled
+    def insert(self, table_name: str, data: Union[List, Dict]) -> SurrealResult:
+        """
+        Same as **insert** of Connection, runs on one of the connections of the pool
+        """
+
+    def bulk_insert(self, table_name: str, records: Iterable[Dict], *, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                    concurrency: int = DEFAULT_CONCURRENCY, retries: int = DEFAULT_RETRIES,
+                    on_progress: Optional[Callable[[BulkInsertReport], Any]] = None) -> BulkInsertReport:
+        """
+        This method inserts a lot of records by chunks, each chunk is inserted on its own pooled connection, so up to
+        concurrency chunks are in flight. Records are consumed lazily, failed chunks are retried.
+        See **bulk_insert** of Connection for details
+
+        :param table_name: table name to insert
+        :param records: any iterable of records (dicts), for example, a generator
+        :param chunk_size: number of records in one request
+        :param concurrency: maximum number of requests in flight
+        :param retries: number of retries for a failed chunk
+        :param on_progress: optional function to call with the report after each chunk
+        :return: report with numbers of inserted and failed rows and speed (rows_per_second)
+        """
+        if not self.is_connected():
+            raise OperationOnClosedConnectionError("Your pool is already closed")
+        return bulk_insert(lambda chunk: self.insert(table_name, chunk), records, chunk_size=chunk_size,
+                           concurrency=concurrency, retries=retries, on_progress=on_progress)
+
+    @connected_and_pooled
+    def insert_relation(self, table_name: Optional[str], data: [Dict]) -> SurrealResult:
+        """
+        Same as **insert_relation** of Connection, runs on one of the connections of the pool
+        """
+
+    @connected_and_pooled
+    def merge(self, table_name: str, data: Dict, record_id: Optional[StrOrRecord] = None) -> SurrealResult:
+        """
+        Same as **merge** of Connection, runs on one of the connections of the pool
+        """
+
+    @connected_and_pooled
+    def delete(self, table_name: str, record_id: Optional[StrOrRecord] = None) -> SurrealResult:
+        """
+        Same as **delete** of Connection, runs on one of the connections of the pool
+        """
+
+    @connected_and_pooled
+    def patch(self, table_name: str, data: Union[Dict, List], record_id: Optional[StrOrRecord] = None,
+              return_diff: bool = False) -> SurrealResult:
+        """
+        Same as **patch** of Connection, runs on one of the connections of the pool
+        """
+
+    @connected_and_pooled
+    def query(self, query: str, variables: Optional[Dict] = None,
+              rewrite_dates: Optional[bool] = None) -> SurrealResult:
+        """
+        Same as **query** of Connection, runs on one of the connections of the pool
+        """
+
+    @connected_and_pooled
+    def query_many(self, queries: List[str], variables: Optional[Dict] = None,
+                   rewrite_dates: Optional[bool] = None) -> List[SurrealResult]:
+        """
+        Same as **query_many** of Connection, runs on one of the connections of the pool
+        """
+
+    @connected_and_pooled
+    def relate(self, relate_to: str, relation_table: str, relate_from: str,
+               data: Optional[Dict] = None) -> SurrealResult:
+        """
+        Same as **relate** of Connection, runs on one of the connections of the pool
+        """
+
+    @connected_and_pooled
+    def import_data(self, path) -> SurrealResult:
+        """
+        Same as **import_data** of Connection, runs on one of the connections of the pool
+        """
+
+    @connected_and_pooled
+    def export(self) -> str:
+        """
+        Same as **export** of Connection, runs on one of the connections of the pool
+        """
+
+    @connected_and_pooled
+    def ml_import(self, path) -> SurrealResult:
+        """
+        Same as **ml_import** of Connection, runs on one of the connections of the pool
+        """
+
+    @connected_and_pooled
+    def ml_export(self, name: str, version: str) -> str:
+        """
+        Same as **ml_export** of Connection, runs on one of the connections of the pool
+        """
+
+
+class PoolSession:
+    """
+    Session methods (use, let and unset), which were called on a pool: arguments of the last use and of the last let
+    of each variable, unset removes the variable. Each change gets a new stamp, so a connection can apply only changes,
+    which it has not got yet
+    """
+
+    def __init__(self):
+        self.stamp = 0
+        self.use: Optional[Tuple[int, Tuple, Dict]] = None
+        self.variables: Dict[str, Tuple[int, Tuple, Dict]] = {}
+
+    def remember(self, name: str, args: Tuple, kwargs: Dict) -> Optional[str]:
+        """
+        Remembers a successful call of the session method
+
+        :param name: name of the method: use, let or unset
+        :param args: args of the call
+        :param kwargs: keyword args of the call
+        :return: name of the variable for let and unset, None for use
+        """
+        self.stamp += 1
+        if name == "use":
+            self.use = (self.stamp, args, kwargs)
+            return None
+        variable = args[0] if args else kwargs["name"]
+        if name == "let":
+            self.variables[variable] = (self.stamp, args, kwargs)
+        else:
+            self.variables.pop(variable, None)
+        return variable
+
+    def calls(self) -> List[Tuple[str, Tuple, Dict]]:
+        """
+        Returns calls to apply the whole session to a new connection or a pool: use first, then let of each variable
+
+        :return: list of method names with their args and keyword args
+        """
+        calls = [("use", self.use[1], self.use[2])] if self.use is not None else []
+        return calls + [("let", args, kwargs) for _, args, kwargs in self.variables.values()]
@@ -0,0 +1,317 @@
+import re
+import time
+from itertools import count
+from logging import getLogger
+from threading import Event, Lock, Thread
+from typing import Any, Dict, List, Optional, Union
+
+from surrealist.connections.connection import Connection
+from surrealist.connections.pool import (DEFAULT_METRICS_INTERVAL, Pool,
+                                         report_metrics)
+from surrealist.connections.pooled_methods import (SESSION_METHODS,
+                                                   PooledMethods, PoolSession)
+from surrealist.enums import RoutingPolicy, Transport
+from surrealist.errors import (HttpClientError, HttpConnectionError,
+                               PoolExhaustedError,
+                               WebSocketConnectionClosedError,
+                               WebSocketConnectionError)
+from surrealist.result import SurrealResult
+from surrealist.surreal import Surreal
+
+logger = getLogger("surrealist.connection.routing_pool")
+# how long a failed node gets no requests
+DEFAULT_EJECT_TIME = 30
+# weight of the last request in the average latency of a node
+LATENCY_WEIGHT = 0.2
+READ_METHODS = {"select", "count", "db_info", "db_tables", "table_info", "ns_info", "root_info", "session_info",
+                "info", "is_table_exists", "version", "show_changes", "export"}
+# a query is read-only if it has no words of writing statements, false positives only send a query to the primary
+WRITE_WORDS = re.compile(r"\b(CREATE|UPDATE|UPSERT|DELETE|INSERT|RELATE|DEFINE|REMOVE|ALTER|LET|BEGIN|COMMIT|CANCEL|"
+                         r"KILL|LIVE|USE|REBUILD|IMPORT|fn::|api::|ml::)\b", re.IGNORECASE)
+READ_START = re.compile(r"^\s*(SELECT|INFO|SHOW|RETURN)\b", re.IGNORECASE)
+# options of the Pool, which are options of Surreal object too
+SURREAL_OPTIONS = ("namespace", "database", "access", "credentials", "use_http", "timeout", "codec", "compression")
+# errors of a node itself, not of a query
+NODE_ERRORS = (HttpClientError, HttpConnectionError, WebSocketConnectionError, WebSocketConnectionClosedError,
+               PoolExhaustedError, TimeoutError, OSError)
+
+
+def is_read_only(name: str, *args) -> bool:
+    """
+    Checks the call of the pool method does not change data, so it can go to any node
+
+    :param name: name of the method
+    :param args: arguments of the call, the first one is a query text for query method
+    :return: True if the call is read-only
+    """
+    if name in READ_METHODS:
+        return True
+    if name != "query" or not args or not isinstance(args[0], str):
+        return False
+    statements = [statement for statement in args[0].split(";") if statement.strip()]
+    return bool(statements) and all(READ_START.match(statement) for statement in statements) \
+        and not WRITE_WORDS.search(args[0])
+
+
+class Node:
+    """
+    One SurrealDB node of the routing pool with its own pool of connections
+    """
+
+    def __init__(self, url: str, pool: Optional[Pool] = None):
+        self.url = url
+        self.pool = pool
+        self.outstanding = 0
+        self.latency = 0.0
+        self.ejected_until = 0.0
+        self.ejections = 0
+        # held while the pool of the node is created, so only one thread connects to the node
+        self.connecting = Lock()
+
+    def is_available(self, now: float) -> bool:
+        """
+        Checks the node is not ejected
+
+        :param now: current time of time.monotonic
+        :return: True if the node can get requests
+        """
+        return now >= self.ejected_until
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns telemetry of the node: outstanding requests, average latency, ejections and stats of its pool
+
+        :return: dict with the statistics
+        """
+        return {"outstanding": self.outstanding, "latency": self.latency, "ejections": self.ejections,
+                "ejected": not self.is_available(time.monotonic()),
+                "pool": self.pool.stats() if self.pool is not None else None}
+
+
+class RoutingPool(PooledMethods):
+    """
+    Represents a pool of connections to several SurrealDB nodes without a load balancer in front of them. The first url
+    is the primary node, all writes (and live queries) go to it. Read-only methods (select, count, info and queries
+    with SELECT, INFO, SHOW or RETURN statements only) can go to any node, the node is chosen by the routing policy:
+    round-robin, the least number of outstanding requests or the least average latency.
+
+    A node, which failed with a connection error, is ejected for eject_time seconds, read-only request is repeated on
+    another node. Each node has its own Pool, all pool options are applied to each of them, metrics_callback gets
+    stats of the routing pool. Session methods (use, let and unset) are applied to all nodes.
+    """
+
+    def __init__(self, first_connection: Connection, urls: List[str],
+                 routing: RoutingPolicy = RoutingPolicy.ROUND_ROBIN, eject_time: float = DEFAULT_EJECT_TIME,
+                 **pool_options):
+        self._routing = routing
+        self._eject_time = eject_time
+        metrics_callback = pool_options.pop("metrics_callback", None)
+        metrics_interval = pool_options.pop("metrics_interval", DEFAULT_METRICS_INTERVAL)
+        self._options = pool_options
+        self._stopped = Event()
+        # the session to apply to nodes, which connect later
+        self._session = PoolSession()
+        self._lock = Lock()
+        self._counter = count()
+        self._nodes = [Node(urls[0], Pool(first_connection, urls[0], **pool_options))]
+        for url in urls[1:]:
+            node = Node(url)
+            self._nodes.append(node)
+            self._connect(node)
+        self._connected = True
+        if metrics_callback is not None:
+            Thread(target=report_metrics, args=(self._stopped, metrics_interval, metrics_callback, self.stats),
+                   daemon=True).start()
+
+    def _connect(self, node: Node) -> bool:
+        """
+        Creates the pool for the node, which was not available before, ejects the node on fail. If another thread
+        connects to the node now, it does not wait, the node is skipped for this request
+        """
+        if not node.connecting.acquire(blocking=False):
+            return False
+        try:
+            if node.pool is not None:
+                return True
+            options = {key: value for key, value in self._options.items() if key in SURREAL_OPTIONS}
+            try:
+                first = Surreal(node.url, **options).connect()
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                self._eject(node, e)
+                return False
+            pool = Pool(first, node.url, **self._options)
+            with self._lock:
+                calls = self._session.calls()
+            for name, args, kwargs in calls:
+                # _execute is the internal hook of pools (see PooledMethods), the routing pool drives pools of its nodes
+                pool._execute(name, *args, **kwargs)  # pylint: disable=protected-access
+            node.pool = pool
+            return True
+        finally:
+            node.connecting.release()
+
+    def _eject(self, node: Node, error: Exception):
+        with self._lock:
+            node.ejected_until = time.monotonic() + self._eject_time
+            node.ejections += 1
+        logger.warning("Node %s is ejected for %s seconds, reason: %s", node.url, self._eject_time, error)
+
+    def transport(self) -> Transport:
+        """
+        Returns the transport type of the underlying connections
+        :return: Transport enum member
+        """
+        return self._nodes[0].pool.transport()
+
+    @property
+    def connections_count(self) -> int:
+        """
+        Get the current number of connections to all nodes
+
+        :return: number of connections
+        """
+        return sum(node.pool.connections_count for node in self._nodes if node.pool is not None)
+
+    def _pools(self) -> List[Pool]:
+        return [node.pool for node in self._nodes if node.pool is not None]
+
+    def health_stats(self) -> Dict[str, int]:
+        """
+        Returns counters of evicted and replaced connections and failed health checks of all nodes
+
+        :return: dict with evictions, replacements and failed_health_checks counters
+        """
+        result = {"evictions": 0, "replacements": 0, "failed_health_checks": 0}
+        for pool in self._pools():
+            for key, value in pool.health_stats().items():
+                result[key] += value
+        return result
+
+    def wait_stats(self) -> Dict[str, Union[int, float]]:
+        """
+        Returns statistics of waiting for a free connection of all nodes
+
+        :return: dict with checkouts, waits, timeouts, waiting, total_wait, average_wait and max_wait
+        """
+        result = {"checkouts": 0, "waits": 0, "timeouts": 0, "waiting": 0, "total_wait": 0.0, "max_wait": 0.0}
+        for pool in self._pools():
+            stats = pool.wait_stats()
+            for key in ("checkouts", "waits", "timeouts", "waiting", "total_wait"):
+                result[key] += stats[key]
+            result["max_wait"] = max(result["max_wait"], stats["max_wait"])
+        result["average_wait"] = result["total_wait"] / result["waits"] if result["waits"] else 0.0
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns the routing policy and a snapshot of telemetry of each node: outstanding requests, average latency,
+        ejections and stats of its pool
+
+        :return: dict with the statistics
+        """
+        return {"routing": self._routing.value, "primary": self._nodes[0].url,
+                "nodes": {node.url: node.stats() for node in self._nodes}}
+
+    def close(self):
+        """
+        Closes pools of all nodes. You cannot and should not use a RoutingPool object after that
+        """
+        self._connected = False
+        self._stopped.set()
+        for pool in self._pools():
+            pool.close()
+        logger.info("The RoutingPool was closed")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_details):
+        self.close()
+
+    def is_connected(self) -> bool:
+        """
+        Checks the pool is still alive and usable
+
+        :return: True if pool is usable, False otherwise
+        """
+        return self._connected
+
+    def _choose(self, exclude: List[Node]) -> Optional[Node]:
+        """
+        Chooses a node for a read-only request by the routing policy, ejected nodes are skipped while there are
+        available ones
+        """
+        now = time.monotonic()
+        available = [node for node in self._nodes if node not in exclude and node.is_available(now)
+                     and (node.pool is not None or self._connect(node))]
+        if not available:
+            return None
+        if self._routing == RoutingPolicy.LEAST_OUTSTANDING:
+            return min(available, key=lambda node: node.outstanding)
+        if self._routing == RoutingPolicy.LATENCY:
+            return min(available, key=lambda node: node.latency)
+        return available[next(self._counter) % len(available)]
+
+    def _call(self, node: Node, name: str, *args, **kwargs) -> SurrealResult:
+        with self._lock:
+            node.outstanding += 1
+        start = time.monotonic()
+        try:
+            return node.pool._execute(name, *args, **kwargs)  # pylint: disable=protected-access
+        finally:
+            duration = time.monotonic() - start
+            with self._lock:
+                node.outstanding -= 1
+                node.latency = duration if not node.latency else \
+                    node.latency * (1 - LATENCY_WEIGHT) + duration * LATENCY_WEIGHT
+
+    def _broadcast(self, name, *args, **kwargs) -> SurrealResult:
+        """
+        Applies the session method to all nodes, returns the result of the primary node
+        """
+        result = self._call(self._nodes[0], name, *args, **kwargs)
+        if isinstance(result, SurrealResult) and result.is_error():
+            return result
+        with self._lock:
+            self._session.remember(name, args, kwargs)
+        for node in self._nodes[1:]:
+            if node.pool is not None:
+                try:
+                    self._call(node, name, *args, **kwargs)
+                except NODE_ERRORS as e:
+                    self._eject(node, e)
+        return result
+
+    def _execute(self, name, *args, **kwargs) -> SurrealResult:
+        """
+        Sends writes to the primary node, read-only requests to a node chosen by the routing policy. On a connection
+        error the node is ejected and the read-only request is repeated on another node
+
+        :param name: name of the connection method to call, for example, "query"
+        :param args: args to call
+        :param kwargs: keyword args to call
+        :return: result of the query
+        """
+        primary = self._nodes[0]
+        if name in SESSION_METHODS:
+            return self._broadcast(name, *args, **kwargs)
+        if not is_read_only(name, *args):
+            try:
+                return self._call(primary, name, *args, **kwargs)
+            except NODE_ERRORS as e:
+                self._eject(primary, e)
+                raise
+        tried = []
+        while True:
+            node = self._choose(tried)
+            if node is None:
+                # all nodes are ejected, the primary is the last resort
+                return self._call(primary, name, *args, **kwargs)
+            tried.append(node)
+            try:
+                return self._call(node, name, *args, **kwargs)
+            except NODE_ERRORS as e:
+                self._eject(node, e)
+                if len(tried) == len(self._nodes):
+                    raise
+                logger.info("Repeat %s on another node", name)
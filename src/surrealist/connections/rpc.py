@@ -0,0 +1,263 @@
+from logging import getLogger
+from typing import Any, Dict, List, Optional, Union
+
+from surrealist.errors import WrongParameterError
+from surrealist.record_id import RecordId
+from surrealist.result import SurrealResult
+from surrealist.utils import (LogValue, StrOrRecord, clean_dates,
+                              get_table_or_record_id)
+
+logger = getLogger("surrealist.connections.rpc")
+
+# Builders of RPC requests and handlers of their results, shared by synchronous and asynchronous connections, so
+# both of them send the same requests and return the same results
+
+
+def many_statements(queries: List[str]) -> List[str]:
+    """
+    Prepares statements of query_many to join them in one query: each of them ends with ";"
+
+    :param queries: texts of statements
+    :return: texts of statements with ";" at the end
+    :raise WrongParameterError: if there are no queries
+    """
+    if not queries:
+        raise WrongParameterError("Expected one or more queries")
+    logger.info("Operation: QUERY MANY. Statements: %s", len(queries))
+    return [query if query.rstrip().endswith(";") else f"{query};" for query in queries]
+
+
+def table_request(method: str, table_name: str, record_id: Optional[StrOrRecord] = None) -> Dict:
+    """
+    Returns request of select or delete method
+
+    :param method: select or delete
+    :param table_name: table name or table name with record_id
+    :param record_id: optional parameter, if it exists it will transform table_name to "table_name:record_id"
+    :return: RPC request
+    """
+    table_name = get_table_or_record_id(table_name, record_id)
+    logger.info("Operation: %s. Table: %s", method.upper(), table_name)
+    return {"method": method, "params": [table_name]}
+
+
+def data_request(method: str, table_name: Optional[str], data: Union[Dict, List],
+                 record_id: Optional[StrOrRecord] = None) -> Dict:
+    """
+    Returns request of update, upsert, merge, insert or insert_relation method
+
+    :param method: name of the method
+    :param table_name: table name or table name with record_id
+    :param data: dict or list with data
+    :param record_id: optional parameter, if it exists it will transform table_name to "table_name:record_id"
+    :return: RPC request
+    """
+    table_name = get_table_or_record_id(table_name, record_id)
+    logger.info("Operation: %s. Table: %s, data: %s", method.upper().replace("_", "-"), table_name, LogValue(data))
+    return {"method": method, "params": [table_name, data]}
+
+
+def create_request(table_name: str, data: Dict, record_id: Optional[StrOrRecord] = None) -> Dict:
+    """
+    Returns request of create method, record_id is set to data
+
+    :param table_name: table name
+    :param data: dict with data to create
+    :param record_id: optional parameter, it can be string or record_id object
+    :return: RPC request
+    """
+    if record_id is not None:
+        if isinstance(record_id, str):
+            record_id = RecordId(record_id, table=table_name)
+        data["id"] = record_id.to_valid_string()
+    logger.info("Operation: CREATE. Table: %s, data: %s", table_name, LogValue(data))
+    return {"method": "create", "params": [table_name, data]}
+
+
+def patch_request(table_name: str, data: Union[Dict, List], record_id: Optional[StrOrRecord] = None,
+                  return_diff: bool = False) -> Dict:
+    """
+    Returns request of patch method
+
+    :param table_name: table name or table name with record_id
+    :param data: list with json-patch data
+    :param record_id: optional parameter, if it exists it will transform table_name to "table_name:record_id"
+    :param return_diff: True to get only DIFF info
+    :return: RPC request
+    """
+    table_name = get_table_or_record_id(table_name, record_id)
+    params = [table_name, data]
+    if return_diff:
+        params.append(return_diff)
+    logger.info("Operation: PATCH. Table: %s, data: %s, use DIFF: %s", table_name, LogValue(data), return_diff)
+    return {"method": "patch", "params": params}
+
+
+def relate_request(relate_to: str, relation_table: str, relate_from: str, data: Optional[Dict] = None) -> Dict:
+    """
+    Returns request of relate method
+
+    :param relate_to: the record to relate to
+    :param relation_table: name of the relation table
+    :param relate_from: the record to relate from
+    :param data: dict containing the data for the new record
+    :return: RPC request
+    """
+    params = [relate_to, relation_table, relate_from]
+    if data is not None:
+        params.append(data)
+    logger.info("Operation: RELATE. Relate_to: %s, relation_table: %s, relate_from: %s, data: %s", relate_to,
+                relation_table, relate_from, LogValue(data))
+    return {"method": "relate", "params": params}
+
+
+def run_request(func_name: str, version: Optional[str] = None, args: Optional[List] = None) -> Dict:
+    """
+    Returns request of run method
+
+    :param func_name: the name of the function or model to execute
+    :param version: optional parameter, the version of the function or model
+    :param args: the list of arguments to pass to the function or model
+    :return: RPC request
+    """
+    params = [func_name]
+    if version is not None:
+        params.append(version)
+    if args is not None:
+        if len(params) == 1:
+            params.append(None)
+        params.append(args)
+    logger.info("Operation: RUN. Function: %s, version: %s, args: %s", func_name, version, LogValue(args))
+    return {"method": "run", "params": params}
+
+
+def query_request(query: str, variables: Optional[Dict], rewrite_dates: bool) -> Dict:
+    """
+    Returns request of query method
+
+    :param query: SurrealQL query
+    :param variables: a set of variables used by the query
+    :param rewrite_dates: move Surreal dates (d'...') out of quotes in the query
+    :return: RPC request
+    """
+    if rewrite_dates:
+        query = clean_dates(query)
+    params = [query]
+    if variables is not None:
+        params.append(variables)
+    logger.info("Operation: QUERY. Query: %s, variables: %s", LogValue(query), LogValue(variables))
+    return {"method": "query", "params": params}
+
+
+def query_result(result: SurrealResult, request: Dict) -> SurrealResult:
+    """
+    Keeps the query (and its variables, if any) in the result
+
+    :param result: result of the query request
+    :param request: the query request
+    :return: the same result
+    """
+    params = request["params"]
+    result.query = params[0] if len(params) == 1 else params
+    return result
+
+
+def select_result(result: SurrealResult) -> SurrealResult:
+    """
+    Makes a list of the result of select method, as one record is not in a list
+
+    :param result: result of the select request
+    :return: the same result
+    """
+    if not isinstance(result.result, List) and not result.is_error():
+        result.result = [result.result] if result.result else []
+    return result
+
+
+def create_result(result: SurrealResult) -> SurrealResult:
+    """
+    Takes the created record from the list
+
+    :param result: result of the create request
+    :return: the same result
+    """
+    if isinstance(result.result, List) and len(result.result) == 1:
+        result.result = result.result[0]
+    return result
+
+
+def count_query(table_name: str) -> str:
+    """
+    Returns query to count records of the table
+
+    :param table_name: name of the table
+    :return: text of the query
+    """
+    logger.info("Query-Operation: COUNT. Table: %s", table_name)
+    return f"SELECT count() FROM {table_name} GROUP ALL;"
+
+
+def count_result(result: SurrealResult) -> SurrealResult:
+    """
+    Puts the number of records to the result of the count query
+
+    :param result: result of the count query
+    :return: the same result
+    """
+    if not result.is_error():
+        result.result = get_count(result.result)
+    return result
+
+
+def get_count(res: Any) -> int:
+    """
+    Finds the count in the (nested) result of the count query, zero if there are no records
+
+    :param res: result of the count query
+    :return: number of records
+    """
+    if not res:
+        return 0
+    if 'count' in res:
+        return res['count']
+    if 'result' in res:
+        return get_count(res["result"])
+    return get_count(res[0])
+
+
+def info_query(type_: str, structured: bool = False) -> str:
+    """
+    Returns INFO FOR query
+
+    :param type_: TABLE with the name, DB, NS or ROOT
+    :param structured: if True, use STRUCTURE statement
+    :return: text of the query
+    """
+    if structured:
+        type_ = f"{type_} STRUCTURE"
+    logger.info("Query-Operation: %s_INFO", type_)
+    return f"INFO FOR {type_};"
+
+
+def tables_result(result: SurrealResult) -> SurrealResult:
+    """
+    Takes names of the tables from the result of INFO FOR DB query
+
+    :param result: result of the db info query
+    :return: the same result
+    """
+    result.result = list(result.result["tables"].keys())
+    return result
+
+
+def remove_table_query(table_name: str, if_exists: bool = True) -> str:
+    """
+    Returns REMOVE TABLE query
+
+    :param table_name: the name of the table
+    :param if_exists: if True, will use IF EXISTS statement for the query
+    :return: text of the query
+    """
+    logger.info("Query-Operation: REMOVE. Table name %s", table_name)
+    add = "" if not if_exists else "IF EXISTS"
+    return f"REMOVE TABLE {add} {table_name};"
@@ -1,16 +1,19 @@
 import urllib.parse
+from concurrent.futures import Future
 from logging import getLogger
 from pathlib import Path
 from typing import Any, Callable, Dict, Optional, Tuple, Union
 
-from surrealist.clients.ws_client import WebSocketClient
+from surrealist.clients.ws_client import (DEFAULT_RECONNECT_ATTEMPTS,
+                                         WebSocketClient)
+from surrealist.codecs import Codec
 from surrealist.connections.connection import Connection, connected
 from surrealist.enums import Transport
 from surrealist.errors import (CompatibilityError, SurrealConnectionError,
                                WebSocketConnectionClosedError,
                                WebSocketConnectionError)
 from surrealist.result import SurrealResult
-from surrealist.utils import AC, DB, DEFAULT_TIMEOUT, NS
+from surrealist.utils import AC, DB, DEFAULT_TIMEOUT, NS, LogValue
 
 logger = getLogger("surrealist.connections.websocket")
 
@@ -29,12 +32,20 @@ class WebSocketConnection(Connection):
     On creating, this object tries to create connection with specified parameters and will raise exception on fail.
     If namespace and database specified - USE method are called automatically
     If credentials specified - SIGNIN are called automatically
+
+    If the connection drops, it reconnects automatically (see reconnect_attempts) and restores the session: SIGNIN,
+    USE, all LET variables and live queries (with the same callbacks, old live ids still can be used to kill them)
     """
 
     def __init__(self, url: str, db_params: Optional[Dict] = None, credentials: Optional[Tuple[str, str]] = None,
-                 timeout: int = DEFAULT_TIMEOUT):
+                 timeout: int = DEFAULT_TIMEOUT, codec: Optional[Codec] = None,
+                 reconnect_attempts: int = DEFAULT_RECONNECT_ATTEMPTS):
         super().__init__(db_params, credentials, timeout)
         self._url = url
+        self._signin_params: Tuple[Optional[str], ...] = (None, None, None)
+        self._variables: Dict[str, Any] = {}
+        # live id from the first LIVE request -> request, callback and the current live id (it changes on reconnect)
+        self._lives: Dict[str, Tuple[Dict, Callable, str]] = {}
         base_url = urllib.parse.urlparse(url.lower())
         self._db_params = {}
         if db_params:
@@ -49,7 +60,8 @@ class WebSocketConnection(Connection):
         if base_url.scheme in ("http", "https"):
             self._base_url = f"{base_url.scheme.replace('http', 'ws')}://{base_url.netloc}/rpc"
         try:
-            self._client = WebSocketClient(self._base_url, timeout)
+            self._client = WebSocketClient(self._base_url, timeout, codec, reconnect_attempts,
+                                           on_reconnect=self._restore_session)
         except TimeoutError:
             logger.error("Cant connect to %s in %s seconds", self._base_url, self._timeout)
             raise SurrealConnectionError(f"Cant connect to {self._base_url} in {timeout} seconds.\n"
@@ -76,6 +88,7 @@ class WebSocketConnection(Connection):
             ac = self._db_params.get(AC)
             if credentials:
                 self._user, self._pass = self._credentials
+                self._signin_params = (ns, db, ac)
                 signin_result = self._signin(self._user, self._pass, ns, db, ac)
                 if signin_result.is_error():
                     logger.error("Error on connecting to %s. Info %s", self._base_url, signin_result)
@@ -96,12 +109,63 @@ class WebSocketConnection(Connection):
                     raise WebSocketConnectionError(f"Error on connecting to '{self._base_url}'.\nInfo: {signin_result}")
                 self._token = signin_result.result
 
+    def _restore_session(self):
+        """
+        Called after reconnect: signs in and uses namespace and database again, sets all variables and registers
+        all live queries again
+        """
+        if self._credentials:
+            signin_result = self._signin(self._user, self._pass, *self._signin_params)
+            if signin_result.is_error():
+                raise WebSocketConnectionError(f"Cant sign in again after reconnect. Info: {signin_result.result}")
+            self._token = signin_result.result
+        if self._db_params.get(NS) and self._db_params.get(DB):
+            use_result = self.use(self._db_params[NS], self._db_params[DB])
+            if use_result.is_error():
+                raise WebSocketConnectionError(f"Cant use {self._db_params} after reconnect. Info: {use_result.result}")
+        for name, value in self._variables.items():
+            self._run({"method": "let", "params": [name, value]})
+        for first_id, (data, callback, _) in list(self._lives.items()):
+            live_id = self._get_live_id(self._run(data, callback))
+            if live_id is None:
+                logger.error("Cant restore live query %s after reconnect", first_id)
+                self._lives.pop(first_id)
+            else:
+                logger.info("Live query %s is restored with id %s", first_id, live_id)
+                self._lives[first_id] = (data, callback, live_id)
+        logger.info("Session on %s is restored", self._base_url)
+
+    @staticmethod
+    def _get_live_id(result: SurrealResult) -> Optional[str]:
+        # the result of a custom live query statement is unwrapped by to_result, so both kinds have the id in result
+        if result.is_error() or result.is_empty():
+            return None
+        return str(result.result)
+
     def transport(self) -> Transport:
         """
         Returns the transport type for websocket connection
         """
         return Transport.WEBSOCKET
 
+    @property
+    def url(self) -> str:
+        """
+        Returns url of the websocket endpoint
+
+        :return: url
+        """
+        return self._base_url
+
+    @property
+    def timeout(self) -> int:
+        """
+        Returns timeout in seconds to wait for responses
+
+        :return: timeout
+        """
+        return self._timeout
+
     @connected
     def use(self, namespace: str, database: Optional[str] = None) -> SurrealResult:
         """
@@ -159,8 +223,10 @@ class WebSocketConnection(Connection):
         if return_diff:
             params.append(True)
         data = {"method": "live", "params": params}
-        logger.info("Operation: LIVE. Data: %s", params)
-        return self._run(data, callback)
+        logger.info("Operation: LIVE. Data: %s", LogValue(params))
+        result = self._run(data, callback)
+        self._remember_live(data, callback, result)
+        return result
 
     @connected
     def custom_live(self, custom_query: str, callback: Callable[[Dict], Any]) -> SurrealResult:
@@ -184,11 +250,17 @@ class WebSocketConnection(Connection):
         :return: result of request with the live_id in 'result' field
         """
         data = {"method": "query", "params": [custom_query], "additional": "live"}
-        logger.info("Operation: CUSTOM LIVE. Query: %s", custom_query)
+        logger.info("Operation: CUSTOM LIVE. Query: %s", LogValue(custom_query))
         result = self._run(data, callback)
+        self._remember_live(data, callback, result)
         result.query = custom_query
         return result
 
+    def _remember_live(self, data: Dict, callback: Callable, result: SurrealResult):
+        live_id = self._get_live_id(result)
+        if live_id is not None:
+            self._lives[live_id] = (data, callback, live_id)
+
     @connected
     def kill(self, live_query_id: str) -> SurrealResult:
         """
@@ -201,9 +273,51 @@ class WebSocketConnection(Connection):
         :param live_query_id: id for the query to kill
         :return: result of request
         """
+        first_id = str(live_query_id)
+        if first_id in self._lives:
+            # after reconnect the live query has a new id
+            live_query_id = self._lives[first_id][2]
         data = {"method": "kill", "params": [live_query_id]}
         logger.info("Operation: KILL. Live_id: %s", live_query_id)
-        return self._run(data)
+        result = self._run(data)
+        if not result.is_error():
+            self._lives.pop(first_id, None)
+        return result
+
+    @connected
+    def let(self, name: str, value: Any) -> SurrealResult:
+        result = super().let(name, value)
+        if not result.is_error():
+            # to set it again after reconnect
+            self._variables[name] = value
+        return result
+
+    @connected
+    def unset(self, name: str) -> SurrealResult:
+        result = super().unset(name)
+        if not result.is_error():
+            self._variables.pop(name, None)
+        return result
+
+    @connected
+    def submit(self, data: Dict, callback: Optional[Callable[[Dict], Any]] = None) -> Future:
+        """
+        This method sends a raw RPC request without waiting for a response, so one thread can pipeline a lot of
+        requests on the same socket and collect results later
+
+        Refer to: https://surrealdb.com/docs/surrealdb/integration/rpc
+
+        Example:
+        futures = [websocket_connection.submit({"method": "create", "params": ["person", {"age": i}]})
+                   for i in range(100)]
+        results = [future.result(timeout=10) for future in futures]
+
+        :param data: dict with method and params of the RPC request
+        :param callback: a function to call on live query events, use it only with a live method
+        :return: future, which will contain SurrealResult
+        """
+        logger.info("Operation: SUBMIT. Method: %s", data.get("method"))
+        return self._client.submit(data, callback)
 
     def export(self):
         """
@@ -267,9 +381,10 @@ class WebSocketConnection(Connection):
             self._client.close()
 
     def is_connected(self) -> bool:
-        return self._client.is_connected()
+        # the connection is still usable while reconnecting, requests wait for it
+        return self._client.is_connected() or self._client.is_reconnecting()
 
     def _run(self, data, callback: Callable = None) -> SurrealResult:
         result = self._client.send(data, callback)
-        logger.info("Got result: %s", result)
+        logger.info("Got result: %s", LogValue(result))
         return result
@@ -34,3 +34,12 @@ class AutoOrNone(Enum):
     """
     AUTO = auto()
     NONE = auto()
+
+
+class RoutingPolicy(Enum):
+    """
+    Represents policies to choose a node for read-only requests, when the pool works with several SurrealDB nodes
+    """
+    ROUND_ROBIN = "round_robin"
+    LEAST_OUTSTANDING = "least_outstanding"
+    LATENCY = "latency"
@@ -64,6 +64,19 @@ class OperationOnClosedConnectionError(PySurrealError):
     """
 
 
+class PoolExhaustedError(PySurrealError):
+    """
+    Raises if all connections of the pool are busy, the maximum is reached and no connection was returned to the pool
+    during acquire timeout
+    """
+
+
+class QueryError(PySurrealError):
+    """
+    Raises when SurrealDB returns an error instead of expected records
+    """
+
+
 class CompatibilityError(PySurrealError):
     """
     Raises on attempt to use methods incompatible for that transport (websocket ot http), for example **live** do not
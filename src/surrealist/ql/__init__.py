@@ -1,6 +1,10 @@
+from .async_database import AsyncDatabase, AsyncTable
 from .database import Database
 from .pool_database import DatabaseConnectionsPool
 from .statements.simple_statements import Where
+from .statements.statement import CompiledStatement
+from .statements.utils import Param
 from .table import Table
 
-__all__ = ("Database", "DatabaseConnectionsPool", "Table", "Where",)
+__all__ = ("Database", "DatabaseConnectionsPool", "Table", "Where", "AsyncDatabase", "AsyncTable", "Param",
+           "CompiledStatement")
@@ -0,0 +1,122 @@
+import logging
+from typing import Any, Awaitable, Optional, Tuple, Union
+
+from surrealist.codecs import Codec
+from surrealist.connections.async_ws_connection import \
+    AsyncWebSocketConnection
+from surrealist.ql.database import Database
+from surrealist.ql.table import Table
+from surrealist.result import SurrealResult
+from surrealist.surreal import Surreal
+from surrealist.utils import DEFAULT_TIMEOUT
+
+logger = logging.getLogger("surrealist.databaseQL.async")
+
+
+async def _awaited_result(result: Awaitable[SurrealResult]) -> Any:
+    return (await result).result
+
+
+class AsyncTable(Table):
+    """
+    Represents a table of the database for asyncio code. All statements are the same as for Table, but their **run**
+    method returns an awaitable, as well as methods which go to the database at once (count, info, drop, etc.), so
+    they should be awaited: count = await db.person.count()
+
+    Example:
+    result = await db.person.select().where("age > 18").run()
+    """
+
+    @staticmethod
+    def _result_of(result: Awaitable[SurrealResult]) -> Awaitable[Any]:
+        return _awaited_result(result)
+
+    def __repr__(self):
+        return f"AsyncTable(name={self._name}, connection with {self._connection.transport().value} transport)"
+
+
+class AsyncDatabase(Database):
+    """
+    Represents connected database (in some namespace) for asyncio code. It works over AsyncWebSocketConnection, so
+    **run** of all statements returns an awaitable and no thread is used per request.
+
+    Example:
+    async with await AsyncDatabase.connect("ws://127.0.0.1:8000/rpc", "test", "test",
+                                           credentials=("root", "root")) as db:
+        tables = await db.tables()
+        result = await db.person.create().content({"name": "John"}).run()
+    """
+
+    def __init__(self, connection: AsyncWebSocketConnection):
+        """
+        Uses existing asynchronous connection, use **connect** to create a new one
+        :param connection: active connection on database level
+        """
+        super().__init__("", "", "", active_connection=connection)
+
+    @classmethod
+    async def connect(cls, url: str, namespace: str, database: str, access: Optional[str] = None,
+                      credentials: Optional[Tuple[str, str]] = None,
+                      timeout: int = DEFAULT_TIMEOUT, codec: Optional[Union[str, Codec]] = None) -> "AsyncDatabase":
+        """
+        Creates a new asynchronous connection to the database
+        :param url: url of the SurrealDB
+        :param namespace: name of the namespace
+        :param database: name of the database
+        :param access: access method
+        :param credentials: pair of username and password
+        :param timeout: timeout for the queries
+        :param codec: json library to use on the wire, see Surreal object for details
+        :return: AsyncDatabase object
+        """
+        connection = await Surreal(url, namespace, database, access=access, credentials=credentials,
+                                   timeout=timeout, codec=codec).async_connect()
+        logger.info("Async DatabaseQL is up")
+        return cls(connection)
+
+    @classmethod
+    def from_connection(cls, connection: AsyncWebSocketConnection) -> "AsyncDatabase":
+        """
+        Builds a database object from an active existing asynchronous connection
+        :param connection: connection to use
+        :return: AsyncDatabase object
+        """
+        return cls(connection)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_details):
+        await self.close()
+
+    def close(self) -> Awaitable[None]:
+        """
+        Closes the connection. You cannot and should not use a database object after that
+        :return: awaitable, which closes the connection
+        """
+        logger.info("Async DatabaseQL is closed")
+        self._connected = False
+        return self._connection.close()
+
+    def _use_connection(self, connection: AsyncWebSocketConnection) -> AsyncWebSocketConnection:
+        super()._use_connection(connection.connection)
+        return connection
+
+    @staticmethod
+    def _result_of(result: Awaitable[SurrealResult]) -> Awaitable[Any]:
+        return _awaited_result(result)
+
+    def __getattr__(self, item) -> AsyncTable:
+        return AsyncTable(item, self._connection)
+
+    def table(self, name) -> AsyncTable:
+        """
+        Switch to the Table level(an object) after that you can and should use table operations (CRUD)
+
+        :param name: name of the table to work with
+        :return: a table object
+        """
+        return AsyncTable(name, self._connection)
+
+    def __repr__(self):
+        return f"AsyncDatabase(namespace={self._namespace}, name={self._database}, connected={self.is_connected()})"
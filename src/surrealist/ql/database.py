@@ -1,7 +1,11 @@
 import logging
 import warnings
-from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from typing import (Any, Callable, Dict, Iterable, List, Optional, Tuple,
+                    Union)
 
+from surrealist.bulk import (DEFAULT_CHUNK_SIZE, DEFAULT_CONCURRENCY,
+                             DEFAULT_RETRIES, BulkInsertReport)
+from surrealist.codecs import Codec
 from surrealist.connections.connection import Connection
 from surrealist.enums import Algorithm, AutoOrNone
 from surrealist.errors import SurrealConnectionError
@@ -21,6 +25,7 @@ from surrealist.ql.statements.relate import Relate
 from surrealist.ql.statements.returns import Return
 from surrealist.ql.statements.statement import Statement
 from surrealist.ql.statements.transaction import Transaction
+from surrealist.ql.statements.utils import render
 from surrealist.ql.table import Table
 from surrealist.result import SurrealResult
 from surrealist.surreal import Surreal
@@ -41,7 +46,8 @@ class Database:
     def __init__(self, url: str, namespace: str, database: str, access: Optional[str] = None,
                  credentials: Optional[Tuple[str, str]] = None,
                  use_http: bool = False, timeout: int = DEFAULT_TIMEOUT,
-                 active_connection: Optional[Connection] = None):
+                 active_connection: Optional[Connection] = None, codec: Optional[Union[str, Codec]] = None,
+                 compression: bool = False):
         """
         Creates a new connection to the database or uses existing connection
         :param url: url of the SurrealDB
@@ -53,13 +59,16 @@ class Database:
         :param timeout: timeout for the queries
         :param active_connection: existing and active (connected) connection to use, If specified, all other
         parameters are ignored
+        :param codec: json library to use on the wire, see Surreal object for details
+        :param compression: http transport only, request compressed responses, see Surreal object for details
         """
         if active_connection is None:
             self._namespace = namespace
             self._database = database
             self._access = access
             self._connection = Surreal(url, namespace, database, access=access, credentials=credentials,
-                                       use_http=use_http, timeout=timeout).connect()
+                                       use_http=use_http, timeout=timeout, codec=codec,
+                                       compression=compression).connect()
             logger.info("DatabaseQL is up")
         else:
             self._connection = self._use_connection(active_connection)
@@ -134,13 +143,18 @@ class Database:
         """
         return Database("", "", "", None, None, False, 0, connection)
 
+    @staticmethod
+    def _result_of(result: SurrealResult) -> Any:
+        # AsyncDatabase overrides it to await the result
+        return result.result
+
     def tables(self) -> List[str]:
         """
         Return list of the table names at a current database
         :return: string list with the names
         """
         logger.info("Get tables for db %s", self._database)
-        return self._connection.db_tables().result
+        return self._result_of(self._connection.db_tables())
 
     def info(self) -> Dict:
         """
@@ -148,7 +162,7 @@ class Database:
         :return: a result of the response
         """
         logger.info("Get info for db %s", self._database)
-        return self._connection.db_info().result
+        return self._result_of(self._connection.db_info())
 
     def raw_query(self, query: str) -> SurrealResult:
         """
@@ -161,6 +175,23 @@ class Database:
         logger.info("Query for db %s", self._database)
         return self._connection.query(query)
 
+    def bulk_insert(self, table_name: str, records: Iterable[Dict], *, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                    concurrency: int = DEFAULT_CONCURRENCY, retries: int = DEFAULT_RETRIES,
+                    on_progress: Optional[Callable[[BulkInsertReport], Any]] = None) -> BulkInsertReport:
+        """
+        Inserts a lot of records into the table by chunks in parallel, see **bulk_insert** of Table
+
+        :param table_name: name of the table
+        :param records: any iterable of records (dicts), for example, a generator
+        :param chunk_size: number of records in one request
+        :param concurrency: maximum number of requests in flight
+        :param retries: number of retries for a failed chunk
+        :param on_progress: optional function to call with the report after each chunk
+        :return: report with numbers of inserted and failed rows and speed (rows_per_second)
+        """
+        return self.table(table_name).bulk_insert(records, chunk_size=chunk_size, concurrency=concurrency,
+                                                  retries=retries, on_progress=on_progress)
+
     def returns(self, query: str) -> Return:
         """
         Return result of the query
@@ -202,6 +233,22 @@ class Database:
         """
         return Transaction(self._connection, statements)
 
+    def batch(self, statements: List[Union[Statement, str]]) -> List[SurrealResult]:
+        """
+        Runs statements in one request (one round trip) without a transaction, unlike a transaction an error of one
+        statement does not cancel others. Values of all statements are sent as query variables
+
+        Example: db.batch([db.person.select().where("age > 18"), db.book.create().set(title="Dune"), "INFO FOR DB;"])
+
+        :param statements: list of statements or texts of raw queries, each of them should be one statement
+        :return: list of results, one for each statement
+        :raise WrongParameterError: if there are no statements or a raw query has a few statements
+        """
+        queries, variables = render(lambda: [statement.to_str() if isinstance(statement, Statement) else statement
+                                             for statement in statements])
+        logger.info("Batch of %s statements for db %s", len(queries), self._database)
+        return self._connection.query_many(queries, variables or None)
+
     def select_from(self, select: Select, *args, alias: Optional[Tuple[str, Union[str, Statement]]] = None,
                     value: Optional[str] = None) -> Select:
         """
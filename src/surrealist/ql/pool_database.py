@@ -1,8 +1,11 @@
 import logging
 from os import cpu_count
-from typing import Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
-from surrealist.connections.pool import Pool
+from surrealist.codecs import Codec
+from surrealist.connections.pool import DEFAULT_METRICS_INTERVAL, Pool
+from surrealist.connections.routing_pool import DEFAULT_EJECT_TIME, RoutingPool
+from surrealist.enums import RoutingPolicy
 from surrealist.ql.database import Database
 from surrealist.utils import DEFAULT_TIMEOUT
 
@@ -18,29 +21,62 @@ class DatabaseConnectionsPool(Database):
     in the system and cannot be less than 2.
 
     During work, if no more non-busy connections to use, then new connection will be created until its number not
-    reaches maximum for the pool
+    reaches maximum for the pool. With idle_timeout the pool shrinks back to the minimum after load, with max_lifetime
+    old connections are recycled.
+
+    If a list of urls is given, the pool works with several SurrealDB nodes: writes go to the first (primary) node,
+    read-only requests are routed to any node by the routing policy, failed nodes are ejected for eject_time seconds
 
     Refer to: https://github.com/kotolex/surrealist?tab=readme-ov-file#connections-pool
 
     """
 
-    def __init__(self, url: str, namespace: str, database: str, access: Optional[str] = None,
+    def __init__(self, url: Union[str, List[str]], namespace: str, database: str, access: Optional[str] = None,
                  credentials: Optional[Tuple[str, str]] = None,
                  use_http: bool = False, timeout: int = DEFAULT_TIMEOUT,
-                 min_connections: int = CORES_COUNT, max_connections: int = 50):
+                 min_connections: int = CORES_COUNT, max_connections: int = 50,
+                 codec: Optional[Union[str, Codec]] = None, compression: bool = False,
+                 health_check_interval: Optional[float] = None, idle_timeout: Optional[float] = None,
+                 max_lifetime: Optional[float] = None, acquire_timeout: Optional[float] = None,
+                 metrics_callback: Optional[Callable[[Dict], Any]] = None,
+                 metrics_interval: float = DEFAULT_METRICS_INTERVAL,
+                 routing: RoutingPolicy = RoutingPolicy.ROUND_ROBIN, eject_time: float = DEFAULT_EJECT_TIME):
         """
         All parameters are the same as for Surreal or Database object
 
+        :param url: url of the SurrealDB or a list of urls of several nodes, the first one is the primary
+
         :param min_connections: minimum number of connections, it cannot be less than 2
-        :param max_connections: maximum number of connections, it cannot be more than 50
+        :param max_connections: maximum number of connections
+        :param health_check_interval: if specified, idle connections are pinged every health_check_interval seconds,
+        failed ones are replaced
+        :param idle_timeout: if specified, connections not used for idle_timeout seconds are closed, until the pool
+        shrinks to min_connections
+        :param max_lifetime: if specified, connections older than max_lifetime seconds are replaced with new ones
+        :param acquire_timeout: how long to wait for a free connection, if all of them are busy, before
+        PoolExhaustedError, timeout is used by default
+        :param metrics_callback: if specified, it is called with the result of **stats** every metrics_interval seconds
+        :param metrics_interval: interval in seconds for metrics_callback
+        :param routing: policy to choose a node for read-only requests, if there are several urls
+        :param eject_time: how long (in seconds) a failed node gets no read-only requests, if there are several urls
         """
         self._options = {
             "url": url, "namespace": namespace, "database": database, "access": access, "credentials": credentials,
             "use_http": use_http, "timeout": timeout, "min_connections": min_connections,
-            "max_connections": max_connections
+            "max_connections": max_connections, "codec": codec, "compression": compression,
+            "health_check_interval": health_check_interval, "idle_timeout": idle_timeout, "max_lifetime": max_lifetime,
+            "acquire_timeout": acquire_timeout, "metrics_callback": metrics_callback,
+            "metrics_interval": metrics_interval
         }
-        super().__init__(url, namespace, database, access, credentials, use_http, timeout)
-        self._connection = Pool(self._connection, **self._options)
+        urls = [url] if isinstance(url, str) else list(url)
+        super().__init__(urls[0], namespace, database, access, credentials, use_http, timeout, codec=codec,
+                         compression=compression)
+        if len(urls) == 1:
+            self._options["url"] = urls[0]
+            self._connection = Pool(self._connection, **self._options)
+        else:
+            options = {key: value for key, value in self._options.items() if key != "url"}
+            self._connection = RoutingPool(self._connection, urls, routing, eject_time, **options)
         self._connected = True
         self._min = min_connections
         self._max = max_connections
@@ -55,6 +91,33 @@ class DatabaseConnectionsPool(Database):
         """
         return self._connection.connections_count
 
+    def health_stats(self) -> Dict[str, int]:
+        """
+        Returns counters of evicted and replaced connections and failed health checks of the pool
+
+        :return: dict with evictions, replacements and failed_health_checks counters
+        """
+        return self._connection.health_stats()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns a snapshot of the pool telemetry: busy, idle and waiting counts, wait time and per-method latency
+        percentiles, errors by type and connection churn
+
+        Refer to: https://github.com/kotolex/surrealist?tab=readme-ov-file#connections-pool
+
+        :return: dict with the statistics
+        """
+        return self._connection.stats()
+
+    def wait_stats(self) -> Dict[str, Union[int, float]]:
+        """
+        Returns statistics of waiting for a free connection of the pool
+
+        :return: dict with checkouts, waits, timeouts, waiting, total_wait, average_wait and max_wait
+        """
+        return self._connection.wait_stats()
+
     @property
     def min_connections(self) -> int:
         """
@@ -4,6 +4,7 @@ from surrealist.connections.connection import Connection
 from surrealist.enums import Algorithm
 from surrealist.ql.statements import Create, Select
 from surrealist.ql.statements.statement import Statement
+from surrealist.ql.statements.utils import inline
 from surrealist.utils import OK
 
 
@@ -243,10 +244,12 @@ class DefineAccessRecord(Statement):
             exists = " OVERWRITE"
         sin = ""
         if self._signin:
-            sin = f" SIGNIN {self._signin}" if isinstance(self._signin, str) else f" SIGNIN {self._signin._clean_str()}"
+            signin = self._signin if isinstance(self._signin, str) else inline(self._signin._clean_str)
+            sin = f" SIGNIN {signin}"
         sup = ""
         if self._signup:
-            sup = f" SIGNUP {self._signup}" if isinstance(self._signup, str) else f" SIGNUP {self._signup._clean_str()}"
+            signup = self._signup if isinstance(self._signup, str) else inline(self._signup._clean_str)
+            sup = f" SIGNUP {signup}"
         access = ""
         if self._algo:
             access = f" ALGORITHM {self._algo[0].name} KEY '{self._algo[1]}'"
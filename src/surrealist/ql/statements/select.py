@@ -108,5 +108,9 @@ class Select(IterableStatement, SelectUseIndex, SelectUseTempfiles):
             omit = f" OMIT {omitted}"
         return f"SELECT {what}{omit} FROM {only}{self._from}"
 
+    def _keyset_str(self, condition: Optional[str]) -> str:
+        where = f" WHERE {condition}" if condition else ""
+        return f"{self._clean_str()}{where}"
+
     def __repr__(self):
         return f"Select({self._table_name=}, {self._args=}, {self._as=}, {self._value=})"
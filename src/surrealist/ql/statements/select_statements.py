@@ -1,4 +1,4 @@
-from typing import Tuple
+from typing import Optional, Tuple
 
 from surrealist.ql.statements.statement import (FinishedStatement,
                                                 IterableStatement, Statement)
@@ -250,6 +250,16 @@ class SelectUseSplit(SelectUseGroup):
         return Split(self, field)
 
 
+def _add_condition(statement, condition: Optional[str]) -> str:
+    """
+    Adds the condition to the WHERE clause of the statement (WHERE, AND or OR)
+    """
+    if not condition:
+        return statement._clean_str()
+    source, predicate = statement._parts()
+    return f"{source} WHERE ({predicate}) AND {condition}"
+
+
 class Or(IterableStatement, SelectUseSplit):
     def __init__(self, statement: Statement, predicate: str):
         super().__init__(statement)
@@ -265,6 +275,13 @@ class Or(IterableStatement, SelectUseSplit):
     def _clean_str(self):
         return f"{self._statement._clean_str()} OR {self._predicate}"
 
+    def _parts(self) -> Tuple[str, str]:
+        source, predicate = self._statement._parts()
+        return source, f"{predicate} OR {self._predicate}"
+
+    def _keyset_str(self, condition: Optional[str]) -> str:
+        return _add_condition(self, condition)
+
 
 class And(IterableStatement, SelectUseSplit):
     def __init__(self, statement: Statement, predicate: str):
@@ -281,6 +298,13 @@ class And(IterableStatement, SelectUseSplit):
     def _clean_str(self):
         return f"{self._statement._clean_str()} AND {self._predicate}"
 
+    def _parts(self) -> Tuple[str, str]:
+        source, predicate = self._statement._parts()
+        return source, f"{predicate} AND {self._predicate}"
+
+    def _keyset_str(self, condition: Optional[str]) -> str:
+        return _add_condition(self, condition)
+
 
 class Where(IterableStatement, SelectUseSplit):
     """
@@ -301,6 +325,12 @@ class Where(IterableStatement, SelectUseSplit):
     def _clean_str(self):
         return f"{self._statement._clean_str()} WHERE {self._predicate}"
 
+    def _parts(self) -> Tuple[str, str]:
+        return self._statement._clean_str(), self._predicate
+
+    def _keyset_str(self, condition: Optional[str]) -> str:
+        return _add_condition(self, condition)
+
 
 class SelectUseWhere(SelectUseSplit):
     def where(self, predicate: str) -> Where:
@@ -323,6 +353,10 @@ class WithIndex(IterableStatement, SelectUseWhere):
         indexes = ", ".join(self._index)
         return f"{self._statement._clean_str()} WITH INDEX {indexes}"
 
+    def _keyset_str(self, condition: Optional[str]) -> str:
+        where = f" WHERE {condition}" if condition else ""
+        return f"{self._clean_str()}{where}"
+
 
 class WithNoIndex(IterableStatement, SelectUseWhere):
     """
@@ -336,6 +370,10 @@ class WithNoIndex(IterableStatement, SelectUseWhere):
     def _clean_str(self):
         return f"{self._statement._clean_str()} WITH NO INDEX"
 
+    def _keyset_str(self, condition: Optional[str]) -> str:
+        where = f" WHERE {condition}" if condition else ""
+        return f"{self._clean_str()}{where}"
+
 
 class SelectUseIndex(SelectUseWhere):
     def with_index(self, *args: Tuple[str]) -> WithIndex:
@@ -5,7 +5,8 @@ from surrealist.ql.statements.utils import combine
 
 class Where:
     """
-    Represents simple WHERE statement for DEFINE FIELD and DEFINE TABLE
+    Represents simple WHERE statement for DEFINE FIELD and DEFINE TABLE, it is rendered on creation, so values of
+    keyword arguments are always inlined into the query text, they are never sent as query variables
     """
     def __init__(self, raw_string: Optional[str] = None, **kwargs):
         self._raw = raw_string
@@ -1,10 +1,20 @@
 from abc import ABC, abstractmethod
-from typing import Iterator, List
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from queue import Full, Queue
+from threading import Event, Thread
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
-from surrealist.connections import Connection
+from surrealist.columnar import ColumnBuilder, arrow_dtypes, pandas_dtypes
+from surrealist.connections import AsyncWebSocketConnection, Connection
+from surrealist.errors import CompatibilityError, WrongParameterError
+from surrealist.ql.statements.utils import render
 from surrealist.result import SurrealResult
 from surrealist.utils import OK
 
+# how often the prefetching thread checks the iteration was stopped, while the queue is full
+PUT_TIMEOUT = 0.1
+
 
 class Statement(ABC):
     """
@@ -52,17 +62,79 @@ class Statement(ABC):
         :return: result of the query
         """
 
+    def to_query(self) -> Tuple[str, Dict[str, Any]]:
+        """
+        Returns the whole query with placeholders ($p1, $p2...) instead of values and the values for them. Record ids
+        and Surreal dates are always in the query text
+        :return: pair of the query text and its variables
+        """
+        return render(self.to_str)
+
+    def compile(self) -> "CompiledStatement":
+        """
+        Validates and renders the statement once, the result can be run many times with other values of Params
+        (and other $variables of the query) without building and rendering the statement again
+
+        Example: db.person.select().where("age > $age").limit(10).compile().run(age=18)
+
+        :return: compiled statement
+        :raise WrongParameterError: if the statement is not valid
+        """
+        errors = [error for error in self.validate() if error != OK]
+        if errors:
+            raise WrongParameterError(f"Cannot compile invalid statement: {errors}")
+        query, variables = self.to_query()
+        return CompiledStatement(self._connection, query, variables)
+
     def run(self) -> SurrealResult:
         """
-        Runs the whole query and returns result from SurrealDB
+        Runs the whole query and returns result from SurrealDB. Values are sent as query variables, so SurrealDB gets
+        the same query text for the same statement with other values
         :return: result of the request
         """
-        return self._connection.query(self.to_str())
+        query, variables = self.to_query()
+        return self._connection.query(query, variables or None)
 
     def __str__(self):
         return self.to_str()
 
 
+class CompiledStatement:
+    """
+    Represents a rendered statement with placeholders, which can be run many times with other values
+    """
+
+    def __init__(self, connection: Connection, query: str, variables: Dict[str, Any]):
+        self._connection = connection
+        self._query = query
+        self._variables = variables
+
+    @property
+    def query(self) -> str:
+        """
+        Returns text of the query
+        :return: query text with placeholders
+        """
+        return self._query
+
+    def run(self, **values) -> SurrealResult:
+        """
+        Runs the query with given values of Params and other variables
+        :param values: values of variables, for example, age=18 for Param("age") or $age in a predicate
+        :return: result of the request
+        :raise WrongParameterError: if the name of a value is the name of an inner variable ($p1, $p2...)
+        """
+        if not values:
+            return self._connection.query(self._query, self._variables or None)
+        wrong = [name for name in values if name in self._variables]
+        if wrong:
+            raise WrongParameterError(f"Names {wrong} are used by the statement, choose other names")
+        return self._connection.query(self._query, {**self._variables, **values})
+
+    def __repr__(self):
+        return f"CompiledStatement(query={self._query!r}, variables={self._variables!r})"
+
+
 class FinishedStatement(Statement):
     """
     Represents specific statement
@@ -86,27 +158,215 @@ class IterableStatement(FinishedStatement):
     """
     Represents a statement which can use iterator to get results in an efficient, lazy way.
     Under the hood transform query to SELECT * FROM (initial_query) LIMIT {limit} START AT {current};
+    or, for keyset pagination, to initial_query WHERE {key} > $last ORDER BY {key} LIMIT {limit};
     """
 
-    def iter(self, limit: int = 100) -> Iterator:
+    def iter(self, limit: int = 100, key: Optional[str] = None, prefetch: int = 0) -> Iterator[SurrealResult]:
         """
         Creates and returns a generator object to iterate on big query results
 
+        By default, pages use LIMIT and START AT, so each next page is more expensive for SurrealDB: it skips all the
+        previous records. With the key (for example, "id") pages are ordered by the key and each next page starts
+        after the last key of the previous one: WHERE key > $last. All pages cost the same, and records inserted
+        during the iteration do not shift pages, so no record is returned twice. The key should be unique and
+        selected by the query. Keyset pagination is supported for SELECT with optional WITH INDEX and WHERE only:
+        ORDER BY, GROUP BY, FETCH and other clauses after WHERE cannot be combined with the key condition
+
+        With prefetch, up to prefetch pages are requested in the background, while you process the current one.
+        Pages with LIMIT and START AT are independent, so they are requested in parallel (on a pool they go to
+        different connections), keyset pages are requested one by one, but ahead of your code
+
         In documentation: https://github.com/kotolex/surrealist/tree/master?tab=readme-ov-file#iteration-on-select
 
         Example: https://github.com/kotolex/surrealist/tree/master/examples/surreal_ql/iterator.py
 
         :param limit: number of records in each iteration, it cannot be smaller than one
+        :param key: unique ordered field for keyset pagination, for example, "id"; None for LIMIT and START AT
+        :param prefetch: number of pages to request in the background, 0 to request the next page only when needed
         :return: generator to use in for-statements or with the next method
-        :raise ValueError: if limit less than one
+        :raise ValueError: if limit less than one, prefetch is negative or the records of the query have no key field
+        :raise WrongParameterError: if the key is used for a statement, which cannot add the key condition to its WHERE
+        clause (only SELECT with optional WITH INDEX and WHERE can)
+        :raise CompatibilityError: if the statement works over an asynchronous connection
         """
+        if isinstance(self._connection, AsyncWebSocketConnection):
+            raise CompatibilityError("Iteration and columnar export are not supported for asynchronous connection, "
+                                     "await run of the statement with LIMIT and START instead")
         if limit < 1:
             raise ValueError("The limit cannot be smaller than 1")
+        if prefetch < 0:
+            raise ValueError("The prefetch cannot be negative")
+        if key is not None:
+            pages = self._iter_by_key(limit, key)
+            yield from _prefetched(pages, prefetch) if prefetch else pages
+        elif prefetch:
+            yield from self._iter_parallel(limit, prefetch)
+        else:
+            current = 0
+            while True:
+                res = self._connection.query(self._page_str(limit, current))
+                yield res
+                if res.is_error() or res.count() < limit:
+                    break
+                current += limit
+
+    def iter_records(self, limit: int = 100, key: Optional[str] = None, prefetch: int = 0) -> Iterator[Any]:
+        """
+        Creates and returns a generator object to iterate on records of big query results, pages are requested the same
+        way as in the iter method
+
+        :param limit: number of records in each page, it cannot be smaller than one
+        :param key: unique ordered field for keyset pagination, for example, "id"; None for LIMIT and START AT
+        :param prefetch: number of pages to request in the background
+        :return: generator of records
+        :raise ValueError: if limit less than one, prefetch is negative or the records of the query have no key field
+        :raise QueryError: if SurrealDB returns an error for a page
+        """
+        for page in self.iter(limit, key, prefetch):
+            yield from page.records()
+
+    def _columns(self, limit: int, key: Optional[str], prefetch: int, dtypes: Optional[Dict[str, Any]] = None,
+                 fields: Optional[List[str]] = None) -> ColumnBuilder:
+        builder = ColumnBuilder(dtypes, fields, limit)
+        for page in self.iter(limit, key, prefetch):
+            builder.append(page.records())
+        return builder
+
+    def to_numpy(self, limit: int = 100, key: Optional[str] = None, prefetch: int = 0,
+                 dtypes: Optional[Dict[str, Any]] = None, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Iterates on query results page by page (like the iter method) and puts values of each page right to numpy
+        column buffers, which are preallocated and grow when needed, numpy should be installed
+
+        Refer to: https://github.com/kotolex/surrealist?tab=readme-ov-file#columnar-export
+
+        :param limit: number of records in each page, it cannot be smaller than one
+        :param key: unique ordered field for keyset pagination, for example, "id"; None for LIMIT and START AT
+        :param prefetch: number of pages to request in the background
+        :param dtypes: numpy dtypes for fields, for example, {"age": "int32"}, other fields are inferred
+        :param fields: fields to take, all fields of all records by default
+        :return: dict of field name and numpy array
+        :raise CompatibilityError: if numpy is not installed
+        :raise QueryError: if SurrealDB returns an error for a page
+        """
+        return self._columns(limit, key, prefetch, dtypes, fields).to_numpy()
+
+    def to_arrow(self, limit: int = 100, key: Optional[str] = None, prefetch: int = 0,
+                 types: Optional[Dict[str, Any]] = None, fields: Optional[List[str]] = None):
+        """
+        Iterates on query results page by page and returns all records as Arrow RecordBatch, numpy and pyarrow should
+        be installed
+
+        :param limit: number of records in each page, it cannot be smaller than one
+        :param key: unique ordered field for keyset pagination, for example, "id"; None for LIMIT and START AT
+        :param prefetch: number of pages to request in the background
+        :param types: Arrow types for fields, for example, {"age": pyarrow.int32()}, other fields are inferred
+        :param fields: fields to take, all fields of all records by default
+        :return: pyarrow.RecordBatch
+        :raise CompatibilityError: if numpy or pyarrow is not installed
+        :raise QueryError: if SurrealDB returns an error for a page
+        """
+        return self._columns(limit, key, prefetch, arrow_dtypes(types), fields).to_arrow(types)
+
+    def to_pandas(self, limit: int = 100, key: Optional[str] = None, prefetch: int = 0,
+                  dtypes: Optional[Dict[str, Any]] = None, fields: Optional[List[str]] = None):
+        """
+        Iterates on query results page by page and returns all records as pandas DataFrame, numpy and pandas should
+        be installed
+
+        :param limit: number of records in each page, it cannot be smaller than one
+        :param key: unique ordered field for keyset pagination, for example, "id"; None for LIMIT and START AT
+        :param prefetch: number of pages to request in the background
+        :param dtypes: pandas dtypes for fields, for example, {"age": "Int64"}, other fields are inferred
+        :param fields: fields to take, all fields of all records by default
+        :return: pandas.DataFrame
+        :raise CompatibilityError: if numpy or pandas is not installed
+        :raise QueryError: if SurrealDB returns an error for a page
+        """
+        return self._columns(limit, key, prefetch, pandas_dtypes(dtypes), fields).to_pandas(dtypes)
+
+    def _page_str(self, limit: int, current: int) -> str:
+        return f"SELECT * FROM ({self._clean_str()}) LIMIT {limit} START AT {current};"
+
+    def _iter_parallel(self, limit: int, prefetch: int) -> Iterator[SurrealResult]:
+        futures = deque()
         current = 0
+        with ThreadPoolExecutor(max_workers=prefetch, thread_name_prefix="surrealist-iter") as executor:
+            try:
+                while True:
+                    while len(futures) < prefetch:
+                        futures.append(executor.submit(self._connection.query, self._page_str(limit, current)))
+                        current += limit
+                    res = futures.popleft().result()
+                    yield res
+                    if res.is_error() or res.count() < limit:
+                        break
+            finally:
+                for future in futures:
+                    future.cancel()
+
+    def _iter_by_key(self, limit: int, key: str) -> Iterator[SurrealResult]:
+        # string record ids (JSON codec) should be cast to record ids to compare with ids
+        condition = f"{key} > <record> $last" if key == "id" else f"{key} > $last"
+        variables = None
         while True:
-            query = f"SELECT * FROM ({self._clean_str()}) LIMIT {limit} START AT {current};"
-            res = self._connection.query(query)
+            query = f"{self._keyset_str(condition if variables else None)} ORDER BY {key} LIMIT {limit};"
+            res = self._connection.query(query, variables)
             yield res
-            if res.count() < limit:
+            if res.is_error() or res.count() < limit:
                 break
-            current += limit
+            last = res.result[-1]
+            if not isinstance(last, dict) or key not in last:
+                raise ValueError(f"Cannot iterate by {key}, records of the query have no such field")
+            variables = {"last": last[key]}
+
+    def _keyset_str(self, condition: Optional[str]) -> str:
+        """
+        Returns the query filtered by the condition, without ";". Only statements, which can add the condition to
+        their own WHERE clause (SELECT with optional WITH INDEX and WHERE), support keyset pagination: wrapping other
+        statements would run the whole query for each page again
+        :param condition: condition on the key of the last record, None for the first page
+        :return: query text
+        :raise WrongParameterError: if the statement cannot add the condition to its WHERE clause
+        """
+        raise WrongParameterError(f"Keyset pagination is not supported for {type(self).__name__} statement, use "
+                                  f"SELECT with optional WITH INDEX and WHERE, or iterate without the key")
+
+
+def _prefetched(pages: Iterator[SurrealResult], prefetch: int) -> Iterator[SurrealResult]:
+    """
+    Iterates on pages in the background thread, up to prefetch pages are waiting for the consumer
+    """
+    queue = Queue(maxsize=prefetch)
+    stopped = Event()
+
+    def put(item) -> bool:
+        while not stopped.is_set():
+            try:
+                queue.put(item, timeout=PUT_TIMEOUT)
+                return True
+            except Full:
+                pass
+        return False
+
+    def produce():
+        try:
+            for page in pages:
+                if not put((page, None)):
+                    return
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            put((None, e))
+            return
+        put((None, None))
+
+    Thread(target=produce, daemon=True, name="surrealist-prefetch").start()
+    try:
+        while True:
+            page, error = queue.get()
+            if error is not None:
+                raise error
+            if page is None:
+                return
+            yield page
+    finally:
+        stopped.set()
@@ -1,7 +1,130 @@
-from typing import Dict, Optional
+import json
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
 
+from surrealist.record_id import RecordId
 from surrealist.utils import safe_dumps
 
+T = TypeVar("T")
+# variables of the statement, which is rendering now, None if values should be inlined into the query text
+_variables: ContextVar[Optional[Dict[str, Any]]] = ContextVar("surrealist_variables", default=None)
+
+
+class Param:
+    """
+    Represents a named parameter of a compiled statement, it is a placeholder for a value, which is given on each run
+
+    Example: db.person.create().set(name=Param("name"), age=Param("age")).compile().run(name="John", age=30)
+    """
+
+    def __init__(self, name: str):
+        if not name.isidentifier():
+            raise ValueError(f"Wrong name of a parameter: {name}")
+        self.name = name
+
+    def __repr__(self):
+        return f"Param({self.name!r})"
+
+    def __str__(self):
+        return f"${self.name}"
+
+
+def is_bindable(value: Any) -> bool:
+    """
+    Checks the value can be sent as a query variable and means the same as inlined into the query text. Record ids and
+    Surreal dates (strings like d'2024-04-18T11:34:41Z') are valid in the query text only, variables make strings of
+    them
+
+    :param value: value to check
+    :return: True if the value can be sent as a variable
+    """
+    if isinstance(value, (RecordId, Param)):
+        return False
+    if isinstance(value, str):
+        return not value.startswith(("d'", 'd"'))
+    if isinstance(value, dict):
+        return all(is_bindable(element) for element in value.values())
+    if isinstance(value, (list, tuple)):
+        return all(is_bindable(element) for element in value)
+    return True
+
+
+def has_param(value: Any) -> bool:
+    """
+    Checks the value is a Param or contains a Param
+
+    :param value: value to check
+    :return: True if there is a Param
+    """
+    if isinstance(value, Param):
+        return True
+    if isinstance(value, dict):
+        return any(has_param(element) for element in value.values())
+    if isinstance(value, (list, tuple)):
+        return any(has_param(element) for element in value)
+    return False
+
+
+def bind(value: Any) -> str:
+    """
+    Returns a placeholder ($p1, $p2...) for the value and stores the value in variables of the rendering statement. If
+    there is no rendering statement or the value cannot be a variable, returns the value as a string for the query.
+    Params are always placeholders with their names
+
+    :param value: value to use in the query
+    :return: placeholder or the value as string
+    """
+    if isinstance(value, Param):
+        return str(value)
+    variables = _variables.get()
+    if not isinstance(value, tuple) and not has_param(value):
+        if variables is None or not is_bindable(value):
+            return safe_dumps(value)
+        name = f"p{len(variables) + 1}"
+        variables[name] = value
+        return f"${name}"
+    if isinstance(value, tuple):
+        if variables is None and not has_param(value):
+            return safe_dumps(value)
+        # a tuple is a row of values (INSERT ... VALUES), not an array
+        return f"({', '.join(bind(element) for element in value)})"
+    # a collection with params is built of its elements
+    if isinstance(value, dict):
+        return f"{{{', '.join(f'{json.dumps(key)}: {bind(element)}' for key, element in value.items())}}}"
+    return f"[{', '.join(bind(element) for element in value)}]"
+
+
+def render(to_str: Callable[[], T]) -> Tuple[T, Dict[str, Any]]:
+    """
+    Renders a statement (or a few statements) with placeholders instead of values, placeholders are unique for all
+    statements rendered by the function
+
+    :param to_str: function to get the query text, for example, statement.to_str
+    :return: pair of the query text (or whatever the function returns) and its variables
+    """
+    variables: Dict[str, Any] = {}
+    token = _variables.set(variables)
+    try:
+        return to_str(), variables
+    finally:
+        _variables.reset(token)
+
+
+def inline(to_str: Callable[[], T]) -> T:
+    """
+    Renders a statement with values inlined into the query text, even inside the rendering of another statement.
+    Used for bodies of DEFINE statements (SIGNUP, SIGNIN), SurrealDB stores them and runs later, so variables of the
+    DEFINE query are not available to them
+
+    :param to_str: function to get the query text, for example, statement._clean_str
+    :return: query text (or whatever the function returns)
+    """
+    token = _variables.set(None)
+    try:
+        return to_str()
+    finally:
+        _variables.reset(token)
+
 
 def combine(result: Optional[str], kwargs: Dict) -> str:
     """
@@ -13,6 +136,6 @@ def combine(result: Optional[str], kwargs: Dict) -> str:
     :return: string combined
     """
     first = result if result else ''
-    second = ", ".join(f"{k} = {safe_dumps(v)}" for k, v in kwargs.items()) if kwargs else ''
+    second = ", ".join(f"{k} = {bind(v)}" for k, v in kwargs.items()) if kwargs else ''
     args = ', '.join(element for element in (first, second) if element)
     return args
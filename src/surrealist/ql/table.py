@@ -1,5 +1,7 @@
-from typing import Callable, Dict, List, Optional, Tuple, Union
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
 
+from surrealist.bulk import (DEFAULT_CHUNK_SIZE, DEFAULT_CONCURRENCY,
+                             DEFAULT_RETRIES, BulkInsertReport)
 from surrealist.connections import Connection
 from surrealist.errors import WrongCallError
 from surrealist.ql.statements.create import Create
@@ -43,13 +45,18 @@ class Table:
         """
         return self._name
 
+    @staticmethod
+    def _result_of(result: SurrealResult) -> Any:
+        # AsyncTable overrides it to await the result
+        return result.result
+
     def info(self) -> Dict:
         """
         Returns full table info
 
         :return: Result of the request
         """
-        return self._connection.table_info(self._name).result
+        return self._result_of(self._connection.table_info(self._name))
 
     def count(self) -> int:
         """
@@ -57,7 +64,7 @@ class Table:
 
         :return: number of records
         """
-        return self._connection.count(self._name).result
+        return self._result_of(self._connection.count(self._name))
 
     def select(self, *args, alias: Optional[List[Tuple[str, Union[str, Statement]]]] = None,
                value: Optional[str] = None) -> Select:
@@ -211,6 +218,27 @@ class Table:
         """
         return Insert(self._connection, self._name, *args)
 
+    def bulk_insert(self, records: Iterable[Dict], *, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                    concurrency: int = DEFAULT_CONCURRENCY, retries: int = DEFAULT_RETRIES,
+                    on_progress: Optional[Callable[[BulkInsertReport], Any]] = None) -> BulkInsertReport:
+        """
+        Inserts a lot of records by chunks in parallel, records are consumed lazily, failed chunks are retried.
+        It uses native insert method of the connection (or the pool), not INSERT statement
+
+        Example:
+        report = db.person.bulk_insert(({"name": f"John {i}"} for i in range(1_000_000)), chunk_size=5000)
+        print(report.rows_per_second)
+
+        :param records: any iterable of records (dicts), for example, a generator
+        :param chunk_size: number of records in one request
+        :param concurrency: maximum number of requests in flight
+        :param retries: number of retries for a failed chunk
+        :param on_progress: optional function to call with the report after each chunk
+        :return: report with numbers of inserted and failed rows and speed (rows_per_second)
+        """
+        return self._connection.bulk_insert(self._name, records, chunk_size=chunk_size, concurrency=concurrency,
+                                            retries=retries, on_progress=on_progress)
+
     def update(self, record_id: Optional[StrOrRecord] = None) -> Update:
         """
         Represent UPDATE object
@@ -1,5 +1,6 @@
 from string import ascii_lowercase, digits
-from typing import Optional
+from typing import Optional, Union
+from uuid import UUID
 
 from surrealist.errors import SurrealRecordIdError
 
@@ -30,14 +31,39 @@ class RecordId:
         if table and ":" in id_ and table != id_.split(":")[0]:
             table_part = id_.split(":")[0]
             raise SurrealRecordIdError(f"Table name is different from id, we expect {table}, but got {table_part}")
+        # an id in braces or backticks is a string, even if it has only digits
+        quoted = any(brace in id_ for brace in "`⟨⟩")
         id_ = id_.replace("`", "").replace("⟨", "").replace("⟩", "")
-        self._naive_id = id_ if ":" in id_ else f"{table}:{id_}"
-        self._table_part, self._id_part = self._naive_id.split(":")
-        self._uid = f"{self._table_part}:⟨{self._id_part}⟩"
+        table_part, id_part = (id_ if ":" in id_ else f"{table}:{id_}").split(":", 1)
+        self._set(table_part, id_part, id_part if quoted else None)
+
+    @classmethod
+    def from_parts(cls, table: str, value: Union[str, int, UUID]) -> "RecordId":
+        """
+        Creates record_id from the table and the id with its type, as SurrealDB sends it in CBOR: a number, a string
+        (with any characters, including ":" and digits only) or a UUID
+        :param table: name of table
+        :param value: id of the record
+        :return: RecordId object, which keeps the type of the id
+        """
+        record_id = cls.__new__(cls)
+        record_id._set(table, str(value), value)
+        return record_id
+
+    def _set(self, table_part: str, id_part: str, value: Optional[Union[str, int, UUID]]):
+        self._table_part, self._id_part, self._value = table_part, id_part, value
+        self._naive_id = f"{table_part}:{id_part}"
+        self._uid = f"{table_part}:⟨{id_part}⟩"
 
     def __repr__(self):
         return f"RecordId('{self._naive_id}')"
 
+    def __eq__(self, other):
+        return isinstance(other, RecordId) and self._naive_id == other.naive_id
+
+    def __hash__(self):
+        return hash(self._naive_id)
+
     @property
     def id_part(self) -> str:
         """
@@ -52,6 +78,14 @@ class RecordId:
         """
         return self._table_part
 
+    @property
+    def value(self) -> Optional[Union[str, int, UUID]]:
+        """
+        Returns id with its type: a number, a string or a UUID, if the type is known (the id came from CBOR or was in
+        braces), None otherwise
+        """
+        return self._value
+
     @property
     def naive_id(self) -> str:
         """
@@ -63,7 +97,8 @@ class RecordId:
         """
         Checks and adds special braces if id is not in simple form(a..zA..Z0-9), otherwise just returns naive_id
         """
-        is_complicated_format = any(e not in ALPHABET for e in self._id_part.lower())
+        is_complicated_format = any(e not in ALPHABET for e in self._id_part.lower()) or \
+            (isinstance(self._value, str) and self._id_part.isdigit())
         return self.to_uid_string() if is_complicated_format else self._naive_id
 
     def to_prefixed_string(self) -> str:
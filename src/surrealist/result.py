@@ -1,10 +1,18 @@
-import json
 from typing import Any, Dict, List, Optional, Union
 
-from surrealist.errors import ResultHasNoValuesError, TooManyNestedLevelsError
+from surrealist.codecs import DEFAULT_CODEC, Codec
+from surrealist.columnar import ColumnBuilder, arrow_dtypes, pandas_dtypes
+from surrealist.errors import (QueryError, ResultHasNoValuesError,
+                               WrongParameterError)
 from surrealist.utils import ERR, HTTP_OK, OK
 
 
+# fields of a response, which are not additional info of a result
+FIELDS = frozenset(("id", "result", "code", "query", "status", "time", "information", "error", "token"))
+DB_PROBLEM = "There was a problem with the database:"
+RESULT_INSIDE = {"time", "status", "result"}
+
+
 class SurrealResult:
     """
     Represents a result of the request both via http or websocket.
@@ -12,6 +20,13 @@ class SurrealResult:
 
     Examples: https://github.com/kotolex/surrealist/blob/master/examples/result.py
     """
+    __slots__ = ("ws_id", "result", "code", "query", "status", "time", "_info")
+    ws_id: Optional[Union[int, str]]
+    result: Optional[Union[str, int, Dict, List]]
+    code: Optional[int]
+    query: Optional[str]
+    status: Optional[str]
+    time: Optional[str]
 
     def __init__(self, **kwargs):
         """
@@ -24,28 +39,63 @@ class SurrealResult:
         time - execution time, only for http requests
         additional_info -all other fields
         """
-        self.ws_id: Optional[Union[int, str]] = kwargs.pop("id", None)
-        self.result: Optional[Union[str, int, Dict, List]] = kwargs.pop("result", None)
-        self.code: Optional[int] = kwargs.pop("code", None)
-        self.query: Optional[str] = kwargs.pop("query", None)
-        self.status: Optional[str] = kwargs.pop("status", OK)
-        self.time: Optional[str] = kwargs.pop("time", None)
-        if "information" in kwargs:
-            self.result = kwargs.pop("information")
-        if "error" in kwargs:
-            self.result = kwargs.pop("error")
+        self._fill(kwargs)
+
+    @classmethod
+    def from_frame(cls, frame: Dict) -> "SurrealResult":
+        """
+        Creates a result from the decoded response of SurrealDB without copying it, the frame is not kept, only
+        its fields are taken
+
+        :param frame: decoded response (dict) of SurrealDB
+        :return: Result object
+        """
+        result = cls.__new__(cls)
+        result._fill(frame)
+        return result
+
+    def _fill(self, frame: Dict):
+        get = frame.get
+        self.ws_id = get("id")
+        self.result = get("result")
+        self.code = get("code")
+        self.query = get("query")
+        self.status = get("status", OK)
+        self.time = get("time")
+        # usually all fields of the frame are known, so no dict for additional info is created
+        self._info = None if FIELDS.issuperset(frame) else {key: value for key, value in frame.items()
+                                                            if key not in FIELDS}
+        if "information" in frame:
+            self.result = frame["information"]
+        if "error" in frame:
+            self.result = frame["error"]
             self.status = ERR
-        if "token" in kwargs:
-            self.result = kwargs.pop("token")
+        if "token" in frame:
+            self.result = frame["token"]
         if self.code and self.code != HTTP_OK:
             self.status = ERR
-        self.additional_info: Dict = kwargs
-        if self.status == ERR and isinstance(self.result, dict) and "code" in self.result and "message" in self.result:
+        if self.status == ERR and isinstance(self.result, dict) and "code" in self.result and \
+                "message" in self.result:
             self.code = self.result["code"]
             self.result = self.result["message"]
-        if self.result and isinstance(self.result, str) and "There was a problem with the database:" in self.result:
+        if isinstance(self.result, str) and DB_PROBLEM in self.result:
             self.result = self.result.split(":", 1)[1].strip()
 
+    @property
+    def additional_info(self) -> Dict:
+        """
+        Returns all other fields of the response
+
+        :return: dict with fields, which are not fields of the result
+        """
+        if self._info is None:
+            self._info = {}
+        return self._info
+
+    @additional_info.setter
+    def additional_info(self, value: Dict):
+        self._info = value
+
     def count(self) -> int:
         """
         Returns number of records in result.
@@ -54,7 +104,7 @@ class SurrealResult:
         """
         if self.is_empty():
             return 0
-        if isinstance(self.result, List):
+        if isinstance(self.result, list):
             return len(self.result)
         return 1
 
@@ -78,10 +128,10 @@ class SurrealResult:
         count = self.count()
         if count != 1:
             raise ValueError(f"No id at result or more than 1 element, body: {self.result}")
-        if not isinstance(self.result, (List, Dict)):
+        if not isinstance(self.result, (list, dict)):
             raise ValueError(f"Cant get id, body: {self.result}")
-        value = self.result[0] if isinstance(self.result, List) else self.result
-        if not isinstance(value, Dict) or "id" not in value:
+        value = self.result[0] if isinstance(self.result, list) else self.result
+        if not isinstance(value, dict) or "id" not in value:
             raise ValueError(f"No id field, body: {self.result}")
         return value["id"]
 
@@ -95,11 +145,11 @@ class SurrealResult:
         :return: list with id of records inside
         """
         result = []
-        if isinstance(self.result, Dict):
+        if isinstance(self.result, dict):
             if "id" in self.result:
                 result.append(self.result["id"])
-        if isinstance(self.result, List):
-            result = [e.get("id") if isinstance(e, Dict) else None for e in self.result]
+        if isinstance(self.result, list):
+            result = [e.get("id") if isinstance(e, dict) else None for e in self.result]
         return result
 
     def first(self):
@@ -112,7 +162,7 @@ class SurrealResult:
         """
         if self.count() < 1:
             raise ResultHasNoValuesError("Cant get first on an empty result")
-        if isinstance(self.result, List):
+        if isinstance(self.result, list):
             return self.result[0]
         return self.result
 
@@ -126,7 +176,7 @@ class SurrealResult:
         """
         if self.count() < 1:
             raise ResultHasNoValuesError("Cant get first on an empty result")
-        if isinstance(self.result, List):
+        if isinstance(self.result, list):
             return self.result[-1]
         return self.result
 
@@ -148,10 +198,10 @@ class SurrealResult:
         :return: any result
         """
         count = self.count()
-        if count != 1 or not isinstance(self.result, (List, Dict)):
+        if count != 1 or not isinstance(self.result, (list, dict)):
             return default
-        value = self.result[0] if isinstance(self.result, List) else self.result
-        if not isinstance(value, Dict) or field_name not in value:
+        value = self.result[0] if isinstance(self.result, list) else self.result
+        if not isinstance(value, dict) or field_name not in value:
             return default
         return value[field_name]
 
@@ -163,6 +213,64 @@ class SurrealResult:
         """
         return self.status != OK
 
+    def records(self) -> List:
+        """
+        Returns records of the result as a list
+
+        :return: the result if it is a list, [] on an empty result, the result in a list otherwise
+        :raise QueryError: if the result is an error
+        """
+        if self.is_error():
+            raise QueryError(f"Cannot get records: {self.result}")
+        if self.is_empty():
+            return []
+        return self.result if isinstance(self.result, list) else [self.result]
+
+    def to_numpy(self, dtypes: Optional[Dict[str, Any]] = None, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Returns records of the result as columns: numpy array for each field, numpy should be installed.
+        Types of columns are inferred (bool, int64, float64 or object), ints with nulls are float64 with NaN
+
+        Refer to: https://github.com/kotolex/surrealist?tab=readme-ov-file#columnar-export
+
+        :param dtypes: numpy dtypes for fields, for example, {"age": "int32"}, other fields are inferred
+        :param fields: fields to take, all fields of all records by default
+        :return: dict of field name and numpy array
+        :raise CompatibilityError: if numpy is not installed
+        :raise QueryError: if the result is an error
+        :raise WrongParameterError: if records are not objects
+        """
+        records = self.records()
+        return ColumnBuilder(dtypes, fields, len(records)).append(records).to_numpy()
+
+    def to_arrow(self, types: Optional[Dict[str, Any]] = None, fields: Optional[List[str]] = None):
+        """
+        Returns records of the result as Arrow RecordBatch, numpy and pyarrow should be installed
+
+        :param types: Arrow types for fields, for example, {"age": pyarrow.int32()}, other fields are inferred
+        :param fields: fields to take, all fields of all records by default
+        :return: pyarrow.RecordBatch
+        :raise CompatibilityError: if numpy or pyarrow is not installed
+        :raise QueryError: if the result is an error
+        :raise WrongParameterError: if records are not objects
+        """
+        records = self.records()
+        return ColumnBuilder(arrow_dtypes(types), fields, len(records)).append(records).to_arrow(types)
+
+    def to_pandas(self, dtypes: Optional[Dict[str, Any]] = None, fields: Optional[List[str]] = None):
+        """
+        Returns records of the result as pandas DataFrame, numpy and pandas should be installed
+
+        :param dtypes: pandas dtypes for fields, for example, {"age": "Int64"}, other fields are inferred
+        :param fields: fields to take, all fields of all records by default
+        :return: pandas.DataFrame
+        :raise CompatibilityError: if numpy or pandas is not installed
+        :raise QueryError: if the result is an error
+        :raise WrongParameterError: if records are not objects
+        """
+        records = self.records()
+        return ColumnBuilder(pandas_dtypes(dtypes), fields, len(records)).append(records).to_pandas(dtypes)
+
     def to_dict(self) -> Dict:
         """
         Return all data as dict
@@ -178,39 +286,63 @@ class SurrealResult:
     def __eq__(self, other):
         if other is None or not isinstance(other, SurrealResult):
             return False
-        return self.__dict__ == other.__dict__
+        return (self.ws_id, self.status, self.result, self.query, self.code, self.time, self.additional_info) == \
+            (other.ws_id, other.status, other.result, other.query, other.code, other.time, other.additional_info)
 
     def __hash__(self):
         return hash((self.ws_id, self.result, self.status, self.time, self.code, self.query))
 
 
-def to_result(content: Union[str, Dict, List]) -> SurrealResult:
+def to_result(content: Union[str, bytes, Dict, List], codec: Optional[Codec] = None) -> SurrealResult:
     """
     Converts str or dict response of SurrealDB to a common object for convenient use
 
     :param content: response from SurrealDB
+    :param codec: codec to decode string content, standard json is used by default
     :return: Result object
     """
-    if isinstance(content, str):
-        try:
-            content = json.loads(content)
-        except RecursionError as exc:
-            raise TooManyNestedLevelsError("Cant serialize object, too many nested levels") from exc
-    if isinstance(content, List):
+    if isinstance(content, (str, bytes)):
+        content = (codec or DEFAULT_CODEC).loads(content)
+    if isinstance(content, list):
         if len(content) == 1:
-            return SurrealResult(**content[0])
-        return SurrealResult(result=[SurrealResult(**e) for e in content])
+            return SurrealResult.from_frame(content[0])
+        return SurrealResult(result=[SurrealResult.from_frame(e) for e in content])
     if _is_result_inside(content):
-        res = SurrealResult(**content["result"][0])
+        res = SurrealResult.from_frame(content["result"][0])
         if "id" in content:
             res.ws_id = content["id"]
         return res
-    return SurrealResult(**content)
+    return SurrealResult.from_frame(content)
+
+
+def split_result(result: SurrealResult, queries: List[str]) -> List[SurrealResult]:
+    """
+    Splits the result of a multi-statement query to results of each statement with their own status and time
+
+    :param result: result of the whole query
+    :param queries: texts of statements of the query
+    :return: list of results, one for each statement; if the whole query failed, its error is the result of each one
+    :raise WrongParameterError: if the number of results is not the number of queries (a query has a few statements)
+    """
+    if len(queries) == 1 or result.is_error() or not isinstance(result.result, list):
+        results = [result] if len(queries) == 1 else [SurrealResult(result=result.result, status=result.status,
+                                                                    code=result.code) for _ in queries]
+    else:
+        results = [e if isinstance(e, SurrealResult) else SurrealResult.from_frame(e) for e in result.result]
+        if len(results) != len(queries):
+            raise WrongParameterError(f"Got {len(results)} results for {len(queries)} queries, each query should be "
+                                      f"one statement")
+    for one, query in zip(results, queries):
+        one.query = query
+    return results
 
 
 def _is_result_inside(a_dict) -> bool:
     """
     Helper predicate for deep nested objects
     """
-    return len(a_dict) in (1, 2) and "result" in a_dict and isinstance(a_dict["result"], List) \
-        and len(a_dict["result"]) == 1 and set(a_dict["result"][0].keys()) == {"time", "status", "result"}
+    if len(a_dict) > 2:
+        return False
+    inside = a_dict.get("result")
+    return isinstance(inside, list) and len(inside) == 1 and isinstance(inside[0], dict) \
+        and inside[0].keys() == RESULT_INSIDE
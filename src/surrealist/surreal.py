@@ -1,13 +1,17 @@
 import urllib.parse
 from logging import getLogger
-from typing import Optional, Tuple
+from typing import Optional, Tuple, Union
 
 from surrealist.clients import HttpClient
+from surrealist.clients.ws_client import DEFAULT_RECONNECT_ATTEMPTS
+from surrealist.codecs import Codec, get_codec
+from surrealist.connections.async_ws_connection import \
+    AsyncWebSocketConnection
 from surrealist.connections.connection import Connection
 from surrealist.connections.http_connection import HttpConnection
 from surrealist.connections.ws_connection import WebSocketConnection
-from surrealist.errors import (ConnectionParametersError, HttpClientError,
-                               SurrealConnectionError)
+from surrealist.errors import (CompatibilityError, ConnectionParametersError,
+                               HttpClientError, SurrealConnectionError)
 from surrealist.utils import AC, DB, DEFAULT_TIMEOUT, ENCODING, HTTP_OK, NS, OK
 
 logger = getLogger("surrealist")
@@ -25,7 +29,8 @@ class Surreal:
 
     def __init__(self, url: str, namespace: Optional[str] = None, database: Optional[str] = None,
                  access: Optional[str] = None, credentials: Tuple[str, str] = None, use_http: bool = False,
-                 timeout: int = DEFAULT_TIMEOUT):
+                 timeout: int = DEFAULT_TIMEOUT, codec: Optional[Union[str, Codec]] = None,
+                 compression: bool = False, reconnect_attempts: int = DEFAULT_RECONNECT_ATTEMPTS):
         """
         Initiating all parameters for connection, this method does not check or validates anything by itself, just save
         data for future use. To make sure your url is valid and accessible - use **is_ready** method of Surreal object.
@@ -41,7 +46,26 @@ class Surreal:
         :param use_http: boolean flag of using http transport. Will use websocket-client if False.
         It is strongly recommended to use websocket transport as it is more powerful.
         :param timeout: connection timeout in seconds
+        :param codec: json library to encode and decode data on the wire: "json" (default), "orjson", "ujson",
+        "msgspec" or "auto" to choose the fastest installed one. Use "cbor" for the binary CBOR protocol (websocket
+        only). Refer to:
+        https://github.com/kotolex/surrealist?tab=readme-ov-file#json-codecs
+        :param compression: http transport only, if True, responses are requested compressed (gzip or deflate) and
+        decompressed by the client, request bodies are sent as is. Refer to:
+        https://github.com/kotolex/surrealist?tab=readme-ov-file#compression
+        :param reconnect_attempts: websocket transport only, how many times in a row to try to reconnect (with
+        exponential backoff) if the connection was lost, session (signin, use, variables and live queries) is restored
+        after that. Use 0 to disable reconnect
+        :raise CompatibilityError: if compression is specified for websocket transport
         """
+        if compression and not use_http:
+            message = "Compression is available only for http transport, websocket-client does not support " \
+                      "permessage-deflate"
+            logger.error(message)
+            raise CompatibilityError(message)
+        self.codec = get_codec(codec)
+        self.compression = compression
+        self.reconnect_attempts = reconnect_attempts
         self._client = HttpConnection if use_http else WebSocketConnection
         self.db_params = {}
         if namespace:
@@ -97,7 +121,30 @@ class Surreal:
         :return: connection object to work with SurrealDB
         :raise SurrealConnectionError: if cant connect with specified parameters
         """
-        return self._client(self._url, db_params=self.db_params, credentials=self.credentials, timeout=self.timeout)
+        if self._client is HttpConnection:
+            options = {"compression": self.compression}
+        else:
+            options = {"reconnect_attempts": self.reconnect_attempts}
+        return self._client(self._url, db_params=self.db_params, credentials=self.credentials, timeout=self.timeout,
+                            codec=self.codec, **options)
+
+    async def async_connect(self) -> AsyncWebSocketConnection:
+        """
+        Actually connects to a database via asyncio-native websocket transport, uses specified namespace, database and
+        credentials parameters, so can raise exception if connect will fail. All methods of the connection are
+        coroutines
+
+        :return: asynchronous connection object to work with SurrealDB
+        :raise SurrealConnectionError: if cant connect with specified parameters
+        :raise CompatibilityError: if http transport was chosen
+        """
+        if self._client is HttpConnection:
+            message = "Asynchronous connection can use only websocket transport"
+            logger.error(message)
+            raise CompatibilityError(message)
+        return await AsyncWebSocketConnection.connect(self._url, db_params=self.db_params,
+                                                      credentials=self.credentials, timeout=self.timeout,
+                                                      codec=self.codec, reconnect_attempts=self.reconnect_attempts)
 
     def is_ready(self) -> bool:
         """
@@ -156,8 +203,9 @@ class Surreal:
         return f"Surreal(url={self._possible_url}, db_params={self.db_params}, timeout={self.timeout})"
 
     def __get(self, endpoint: str) -> Tuple[int, str]:
+        client = HttpClient(self._possible_url, timeout=DEFAULT_TIMEOUT)
         try:
-            with HttpClient(self._possible_url, timeout=DEFAULT_TIMEOUT).get(endpoint) as resp:
+            with client.get(endpoint) as resp:
                 status, text = resp.status, resp.read().decode(ENCODING)
                 body = "is empty" if not text else text
                 logger.info("Response from /%s, status_code: %s, body: %s", endpoint, status, body)
@@ -169,3 +217,5 @@ class Surreal:
             raise SurrealConnectionError(f"Cant connect to {self._possible_url}{endpoint}\n"
                                          f"Is your SurrealDB started and work on {self._possible_url} ?\n"
                                          f"Refer to https://docs.surrealdb.com/docs/introduction/start")
+        finally:
+            client.close()
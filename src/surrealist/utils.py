@@ -1,6 +1,7 @@
 import datetime
 import json
 import re
+import reprlib
 import uuid
 from typing import Any, Dict, List, Optional, Tuple, Union
 
@@ -21,6 +22,38 @@ LOG_FORMAT = '%(asctime)s : %(threadName)s : %(name)s : %(levelname)s : %(messag
 NS = "NS"
 DB = "DB"
 AC = "AC"
+# json encoder puts this marker instead of RecordId, it is unique for the process, so no user string can be the same
+_RECORD_ID_MARK = f"\x00RecordId-{uuid.uuid4().hex}\x00"
+_QUOTED_MARK = json.dumps(_RECORD_ID_MARK)
+PASSWORD = re.compile(r"(?ms)(?<=['\"]pass['\"]: ['\"]).*?(?=['\"]|\Z)")  # value of a 'pass' field
+LOG_LIMIT = 1000  # maximum length of a value in logs
+
+
+class _LogRepr(reprlib.Repr):
+    """
+    Limited representation of values for logs, results are represented by their fields, so a big result is never
+    converted to a string as a whole
+    """
+
+    def repr_SurrealResult(self, result, level):  # pylint: disable=invalid-name
+        """
+        Represents a result by its fields, the result and the query are limited like any other value
+
+        :param result: SurrealResult object
+        :param level: remaining level of nesting
+        :return: limited string representation of the result
+        """
+        value = self.repr1(result.result, level - 1)
+        query = self.repr1(result.query, level - 1)
+        return f"SurrealResult(id={result.ws_id}, status={result.status}, result={value}, query={query}, " \
+               f"code={result.code}, time={result.time})"
+
+
+_LOG_REPR = _LogRepr()
+_LOG_REPR.maxstring = _LOG_REPR.maxother = 200
+_LOG_REPR.maxlist = _LOG_REPR.maxtuple = _LOG_REPR.maxdict = 20
+_LOG_REPR.maxlevel = 4
+QUOTED_DATE = re.compile(r'["\'](d(["\']).+?)["\']+')  # Surreal date in quotes, like "d'2024-04-18T11:34:41Z'"
 
 
 def get_uuid() -> str:
@@ -35,10 +68,40 @@ def get_uuid() -> str:
 def mask_pass(text: str) -> str:
     """
     Mask the passwords in logs. Replace all 'pass':'any_pass' in logs to 'pass':'******'. Works both with ' and "
+    A password at the end of a truncated text is masked too
     :param text: text before putting it to log
     :return: text without visible passwords
     """
-    return re.sub(r"(?ms)(?<=['\"]pass['\"]: ['\"]).*?(?=['\"])", '******', text)
+    if "pass" not in text:
+        return text
+    return PASSWORD.sub('******', text)
+
+
+class LogValue:
+    """
+    Wrapper for big or secret values in logs, it costs nothing if the record is not logged: the value is converted to
+    a string only when the record is written. Strings are truncated to LOG_LIMIT characters, other values are
+    represented with limited depth and length (reprlib), passwords are masked if needed
+
+    Example: logger.info("Operation: INSERT. Table: %s, data: %s", table_name, LogValue(data))
+    """
+    __slots__ = ("_value", "_mask")
+
+    def __init__(self, value: Any, mask: bool = False):
+        self._value = value
+        self._mask = mask
+
+    def __str__(self):
+        value, suffix = self._value, ""
+        if isinstance(value, (str, bytes)):
+            text = value[:LOG_LIMIT] if isinstance(value, str) else repr(value[:LOG_LIMIT])
+            if len(value) > LOG_LIMIT:
+                suffix = f"... ({len(value)} in total)"
+        else:
+            text = _LOG_REPR.repr(value)
+        return f"{mask_pass(text) if self._mask else text}{suffix}"
+
+    __repr__ = __str__
 
 
 def to_surreal_datetime_str(dt: datetime.datetime) -> str:
@@ -69,25 +132,79 @@ def clean_dates(data: str) -> str:
     :param data: some Surreal query
     :return: data with valid Surreal dates
     """
-    return re.sub(r'["\'](d(["\']).+?)["\']+', r'\1\2', data)
+    # substring search is much faster than the regex, most queries have no dates at all
+    if "d'" not in data and 'd"' not in data:
+        return data
+    return QUOTED_DATE.sub(r'\1\2', data)
+
+
+class _Point:  # pylint: disable=too-few-public-methods
+    """
+    Tuple inside a list, it is encoded as (a, b), SurrealQL geometry point, not as an array
+    """
+    __slots__ = ("values",)
+
+    def __init__(self, values: Tuple):
+        self.values = values
+
+
+def _with_points(data: Any) -> Any:
+    """
+    Returns data with tuples inside lists wrapped to _Point, as json encoder makes arrays of tuples itself, data
+    without such tuples is returned as is
+    """
+    if isinstance(data, list):
+        if not any(isinstance(element, (tuple, list, dict)) for element in data):
+            return data
+        return [_Point(element) if isinstance(element, tuple) else _with_points(element) for element in data]
+    if isinstance(data, dict):
+        if not any(isinstance(value, (list, dict)) for value in data.values()):
+            return data
+        return {key: _with_points(value) for key, value in data.items()}
+    return data
+
+
+def _record_id_hook(ids: List[str]):
+    """
+    Returns a default hook for json encoder, it stores valid strings of RecordId (and texts of points) and returns
+    the marker instead
+    """
+
+    def hook(value: Any) -> str:
+        if isinstance(value, RecordId):
+            ids.append(value.to_valid_string())
+            return _RECORD_ID_MARK
+        if isinstance(value, _Point):
+            ids.append(tuple_to_json_str(value.values))
+            return _RECORD_ID_MARK
+        raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+    return hook
 
 
 def safe_dumps(data: Any) -> str:
     """
     Convert data to json string with special logic for RecordId (if it exists)
     We have to do it because since version 2.0 of SurrealDB it never converts string to record_id
+    Data is encoded in one pass by the C encoder of json module, RecordId (at any depth) is encoded as a marker, which
+    is replaced by the record id without quotes, tuples inside lists are replaced the same way by (a, b)
     :param data: data to convert, dict, list, tuple or JSON serializable object expected here
     :return: string
     """
     if isinstance(data, RecordId):
         return data.to_valid_string()
-    if isinstance(data, List):
-        return list_to_json_str(data)
     if isinstance(data, Tuple):
         return tuple_to_json_str(data)
-    if isinstance(data, Dict):
-        return dict_to_json_str(data)
-    return json.dumps(data)
+    ids: List[str] = []
+    text = json.dumps(_with_points(data), default=_record_id_hook(ids))
+    if not ids:
+        return text
+    parts = text.split(_QUOTED_MARK)
+    result = [parts[0]]
+    for record_id, part in zip(ids, parts[1:]):
+        result.append(record_id)
+        result.append(part)
+    return "".join(result)
 
 
 def dict_to_json_str(data: Dict) -> str:
@@ -97,18 +214,7 @@ def dict_to_json_str(data: Dict) -> str:
     :param data: dict to convert
     :return: string
     """
-    ids = {k: v for k, v in data.items() if isinstance(v, (RecordId, List, Dict))}
-    if not ids:
-        return json.dumps(data)
-    without_ids = {k: v for k, v in data.items() if k not in ids}
-    first = json.dumps(without_ids) if without_ids else ""
-    join = ", ".join([f'"{k}": {safe_dumps(v)}' for k, v in ids.items()])
-    if first:
-        first = first.rstrip("}")
-        first = f"{first}, "
-    else:
-        first = "{"
-    return f"{first}{join}}}"
+    return safe_dumps(data)
 
 
 def list_to_json_str(data: List) -> str:
@@ -118,18 +224,7 @@ def list_to_json_str(data: List) -> str:
     :param data: list of pairs to convert
     :return: string
     """
-    ids = [e for e in data if isinstance(e, (RecordId, List, Dict, Tuple))]
-    if not ids:
-        return json.dumps(data)
-    without_ids = [e for e in data if e not in ids]
-    first = json.dumps(without_ids) if without_ids else ""
-    join = ", ".join(safe_dumps(e) for e in ids)
-    if first:
-        first = first.rstrip("]")
-        first = f"{first}, "
-    else:
-        first = "["
-    return f"{first}{join}]"
+    return safe_dumps(data)
 
 
 def tuple_to_json_str(values: Tuple) -> str:
@@ -139,16 +234,7 @@ def tuple_to_json_str(values: Tuple) -> str:
     :param values: tuple to convert
     :return: string
     """
-    ids = [e for e in values if isinstance(e, (RecordId, List, Dict, Tuple))]
-    if not ids:
-        return f'({json.dumps(values).lstrip("[").rstrip("]")})'
-    without_ids = [e for e in values if e not in ids]
-    first = json.dumps(without_ids)
-    first = first.lstrip("[").rstrip("]")
-    if first:
-        first = f"{first}, "
-    join = ", ".join(f'{safe_dumps(e)}' for e in ids)
-    return f"({first}{join})"
+    return f"({safe_dumps(list(values))[1:-1]})"
 
 
 def get_table_or_record_id(table_name: str, record_id: Optional[StrOrRecord]) -> str:
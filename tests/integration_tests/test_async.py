@@ -0,0 +1,55 @@
+import asyncio
+from unittest import IsolatedAsyncioTestCase, main
+
+from tests.integration_tests.utils import URL, get_random_series
+from surrealist import AsyncDatabase, Surreal
+
+
+class TestAsync(IsolatedAsyncioTestCase):
+    async def test_connect_and_select(self):
+        surreal = Surreal(URL, namespace="test", database="test", credentials=('user_db', 'user_db'))
+        async with await surreal.async_connect() as connection:
+            self.assertTrue(connection.is_connected())
+            res = await connection.select("article")
+            self.assertFalse(res.is_error(), res)
+        self.assertFalse(connection.is_connected())
+
+    async def test_gather(self):
+        surreal = Surreal(URL, namespace="test", database="test", credentials=('user_db', 'user_db'))
+        async with await surreal.async_connect() as connection:
+            uid = get_random_series(14)
+            results = await asyncio.gather(*[connection.create("async_article", {"title": uid}) for _ in range(50)])
+            self.assertTrue(all(not res.is_error() for res in results))
+            res = await connection.count("async_article")
+            self.assertTrue(res.result >= 50)
+
+    async def test_live_with_coroutine_callback(self):
+        a_list = []
+
+        async def callback(mess):
+            a_list.append(mess)
+
+        surreal = Surreal(URL, namespace="test", database="test", credentials=('user_db', 'user_db'))
+        async with await surreal.async_connect() as connection:
+            res = await connection.live("async_article", callback=callback)
+            self.assertFalse(res.is_error(), res)
+            await connection.create("async_article", {"title": get_random_series(10)})
+            await asyncio.sleep(0.2)
+            self.assertTrue(a_list)
+            res = await connection.kill(res.result)
+            self.assertFalse(res.is_error(), res)
+
+    async def test_database(self):
+        async with await AsyncDatabase.connect(URL, 'test', 'test', credentials=('user_db', 'user_db')) as db:
+            self.assertTrue(isinstance(await db.tables(), list))
+            self.assertTrue("tables" in await db.info())
+            uid = get_random_series(14)
+            res = await db.async_article.create().content({"title": uid}).run()
+            self.assertFalse(res.is_error(), res)
+            res = await db.async_article.select().where(f"title = '{uid}'").run()
+            self.assertEqual(1, res.count())
+            self.assertTrue(await db.async_article.count() >= 1)
+
+
+if __name__ == '__main__':
+    main()
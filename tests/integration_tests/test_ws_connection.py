@@ -1,9 +1,10 @@
 import time
+from datetime import datetime, timezone
 from unittest import TestCase, main
 
 
 from tests.integration_tests.utils import URL, get_random_series
-from surrealist import Surreal, get_uuid, Database
+from surrealist import Surreal, get_uuid, Database, RecordId
 
 class TestWebSocketConnection(TestCase):
     def test_connect(self):
@@ -517,6 +518,28 @@ class TestWebSocketConnection(TestCase):
             res = connection.relate("person:tobie", "knows", "person:micha", {"since": "2024-09-15T12:34:56Z"})
             self.assertFalse(res.is_error(), res)
 
+    def test_submit_pipelined(self):
+        surreal = Surreal(URL, namespace="test", database="test", credentials=('user_db', 'user_db'))
+        with surreal.connect() as connection:
+            uid = get_random_series(14)
+            futures = [connection.submit({"method": "create", "params": ["ws_article", {"title": uid, "num": i}]})
+                       for i in range(100)]
+            results = [future.result(timeout=10) for future in futures]
+            self.assertTrue(all(not res.is_error() for res in results))
+            res = connection.query(f"SELECT count() FROM ws_article WHERE title='{uid}' GROUP ALL;")
+            self.assertEqual(100, res.result[0]["count"])
+
+    def test_cbor_round_trip(self):
+        surreal = Surreal(URL, namespace="test", database="test", credentials=('user_db', 'user_db'), codec="cbor")
+        with surreal.connect() as connection:
+            uid = get_random_series(14)
+            now = datetime.now(timezone.utc).replace(microsecond=0)
+            res = connection.create("ws_article", {"title": uid, "created": now}, uid)
+            self.assertFalse(res.is_error(), res)
+            self.assertEqual(RecordId(uid, "ws_article"), res.result["id"])
+            res = connection.select(f"ws_article:{uid}")
+            self.assertEqual(now, res.result[0]["created"])
+
 
 if __name__ == '__main__':
     main()
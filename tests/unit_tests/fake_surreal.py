@@ -0,0 +1,139 @@
+"""
+Minimal fake SurrealDB websocket server for unit tests, it answers RPC requests (json protocol) with a handler and can
+drop all connections to imitate network problems
+"""
+import base64
+import hashlib
+import json
+import socket
+import struct
+import threading
+from typing import Callable, Dict, List, Optional
+
+GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+
+def default_handler(message: Dict) -> Optional[Dict]:
+    method, params = message["method"], message.get("params") or []
+    if method == "signin":
+        return {"id": message["id"], "result": "token"}
+    if method == "live":
+        return {"id": message["id"], "result": f"live-{params[0]}"}
+    if method == "query" and params[0].startswith("LIVE"):
+        return {"id": message["id"], "result": [{"result": "live-custom", "status": "OK", "time": "1ms"}]}
+    return {"id": message["id"], "result": params[0] if params else None}
+
+
+class FakeSurreal:
+    def __init__(self, handler: Callable[[Dict], Optional[Dict]] = default_handler):
+        self._server = socket.socket()
+        self._server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._server.bind(("127.0.0.1", 0))
+        self._server.listen(64)
+        self._port = self._server.getsockname()[1]
+        self.handler = handler
+        self.clients: List[socket.socket] = []
+        self.received: List[Dict] = []
+        self.accepted = 0
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    @property
+    def url(self) -> str:
+        return f"ws://127.0.0.1:{self._port}/rpc"
+
+    def methods(self) -> List[str]:
+        return [message["method"] for message in self.received]
+
+    def _accept(self):
+        while True:
+            try:
+                client, _ = self._server.accept()
+            except OSError:
+                return
+            self.accepted += 1
+            self.clients.append(client)
+            threading.Thread(target=self._serve, args=(client,), daemon=True).start()
+
+    def _serve(self, client: socket.socket):
+        lock = threading.Lock()
+        try:
+            request = b""
+            while b"\r\n\r\n" not in request:
+                request += client.recv(1024)
+            key = [line.split(":", 1)[1].strip() for line in request.decode().split("\r\n")
+                   if line.lower().startswith("sec-websocket-key")][0]
+            accept = base64.b64encode(hashlib.sha1((key + GUID).encode()).digest()).decode()
+            client.sendall(("HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                            f"Sec-WebSocket-Accept: {accept}\r\n\r\n").encode())
+            while True:
+                opcode, data = self._read_frame(client)
+                if opcode == 8:
+                    client.close()
+                    return
+                if opcode in (1, 2):
+                    message = json.loads(data)
+                    self.received.append(message)
+                    threading.Thread(target=self._respond, args=(client, lock, message), daemon=True).start()
+        except (ConnectionError, OSError, IndexError):
+            return
+
+    def _respond(self, client: socket.socket, lock: threading.Lock, message: Dict):
+        response = self.handler(message)
+        if response is not None:
+            with lock:
+                try:
+                    self.send(client, response)
+                except OSError:
+                    pass
+
+    @staticmethod
+    def send(client: socket.socket, message: Dict):
+        payload = json.dumps(message).encode()
+        length = len(payload)
+        if length < 126:
+            head = struct.pack(">BB", 0x81, length)
+        elif length < 65536:
+            head = struct.pack(">BBH", 0x81, 126, length)
+        else:
+            head = struct.pack(">BBQ", 0x81, 127, length)
+        client.sendall(head + payload)
+
+    @staticmethod
+    def _read_exact(client: socket.socket, size: int) -> bytes:
+        buffer = b""
+        while len(buffer) < size:
+            chunk = client.recv(size - len(buffer))
+            if not chunk:
+                raise ConnectionError("closed")
+            buffer += chunk
+        return buffer
+
+    def _read_frame(self, client: socket.socket):
+        first, second = self._read_exact(client, 2)
+        length = second & 0x7F
+        if length == 126:
+            length = struct.unpack(">H", self._read_exact(client, 2))[0]
+        elif length == 127:
+            length = struct.unpack(">Q", self._read_exact(client, 8))[0]
+        mask = self._read_exact(client, 4) if second & 0x80 else b"\0\0\0\0"
+        data = bytearray(self._read_exact(client, length))
+        for i in range(length):
+            data[i] ^= mask[i % 4]
+        return first & 0x0F, bytes(data)
+
+    def drop_all(self):
+        clients, self.clients = self.clients, []
+        for client in clients:
+            try:
+                client.shutdown(socket.SHUT_RDWR)
+                client.close()
+            except OSError:
+                pass
+
+    def stop(self):
+        try:
+            self._server.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._server.close()
+        self.drop_all()
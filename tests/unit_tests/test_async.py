@@ -0,0 +1,148 @@
+import asyncio
+import sys
+from concurrent.futures import Future
+from pathlib import Path
+from unittest import TestCase, main
+from unittest.mock import MagicMock
+
+TESTS = Path(__file__).parent.parent
+SRC = TESTS.parent / "src"
+sys.path.append(str(SRC))
+
+from surrealist import (CompatibilityError, OperationOnClosedConnectionError,
+                        SurrealResult)
+from surrealist.bulk import BulkInsertReport
+from surrealist.connections.async_ws_connection import \
+    AsyncWebSocketConnection
+from surrealist.connections.ws_connection import WebSocketConnection
+from surrealist.ql.async_database import AsyncDatabase
+from tests.unit_tests.fake_surreal import FakeSurreal, default_handler
+
+
+def done(result: SurrealResult) -> Future:
+    future = Future()
+    future.set_result(result)
+    return future
+
+
+def mocked_connection(*results: SurrealResult) -> MagicMock:
+    connection = MagicMock(spec=WebSocketConnection)
+    connection.timeout = 1
+    connection.url = "ws://127.0.0.1:8000/rpc"
+    connection.rewrite_dates = True
+    connection._db_params = {"NS": "test", "DB": "test"}
+    connection.is_connected.return_value = True
+    connection.submit.side_effect = [done(result) for result in results]
+    return connection
+
+
+class TestAsyncConnection(TestCase):
+    def test_select(self):
+        connection = mocked_connection(SurrealResult(result={"id": "person:1"}))
+        result = asyncio.run(AsyncWebSocketConnection(connection).select("person", "1"))
+        self.assertEqual([{"id": "person:1"}], result.result)
+        connection.submit.assert_called_once_with({"method": "select", "params": ["person:1"]})
+
+    def test_create(self):
+        connection = mocked_connection(SurrealResult(result=[{"id": "person:john"}]))
+        result = asyncio.run(AsyncWebSocketConnection(connection).create("person", {}, "john"))
+        self.assertEqual({"id": "person:john"}, result.result)
+        connection.submit.assert_called_once_with({"method": "create", "params": ["person", {"id": "person:john"}]})
+
+    def test_query(self):
+        connection = mocked_connection(SurrealResult(result=[1]), SurrealResult(result=[{"count": 3}]))
+        async_connection = AsyncWebSocketConnection(connection)
+        result = asyncio.run(async_connection.query("RETURN $a;", {"a": 1}))
+        self.assertEqual(["RETURN $a;", {"a": 1}], result.query)
+        self.assertEqual(3, asyncio.run(async_connection.count("person")).result)
+        connection.submit.assert_called_with({"method": "query", "params": ["SELECT count() FROM person GROUP ALL;"]})
+
+    def test_timeout(self):
+        connection = mocked_connection()
+        connection.timeout = 0.05
+        connection.submit.side_effect = [Future()]
+        with self.assertRaises(TimeoutError):
+            asyncio.run(AsyncWebSocketConnection(connection).version())
+
+    def test_timeout_forgets_request(self):
+        server = FakeSurreal(lambda message: None if message["method"] == "version" else default_handler(message))
+
+        async def work():
+            async with await AsyncWebSocketConnection.connect(server.url, timeout=0.1) as connection:
+                with self.assertRaises(TimeoutError):
+                    await connection.version()
+                await asyncio.sleep(0)
+                return dict(connection.connection._client._messages)
+
+        try:
+            self.assertEqual({}, asyncio.run(work()))
+        finally:
+            server.stop()
+
+    def test_session_goes_to_connection(self):
+        connection = mocked_connection()
+        connection.use.return_value = SurrealResult(result=None)
+        connection.live.return_value = SurrealResult(result="live_id")
+        async_connection = AsyncWebSocketConnection(connection)
+        events = []
+
+        async def callback(message):
+            events.append(message)
+
+        async def session():
+            await async_connection.use("test", "other")
+            result = await async_connection.live("person", callback)
+            wrapped = connection.live.call_args.args[1]
+            await asyncio.wrap_future(wrapped({"action": "CREATE"}))
+            return result
+
+        self.assertEqual("live_id", asyncio.run(session()).result)
+        connection.use.assert_called_once_with("test", "other")
+        self.assertEqual([{"action": "CREATE"}], events)
+        connection.submit.assert_not_called()
+
+    def test_closed(self):
+        connection = mocked_connection()
+        async_connection = AsyncWebSocketConnection(connection)
+        asyncio.run(async_connection.close())
+        connection.close.assert_called_once_with()
+        connection.is_connected.return_value = False
+        with self.assertRaises(OperationOnClosedConnectionError):
+            asyncio.run(async_connection.select("person"))
+
+    def test_database(self):
+        connection = mocked_connection(SurrealResult(result={"tables": {"person": ""}}),
+                                       SurrealResult(result=[{"count": 2}]))
+
+        async def work():
+            async with AsyncDatabase.from_connection(AsyncWebSocketConnection(connection)) as db:
+                return await db.tables(), await db.person.count()
+
+        self.assertEqual((["person"], 2), asyncio.run(work()))
+        connection.close.assert_called_once_with()
+
+    def test_iteration_is_not_supported(self):
+        connection = mocked_connection()
+        select = AsyncDatabase.from_connection(AsyncWebSocketConnection(connection)).person.select()
+        with self.assertRaises(CompatibilityError):
+            next(select.iter())
+        with self.assertRaises(CompatibilityError):
+            list(select.iter_records(key="id"))
+        with self.assertRaises(CompatibilityError):
+            select.to_numpy()
+        connection.submit.assert_not_called()
+
+    def test_bulk_insert(self):
+        connection = mocked_connection()
+        report = BulkInsertReport()
+        connection.bulk_insert.return_value = report
+        db = AsyncDatabase.from_connection(AsyncWebSocketConnection(connection))
+        records = [{"age": 1}, {"age": 2}]
+        self.assertIs(report, asyncio.run(db.person.bulk_insert(records, chunk_size=1)))
+        self.assertIs(report, asyncio.run(db.bulk_insert("person", records, concurrency=2)))
+        connection.bulk_insert.assert_called_with("person", records, chunk_size=1000, concurrency=2, retries=3,
+                                                  on_progress=None)
+
+
+if __name__ == '__main__':
+    main()
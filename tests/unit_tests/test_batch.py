@@ -0,0 +1,72 @@
+import sys
+from pathlib import Path
+from unittest import TestCase, main
+
+TESTS = Path(__file__).parent.parent
+SRC = TESTS.parent / "src"
+sys.path.append(str(SRC))
+
+from surrealist import Database, Surreal, WrongParameterError
+from surrealist.connections.pool import Pool
+from tests.unit_tests.fake_surreal import FakeSurreal, default_handler
+
+
+def batch_handler(message):
+    if message["method"] != "query":
+        return default_handler(message)
+    statements = [statement for statement in message["params"][0].split("\n") if statement]
+    results = []
+    for statement in statements:
+        if "fail" in statement:
+            results.append({"result": "There was a problem with the database: failed", "status": "ERR", "time": "1ms"})
+        else:
+            results.append({"result": [{"query": statement}], "status": "OK", "time": "1ms"})
+    return {"id": message["id"], "result": results}
+
+
+class TestBatch(TestCase):
+    def setUp(self):
+        self.server = FakeSurreal(batch_handler)
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_query_many(self):
+        with Surreal(self.server.url, timeout=3).connect() as connection:
+            results = connection.query_many(["SELECT * FROM a", "SELECT * FROM fail;", "RETURN $x;"], {"x": 1})
+        self.assertEqual(["OK", "ERR", "OK"], [result.status for result in results])
+        self.assertEqual([{"query": "SELECT * FROM a;"}], results[0].result)
+        self.assertEqual("failed", results[1].result)
+        self.assertEqual("RETURN $x;", results[2].query)
+        queries = [message for message in self.server.received if message["method"] == "query"]
+        self.assertEqual(1, len(queries))
+        self.assertEqual(["SELECT * FROM a;\nSELECT * FROM fail;\nRETURN $x;", {"x": 1}], queries[0]["params"])
+
+    def test_query_many_empty(self):
+        with Surreal(self.server.url, timeout=3).connect() as connection:
+            with self.assertRaises(WrongParameterError):
+                connection.query_many([])
+
+    def test_query_many_few_statements_in_query(self):
+        with Surreal(self.server.url, timeout=3).connect() as connection:
+            with self.assertRaises(WrongParameterError):
+                connection.query_many(["RETURN 1;\nRETURN 2;", "RETURN 3;"])
+
+    def test_pool_query_many(self):
+        with Pool(Surreal(self.server.url, timeout=3).connect(), self.server.url, timeout=3) as pool:
+            results = pool.query_many(["RETURN 1;", "RETURN 2;"])
+        self.assertEqual([[{"query": "RETURN 1;"}], [{"query": "RETURN 2;"}]], [result.result for result in results])
+
+    def test_database_batch(self):
+        connection = Surreal(self.server.url, namespace="test", database="test", timeout=3).connect()
+        with Database.from_connection(connection) as db:
+            results = db.batch([db.person.create().set(name="John"), "INFO FOR DB;", db.book.create().set(title="Dune")])
+        self.assertEqual(3, len(results))
+        self.assertEqual("CREATE person SET name = $p1;", results[0].query)
+        self.assertEqual("CREATE book SET title = $p2;", results[2].query)
+        query = [message for message in self.server.received if message["method"] == "query"][0]
+        self.assertEqual({"p1": "John", "p2": "Dune"}, query["params"][1])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+import sys
+import threading
+import time
+from pathlib import Path
+from unittest import TestCase, main
+from unittest.mock import patch
+
+TESTS = Path(__file__).parent.parent
+SRC = TESTS.parent / "src"
+sys.path.append(str(SRC))
+
+from surrealist import Surreal, SurrealResult, WrongParameterError
+from surrealist.bulk import bulk_insert, chunked
+from surrealist.connections.pool import Pool
+from tests.unit_tests.fake_surreal import FakeSurreal
+
+
+class Inserter:
+    def __init__(self, fails: int = 0, delay: float = 0):
+        self.chunks = []
+        self.fails = fails
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, chunk):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            fail = self.fails > 0
+            self.fails -= 1
+        time.sleep(self.delay)
+        with self._lock:
+            self.in_flight -= 1
+            if fail:
+                return SurrealResult(error={"code": -32000, "message": "busy"})
+            self.chunks.append(chunk)
+        return SurrealResult(result=chunk)
+
+
+class TestBulkInsert(TestCase):
+    def test_chunked(self):
+        self.assertEqual([[1, 2], [3, 4], [5]], list(chunked(iter(range(1, 6)), 2)))
+        self.assertEqual([], list(chunked([], 2)))
+
+    def test_insert(self):
+        inserter = Inserter()
+        report = bulk_insert(inserter, ({"i": i} for i in range(2500)), chunk_size=1000, concurrency=2)
+        self.assertEqual(2500, report.rows)
+        self.assertEqual(3, report.chunks)
+        self.assertFalse(report.is_error())
+        self.assertEqual(list(range(2500)), sorted(record["i"] for chunk in inserter.chunks for record in chunk))
+        self.assertGreater(report.rows_per_second, 0)
+
+    def test_bounded(self):
+        consumed = []
+
+        def records():
+            for i in range(100):
+                consumed.append(i)
+                yield {"i": i}
+
+        inserter = Inserter(delay=0.01)
+        not_inserted = []
+        report = bulk_insert(inserter, records(), chunk_size=10, concurrency=3,
+                             on_progress=lambda rep: not_inserted.append(len(consumed) - rep.rows))
+        self.assertEqual(100, report.rows)
+        self.assertEqual(3, inserter.max_in_flight)
+        # records in flight and in the next chunk only
+        self.assertLessEqual(max(not_inserted), 10 * (3 + 1))
+
+    @patch("surrealist.bulk.RETRY_DELAY", 0.001)
+    def test_retry(self):
+        inserter = Inserter(fails=2)
+        report = bulk_insert(inserter, [{"i": i} for i in range(10)], chunk_size=10, concurrency=1, retries=2)
+        self.assertEqual(10, report.rows)
+        self.assertEqual(2, report.retries)
+
+    @patch("surrealist.bulk.RETRY_DELAY", 0.001)
+    def test_failed(self):
+        inserter = Inserter(fails=100)
+        report = bulk_insert(inserter, [{"i": i} for i in range(15)], chunk_size=10, concurrency=1, retries=1)
+        self.assertTrue(report.is_error())
+        self.assertEqual(0, report.rows)
+        self.assertEqual(15, report.failed_rows)
+        self.assertEqual(2, report.failed_chunks)
+        self.assertEqual(["busy", "busy"], report.errors)
+
+    def test_wrong_parameters(self):
+        with self.assertRaises(WrongParameterError):
+            bulk_insert(Inserter(), [], chunk_size=0)
+        with self.assertRaises(WrongParameterError):
+            bulk_insert(Inserter(), [], concurrency=0)
+
+
+class TestBulkInsertConnection(TestCase):
+    def setUp(self):
+        self.server = FakeSurreal()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_connection(self):
+        with Surreal(self.server.url, timeout=3).connect() as connection:
+            report = connection.bulk_insert("person", ({"i": i} for i in range(25)), chunk_size=10)
+            self.assertEqual(25, report.rows)
+            self.assertEqual(["insert"] * 3, self.server.methods())
+
+    def test_pool(self):
+        first = Surreal(self.server.url, timeout=3).connect()
+        with Pool(first, self.server.url, timeout=3, min_connections=2, max_connections=2) as pool:
+            report = pool.bulk_insert("person", ({"i": i} for i in range(25)), chunk_size=10, concurrency=2)
+            self.assertEqual(25, report.rows)
+            self.assertEqual(3, pool.stats()["methods"]["insert"]["count"])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,189 @@
+import sys
+import uuid
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from pathlib import Path
+from unittest import TestCase, main
+
+TESTS = Path(__file__).parent.parent
+SRC = TESTS.parent / "src"
+sys.path.append(str(SRC))
+
+from surrealist import RecordId
+from surrealist.cbor import decode, encode, parse_duration
+from surrealist.codecs import CborCodec, get_codec
+from surrealist.errors import CompatibilityError, TooManyNestedLevelsError
+
+
+class TestCbor(TestCase):
+    def test_rfc_examples(self):
+        # examples from RFC 8949, appendix A
+        self.assertEqual(b"\x00", encode(0))
+        self.assertEqual(b"\x17", encode(23))
+        self.assertEqual(b"\x18\x18", encode(24))
+        self.assertEqual(b"\x19\x03\xe8", encode(1000))
+        self.assertEqual(b"\x1a\x00\x0f\x42\x40", encode(1000000))
+        self.assertEqual(b"\x1b\x00\x00\x00\xe8\xd4\xa5\x10\x00", encode(1000000000000))
+        self.assertEqual(b"\x20", encode(-1))
+        self.assertEqual(b"\x38\x63", encode(-100))
+        self.assertEqual(b"\xf4", encode(False))
+        self.assertEqual(b"\xf5", encode(True))
+        self.assertEqual(b"\xf6", encode(None))
+        self.assertEqual(b"\x64IETF", encode("IETF"))
+        self.assertEqual(b"\x83\x01\x02\x03", encode([1, 2, 3]))
+        self.assertEqual(b"\xa2\x61a\x01\x61b\x82\x02\x03", encode({"a": 1, "b": [2, 3]}))
+
+    def test_decode_floats(self):
+        self.assertEqual(1.5, decode(b"\xf9\x3e\x00"))
+        self.assertEqual(100000.0, decode(b"\xfa\x47\xc3\x50\x00"))
+        self.assertEqual(1.1, decode(b"\xfb\x3f\xf1\x99\x99\x99\x99\x99\x9a"))
+
+    def test_decode_indefinite(self):
+        self.assertEqual([1, [2, 3]], decode(b"\x9f\x01\x82\x02\x03\xff"))
+        self.assertEqual({"a": 1}, decode(b"\xbf\x61a\x01\xff"))
+        self.assertEqual("streaming", decode(b"\x7f\x65strea\x64ming\xff"))
+
+    def test_big_int(self):
+        for value in (2 ** 64, -(2 ** 64) - 1, 2 ** 100):
+            self.assertEqual(value, decode(encode(value)))
+
+    def test_round_trip(self):
+        data = {"name": "Джон", "age": 33, "score": -1.5, "tags": ["a", "b"], "raw": b"\x00\x01", "active": True,
+                "nested": {"level": [1, 2, {"deep": None}]}}
+        self.assertEqual(data, decode(encode(data)))
+
+    def test_record_id(self):
+        record_id = RecordId("person:john")
+        self.assertEqual(record_id, decode(encode(record_id)))
+        self.assertEqual(b"\xc8\x82\x66person\x64john", encode(record_id))
+
+    def test_numeric_record_id(self):
+        self.assertEqual(b"\xc8\x82\x66person\x01", encode(RecordId("person:1")))
+        self.assertEqual(RecordId("person:1"), decode(encode(RecordId("person:1"))))
+
+    def test_complex_record_id(self):
+        record_id = RecordId("article:⟨c332eb25-e408-4396-814f-83a85d556493⟩")
+        self.assertEqual(record_id, decode(encode(record_id)))
+
+    def test_string_digits_record_id(self):
+        record_id = decode(b"\xc8\x82\x66person\x63123")
+        self.assertEqual("123", record_id.value)
+        self.assertEqual("person:⟨123⟩", record_id.to_valid_string())
+        self.assertEqual(b"\xc8\x82\x66person\x63123", encode(record_id))
+        self.assertEqual(b"\xc8\x82\x66person\x63123", encode(RecordId("person:⟨123⟩")))
+        self.assertEqual(123, decode(encode(RecordId("person:123"))).value)
+
+    def test_uuid_record_id(self):
+        id_ = uuid.UUID("c332eb25-e408-4396-814f-83a85d556493")
+        data = encode(RecordId.from_parts("article", id_))
+        self.assertEqual(b"\xc8\x82\x67article\xd8\x25\x50" + id_.bytes, data)
+        record_id = decode(data)
+        self.assertEqual(id_, record_id.value)
+        self.assertEqual(data, encode(record_id))
+
+    def test_record_id_with_colon(self):
+        data = b"\xc8\x82\x64time\x6812:30:00"
+        record_id = decode(data)
+        self.assertEqual(("time", "12:30:00"), (record_id.table_part, record_id.id_part))
+        self.assertEqual("time:⟨12:30:00⟩", record_id.to_valid_string())
+        self.assertEqual(data, encode(record_id))
+        self.assertEqual(data, encode(RecordId("time:⟨12:30:00⟩")))
+
+    def test_datetime(self):
+        value = datetime(2024, 4, 18, 11, 34, 41, 665249, tzinfo=timezone.utc)
+        self.assertEqual(value, decode(encode(value)))
+
+    def test_naive_datetime_is_utc(self):
+        value = datetime(2024, 4, 18, 11, 34, 41, 665249)
+        self.assertEqual(value.replace(tzinfo=timezone.utc), decode(encode(value)))
+
+    def test_datetime_string_tag(self):
+        value = decode(b"\xc0" + encode("2024-04-18T11:34:41.665249123Z"))
+        self.assertEqual(datetime(2024, 4, 18, 11, 34, 41, 665249, tzinfo=timezone.utc), value)
+
+    def test_duration(self):
+        value = timedelta(days=1, hours=2, microseconds=5)
+        self.assertEqual(value, decode(encode(value)))
+
+    def test_duration_string(self):
+        self.assertEqual(timedelta(hours=1, minutes=30), parse_duration("1h30m"))
+        self.assertEqual(timedelta(weeks=1, milliseconds=5), parse_duration("1w5ms"))
+        self.assertEqual(timedelta(microseconds=2), parse_duration("1µs1000ns"))
+        with self.assertRaises(ValueError):
+            parse_duration("1hour")
+
+    def test_uuid(self):
+        value = uuid.uuid4()
+        self.assertEqual(value, decode(encode(value)))
+        self.assertEqual(value, decode(b"\xc9" + encode(str(value))))
+
+    def test_decimal(self):
+        value = Decimal("10.0000000000000000001")
+        self.assertEqual(value, decode(encode(value)))
+
+    def test_none_tag(self):
+        self.assertIsNone(decode(b"\xc6\xf6"))
+
+    def test_unknown_type(self):
+        with self.assertRaises(TypeError):
+            encode(object())
+
+    def test_invalid_data(self):
+        with self.assertRaises(ValueError):
+            decode(b"\x83\x01")
+
+    def test_too_deep(self):
+        data = []
+        for _ in range(10_000):
+            data = [data]
+        with self.assertRaises(TooManyNestedLevelsError):
+            encode(data)
+
+
+class TestCborCodec(TestCase):
+    def test_get_codec(self):
+        codec = get_codec("cbor")
+        self.assertIsInstance(codec, CborCodec)
+        self.assertTrue(codec.binary)
+        self.assertEqual("cbor", codec.protocol)
+
+    def test_no_text(self):
+        with self.assertRaises(CompatibilityError):
+            CborCodec().dumps({})
+        with self.assertRaises(ValueError):
+            CborCodec().loads("{}")
+
+    def test_targets_are_record_ids(self):
+        codec = CborCodec()
+        data = {"id": "1", "method": "select", "params": ["person:john"]}
+        self.assertEqual({"id": "1", "method": "select", "params": [RecordId("person:john")]},
+                         codec.loads(codec.encode(data)))
+        data = {"id": "1", "method": "select", "params": ["person"]}
+        self.assertEqual(data, codec.loads(codec.encode(data)))
+
+    def test_relate_targets(self):
+        codec = CborCodec()
+        data = {"method": "relate", "params": ["person:john", "likes", "book:one"]}
+        self.assertEqual([RecordId("person:john"), "likes", RecordId("book:one")],
+                         codec.loads(codec.encode(data))["params"])
+
+    def test_create_id(self):
+        codec = CborCodec()
+        data = {"method": "create", "params": ["person", {"id": "person:john", "name": "John"}]}
+        self.assertEqual(RecordId("person:john"), codec.loads(codec.encode(data))["params"][1]["id"])
+        self.assertEqual("person:john", data["params"][1]["id"])
+
+    def test_kill_uuid(self):
+        codec = CborCodec()
+        live_id = str(uuid.uuid4())
+        data = {"method": "kill", "params": [live_id]}
+        self.assertEqual(uuid.UUID(live_id), codec.loads(codec.encode(data))["params"][0])
+
+    def test_query_is_not_changed(self):
+        codec = CborCodec()
+        data = {"method": "query", "params": ["SELECT * FROM person:john;", {"name": "a:b"}]}
+        self.assertEqual(data, codec.loads(codec.encode(data)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+import sys
+from pathlib import Path
+from unittest import TestCase, main, skipUnless
+
+TESTS = Path(__file__).parent.parent
+SRC = TESTS.parent / "src"
+sys.path.append(str(SRC))
+
+from surrealist.errors import CompatibilityError, TooManyNestedLevelsError, WrongParameterError
+from surrealist.codecs import DEFAULT_CODEC, Codec, get_codec
+from surrealist.result import to_result
+
+try:
+    import orjson
+
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+DATA = {"id": "person:john", "name": "Джон", "age": 33, "tags": ["a", "b"], "active": True, "score": 1.5,
+        "nested": {"level": [1, 2, {"deep": None}]}}
+
+
+class TestCodecs(TestCase):
+    def test_default(self):
+        self.assertIs(DEFAULT_CODEC, get_codec())
+        self.assertIs(DEFAULT_CODEC, get_codec("json"))
+        self.assertEqual("json", get_codec().name)
+
+    def test_codec_object(self):
+        codec = Codec()
+        self.assertIs(codec, get_codec(codec))
+
+    def test_unknown(self):
+        with self.assertRaises(WrongParameterError):
+            get_codec("wrong")
+
+    def test_auto(self):
+        self.assertIsInstance(get_codec("auto"), Codec)
+
+    def test_round_trip(self):
+        for name in ("json", "orjson", "ujson", "msgspec", "auto"):
+            with self.subTest(f"codec {name}"):
+                try:
+                    codec = get_codec(name)
+                except CompatibilityError:
+                    continue
+                self.assertEqual(DATA, codec.loads(codec.dumps(DATA)))
+                self.assertEqual(DATA, codec.loads(codec.encode(DATA)))
+                self.assertIsInstance(codec.encode(DATA), bytes)
+
+    def test_ensure_ascii(self):
+        self.assertEqual('{"name": "Джон"}', DEFAULT_CODEC.dumps({"name": "Джон"}))
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            DEFAULT_CODEC.loads("{not a json")
+
+    def test_too_deep(self):
+        deep = []
+        for _ in range(100_000):
+            deep = [deep]
+        with self.assertRaises(TooManyNestedLevelsError):
+            DEFAULT_CODEC.dumps(deep)
+
+    @skipUnless(HAS_ORJSON, "orjson is not installed")
+    def test_orjson(self):
+        codec = get_codec("orjson")
+        self.assertEqual("orjson", codec.name)
+        self.assertEqual('{"1":2}', codec.dumps({1: 2}))
+
+    def test_to_result_with_codec(self):
+        for name in ("json", "auto"):
+            with self.subTest(f"codec {name}"):
+                result = to_result('{"result": [{"id": "person:1"}], "status": "OK", "time": "1ms"}', get_codec(name))
+                self.assertEqual([{"id": "person:1"}], result.result)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,162 @@
+import sys
+from pathlib import Path
+from unittest import TestCase, main, skipUnless
+
+TESTS = Path(__file__).parent.parent
+SRC = TESTS.parent / "src"
+sys.path.append(str(SRC))
+
+from surrealist import QueryError, SurrealResult, WrongParameterError
+from surrealist.columnar import infer_kind, to_columns, widen
+from surrealist.ql.statements.select import Select
+from tests.unit_tests.test_ql_select import PagesConnection
+
+try:
+    import numpy
+
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+try:
+    import pyarrow
+
+    HAS_ARROW = True
+except ImportError:
+    HAS_ARROW = False
+
+try:
+    import pandas
+
+    HAS_PANDAS = True
+except ImportError:
+    HAS_PANDAS = False
+
+RECORDS = [{"id": "person:1", "age": 20, "score": 1.5, "active": True},
+           {"id": "person:2", "age": None, "score": 2, "active": False, "tags": ["a"]}]
+
+
+class TestColumnar(TestCase):
+    def test_infer_kind(self):
+        params = (
+            ("null", []),
+            ("null", [None, None]),
+            ("bool", [True, None, False]),
+            ("int", [1, None, 2]),
+            ("float", [1, 2.5]),
+            ("object", [1, True]),
+            ("object", ["a", 1]),
+            ("object", [{"a": 1}]),
+        )
+        for expected, values in params:
+            with self.subTest(f"kind of {values}"):
+                self.assertEqual(expected, infer_kind(values))
+
+    def test_widen(self):
+        self.assertEqual("int", widen("null", "int"))
+        self.assertEqual("int", widen("int", "null"))
+        self.assertEqual("float", widen("float", "int"))
+        self.assertEqual("object", widen("bool", "int"))
+
+    def test_to_columns(self):
+        self.assertEqual({"id": ["person:1", "person:2"], "age": [20, None], "score": [1.5, 2],
+                          "active": [True, False], "tags": [None, ["a"]]}, to_columns(RECORDS))
+        self.assertEqual({"tags": [None, ["a"]]}, to_columns(RECORDS, ["tags"]))
+        with self.assertRaises(WrongParameterError):
+            to_columns([1, 2])
+
+    def test_records(self):
+        self.assertEqual([], SurrealResult(result=None).records())
+        self.assertEqual([{"a": 1}], SurrealResult(result={"a": 1}).records())
+        self.assertEqual(RECORDS, SurrealResult(result=RECORDS).records())
+        with self.assertRaises(QueryError):
+            SurrealResult(error="error").records()
+
+    @skipUnless(HAS_NUMPY, "numpy is not installed")
+    def test_to_numpy(self):
+        columns = SurrealResult(result=RECORDS).to_numpy()
+        self.assertEqual(["id", "age", "score", "active", "tags"], list(columns))
+        self.assertEqual("float64", columns["age"].dtype)
+        self.assertTrue(numpy.isnan(columns["age"][1]))
+        self.assertEqual([1.5, 2.0], columns["score"].tolist())
+        self.assertEqual("bool", columns["active"].dtype)
+        self.assertEqual([None, ["a"]], columns["tags"].tolist())
+
+    @skipUnless(HAS_NUMPY, "numpy is not installed")
+    def test_to_numpy_dtypes(self):
+        columns = SurrealResult(result=RECORDS).to_numpy(dtypes={"score": "float32", "age": "int32"},
+                                                         fields=["age", "score"])
+        self.assertEqual(["age", "score"], list(columns))
+        self.assertEqual(("int32", "float32"), (columns["age"].dtype, columns["score"].dtype))
+        self.assertEqual([20, 0], columns["age"].tolist())
+
+    @skipUnless(HAS_ARROW and HAS_NUMPY, "pyarrow is not installed")
+    def test_to_arrow(self):
+        batch = SurrealResult(result=RECORDS).to_arrow(types={"score": pyarrow.float32()})
+        self.assertEqual(2, batch.num_rows)
+        self.assertEqual(pyarrow.int64(), batch.schema.field("age").type)
+        self.assertEqual(pyarrow.float32(), batch.schema.field("score").type)
+        self.assertEqual([20, None], batch.column("age").to_pylist())
+        self.assertEqual([None, ["a"]], batch.column("tags").to_pylist())
+
+    @skipUnless(HAS_PANDAS and HAS_NUMPY, "pandas is not installed")
+    def test_to_pandas(self):
+        frame = SurrealResult(result=RECORDS).to_pandas(dtypes={"age": "Int64"})
+        self.assertEqual((2, 5), frame.shape)
+        self.assertEqual("Int64", str(frame["age"].dtype))
+        self.assertTrue(frame["age"].isna()[1])
+
+    @skipUnless(HAS_NUMPY, "numpy is not installed")
+    def test_select_to_numpy(self):
+        connection = PagesConnection(25)
+        columns = Select(connection, "person").to_numpy(limit=10)
+        self.assertEqual(list(range(1, 26)), columns["id"].tolist())
+        self.assertEqual("int64", columns["num"].dtype)
+        self.assertEqual(3, len(connection.queries))
+
+    @skipUnless(HAS_NUMPY, "numpy is not installed")
+    def test_select_to_numpy_widens(self):
+        pages = iter([[{"a": 1}], [{"a": None, "b": "x"}], [{"a": 2.5, "b": None}], []])
+        select = Select(None, "person")
+        select._connection = type("Pages", (), {"query": lambda _, q, v=None: SurrealResult(result=next(pages))})()
+        columns = select.to_numpy(limit=1)
+        self.assertEqual("float64", columns["a"].dtype)
+        self.assertEqual(1.0, columns["a"][0])
+        self.assertTrue(numpy.isnan(columns["a"][1]))
+        self.assertEqual([None, "x", None], columns["b"].tolist())
+
+    @skipUnless(HAS_ARROW and HAS_NUMPY, "pyarrow is not installed")
+    def test_select_to_arrow(self):
+        batch = Select(PagesConnection(5), "person").to_arrow(limit=2, key="id")
+        self.assertEqual([1, 2, 3, 4, 5], batch.column("id").to_pylist())
+
+    @skipUnless(HAS_PANDAS and HAS_NUMPY, "pandas is not installed")
+    def test_select_to_pandas(self):
+        frame = Select(PagesConnection(5), "person").to_pandas(limit=2, prefetch=2)
+        self.assertEqual([1, 2, 3, 4, 5], frame["num"].tolist())
+
+    @skipUnless(HAS_ARROW and HAS_NUMPY, "pyarrow is not installed")
+    def test_select_to_arrow_types(self):
+        batch = Select(PagesConnection(5), "person").to_arrow(limit=2, types={"num": pyarrow.int32()})
+        self.assertEqual(pyarrow.int32(), batch.schema.field("num").type)
+        self.assertEqual([1, 2, 3, 4, 5], batch.column("num").to_pylist())
+
+    @skipUnless(HAS_PANDAS and HAS_NUMPY, "pandas is not installed")
+    def test_select_to_pandas_dtypes(self):
+        pages = iter([[{"a": 1}], [{"a": None}], [{"a": 3}], []])
+        select = Select(None, "person")
+        select._connection = type("Pages", (), {"query": lambda _, q, v=None: SurrealResult(result=next(pages))})()
+        frame = select.to_pandas(limit=1, dtypes={"a": "Int64"})
+        self.assertEqual("Int64", str(frame["a"].dtype))
+        self.assertEqual([1, None, 3], [None if pandas.isna(value) else value for value in frame["a"]])
+
+    @skipUnless(HAS_NUMPY, "numpy is not installed")
+    def test_select_to_numpy_error(self):
+        select = Select(None, "person")
+        select._connection = type("Error", (), {"query": lambda *_: SurrealResult(error="error")})()
+        with self.assertRaises(QueryError):
+            select.to_numpy()
+
+
+if __name__ == '__main__':
+    main()
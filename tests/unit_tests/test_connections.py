@@ -9,6 +9,7 @@ sys.path.append(str(SRC))
 from surrealist import Surreal, SurrealConnectionError
 from surrealist.clients.http_client import mask_opts
 from surrealist.result import to_result, SurrealResult
+from tests.unit_tests.fake_surreal import FakeSurreal
 
 WRONG_URL = "http://127.0.0.1:9999/"
 URL = "http://127.0.0.1:8000"
@@ -84,6 +85,19 @@ class TestConst(TestCase):
         res = mask_opts({"headers": {"Authorization": "Bearer 123456"}, "method": "GET"})
         self.assertEqual(res, {"headers": {"Authorization": "Bearer ******"}, "method": "GET"})
 
+    def test_rewrite_dates(self):
+        server = FakeSurreal()
+        query = "CREATE person SET born = \"d'2024-04-18T11:34:41Z'\";"
+        try:
+            with Surreal(server.url, timeout=3).connect() as connection:
+                self.assertEqual("CREATE person SET born = d'2024-04-18T11:34:41Z';", connection.query(query).result)
+                self.assertEqual(query, connection.query(query, rewrite_dates=False).result)
+                connection.rewrite_dates = False
+                self.assertEqual(query, connection.query(query).result)
+                self.assertNotEqual(query, connection.query(query, rewrite_dates=True).result)
+        finally:
+            server.stop()
+
 
 if __name__ == '__main__':
     main()
@@ -337,6 +337,10 @@ PERMISSIONS
         text = "DEFINE ACCESS token ON DATABASE TYPE RECORD ALGORITHM HS256 KEY 'some_key';"
         self.assertEqual(text, DefineAccessRecord(None, "token").algorithm(Algorithm.HS256, "some_key").to_str())
 
+        text = 'DEFINE ACCESS acc ON DATABASE TYPE RECORD SIGNUP CREATE user SET role = "user", email = "$email";'
+        query = DefineAccessRecord(None, "acc").signup(Create(None, "user").set(role="user", email="$email"))
+        self.assertEqual((text, {}), query.to_query())
+
         text= "DEFINE ACCESS token ON DATABASE TYPE RECORD ALGORITHM RS256 KEY 'some_key' WITH ISSUER KEY 'issuer_key';"
         self.assertEqual(text, DefineAccessRecord(None, "token").algorithm(Algorithm.RS256, "some_key", issuer_key="issuer_key").to_str())
 
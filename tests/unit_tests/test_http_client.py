@@ -0,0 +1,203 @@
+import gzip
+import json
+import sys
+import threading
+import time
+import zlib
+from http.client import RemoteDisconnected
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest import TestCase, main
+
+TESTS = Path(__file__).parent.parent
+SRC = TESTS.parent / "src"
+sys.path.append(str(SRC))
+
+from surrealist import Surreal
+from surrealist.clients.http_client import HttpClient
+from surrealist.errors import CompatibilityError, HttpClientError
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    received = []
+    ports = []
+    drop_connection = False
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        Handler.received.append((dict(self.headers), body))
+        Handler.ports.append(self.client_address[1])
+        # imitates a server, which closes keep-alive connection without telling the client
+        self.close_connection = Handler.drop_connection
+        answer = json.dumps({"size": len(body)}).encode()
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            answer = gzip.compress(answer)
+            self.send_response(200)
+            self.send_header("Content-Encoding", "gzip")
+        else:
+            self.send_response(200)
+        self.send_header("Content-Length", str(len(answer)))
+        self.end_headers()
+        self.wfile.write(answer)
+
+    def log_message(self, *_args):
+        pass
+
+
+class FakeResponse:
+    def __init__(self, body: bytes, encoding: str):
+        self._body = body
+        self.headers = {"Content-Encoding": encoding}
+
+    def read(self):
+        return self._body
+
+
+class StaleConnection:
+    """
+    Keep-alive connection, which was closed by the server: on sending the request or on reading the response
+    """
+
+    def __init__(self, fails_on_send: bool):
+        self.fails_on_send = fails_on_send
+        self.requests = 0
+
+    def request(self, *_args, **_kwargs):
+        self.requests += 1
+        if self.fails_on_send:
+            raise BrokenPipeError("Broken pipe")
+
+    def getresponse(self):
+        raise RemoteDisconnected("Remote end closed connection without response")
+
+    def close(self):
+        pass
+
+
+class TestHttpClient(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        cls.url = f"http://127.0.0.1:{cls.server.server_port}/"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        Handler.received.clear()
+        Handler.ports.clear()
+        Handler.drop_connection = False
+
+    def test_no_compression(self):
+        client = HttpClient(self.url)
+        with client.post({"data": "a" * 2000}, "rpc") as resp:
+            self.assertEqual({"size": 2012}, json.loads(client.read(resp)))
+        headers, _ = Handler.received[0]
+        self.assertNotIn("Content-Encoding", headers)
+        self.assertEqual("identity", headers["Accept-Encoding"])
+
+    def test_compressed_response(self):
+        client = HttpClient(self.url, compression=True)
+        with client.post({"data": "a" * 2000}, "rpc") as resp:
+            self.assertEqual("gzip", resp.headers["Content-Encoding"])
+            self.assertEqual({"size": 2012}, json.loads(client.read(resp)))
+        headers, body = Handler.received[0]
+        self.assertNotIn("Content-Encoding", headers)
+        self.assertEqual({"data": "a" * 2000}, json.loads(body))
+        self.assertEqual("gzip, deflate", headers["Accept-Encoding"])
+
+    def test_keep_alive(self):
+        client = HttpClient(self.url)
+        for _ in range(3):
+            with client.post({"data": "a"}, "rpc") as resp:
+                self.assertEqual(200, resp.status)
+                client.read(resp)
+        self.assertEqual(1, len(set(Handler.ports)))
+        self.assertEqual(1, client._pool.idle_count())
+        client.close()
+        self.assertEqual(0, client._pool.idle_count())
+
+    def test_idle_timeout(self):
+        client = HttpClient(self.url, idle_timeout=0)
+        for _ in range(2):
+            with client.post({"data": "a"}, "rpc") as resp:
+                client.read(resp)
+        self.assertEqual(2, len(set(Handler.ports)))
+        client.close()
+
+    def test_reconnect_on_reset(self):
+        Handler.drop_connection = True
+        client = HttpClient(self.url)
+        for _ in range(3):
+            with client.post({"data": "a"}, "rpc") as resp:
+                self.assertEqual({"size": 13}, json.loads(client.read(resp)))
+            # let the server close the connection
+            time.sleep(0.1)
+        self.assertEqual(3, len(set(Handler.ports)))
+        client.close()
+
+    def stale_client(self, stale: StaleConnection) -> HttpClient:
+        client = HttpClient(self.url)
+        acquire = client._pool.acquire
+        client._pool.acquire = lambda: (stale, True) if stale.requests == 0 else acquire()
+        return client
+
+    def test_repeat_not_sent_request(self):
+        stale = StaleConnection(fails_on_send=True)
+        with self.stale_client(stale).post({"data": "a"}, "rpc") as resp:
+            self.assertEqual(200, resp.status)
+        self.assertEqual(1, stale.requests)
+        self.assertEqual(1, len(Handler.received))
+
+    def test_sent_post_is_not_repeated(self):
+        stale = StaleConnection(fails_on_send=False)
+        with self.assertRaises(HttpClientError):
+            self.stale_client(stale).post({"data": "a"}, "rpc")
+        self.assertEqual(1, stale.requests)
+        self.assertEqual([], Handler.received)
+
+    def test_sent_get_is_repeated(self):
+        stale = StaleConnection(fails_on_send=False)
+        with self.stale_client(stale).get("status") as resp:
+            self.assertEqual(501, resp.status)
+        self.assertEqual(1, stale.requests)
+
+    def test_unread_response_is_not_reused(self):
+        client = HttpClient(self.url)
+        with client.post({"data": "a"}, "rpc"):
+            pass
+        self.assertEqual(0, client._pool.idle_count())
+
+    def test_pool_is_bounded(self):
+        client = HttpClient(self.url, pool_size=1)
+        first, second = client.post({"data": "a"}, "rpc"), client.post({"data": "b"}, "rpc")
+        for resp in (first, second):
+            with resp:
+                client.read(resp)
+        self.assertEqual(1, client._pool.idle_count())
+        client.close()
+
+    def test_connection_refused(self):
+        client = HttpClient("http://127.0.0.1:9999/")
+        with self.assertRaises(HttpClientError):
+            client.get("status")
+
+    def test_read_deflate(self):
+        self.assertEqual(b"text", HttpClient.read(FakeResponse(zlib.compress(b"text"), "deflate")))
+        raw = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+        self.assertEqual(b"text", HttpClient.read(FakeResponse(raw.compress(b"text") + raw.flush(), "deflate")))
+
+    def test_read_plain(self):
+        self.assertEqual(b"text", HttpClient.read(FakeResponse(b"text", "")))
+
+    def test_websocket_compression(self):
+        with self.assertRaises(CompatibilityError):
+            Surreal("ws://127.0.0.1:8000/rpc", compression=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,359 @@
+import sys
+import threading
+import time
+from pathlib import Path
+from unittest import TestCase, main
+
+TESTS = Path(__file__).parent.parent
+SRC = TESTS.parent / "src"
+sys.path.append(str(SRC))
+
+from surrealist import Connection, Surreal
+from surrealist.connections.pool import Pool
+from surrealist.connections.pool_stats import Histogram
+from surrealist.errors import (OperationOnClosedConnectionError,
+                               PoolExhaustedError)
+from tests.unit_tests.fake_surreal import FakeSurreal, default_handler
+
+
+def wait_for(predicate, timeout=5):
+    end = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > end:
+            raise TimeoutError("Condition is not met")
+        time.sleep(0.01)
+
+
+class TestPoolHealth(TestCase):
+    def setUp(self):
+        self.server = FakeSurreal()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def pool(self, **kwargs) -> Pool:
+        first = Surreal(self.server.url, timeout=3).connect()
+        return Pool(first, self.server.url, timeout=3, min_connections=2, max_connections=4, **kwargs)
+
+    def test_closed_connection_is_evicted_on_checkout(self):
+        with self.pool() as pool:
+            for connection in list(pool._idle):
+                connection.close()
+            self.assertEqual("RETURN 1", pool.query("RETURN 1").result)
+            wait_for(lambda: pool.health_stats()["replacements"] == 2)
+            self.assertEqual({"evictions": 2, "replacements": 2, "failed_health_checks": 0}, pool.health_stats())
+            # the request could wait for a new connection, before replacements are ready
+            self.assertIn(pool.connections_count, (2, 3))
+            self.assertTrue(all(connection.is_connected() for connection in pool._idle))
+
+    def test_failed_health_check(self):
+        def handler(message):
+            if message["method"] == "version":
+                return {"id": message["id"], "error": {"code": -32000, "message": "not ready"}}
+            return default_handler(message)
+
+        self.server.handler = handler
+        with self.pool(health_check_interval=0.05) as pool:
+            wait_for(lambda: pool.health_stats()["replacements"] >= 2)
+            stats = pool.health_stats()
+            self.assertGreaterEqual(stats["failed_health_checks"], 2)
+            self.assertGreaterEqual(stats["evictions"], 2)
+
+    def test_healthy_pool(self):
+        with self.pool(health_check_interval=0.05) as pool:
+            wait_for(lambda: self.server.methods().count("version") >= 4)
+            self.assertEqual({"evictions": 0, "replacements": 0, "failed_health_checks": 0}, pool.health_stats())
+            self.assertEqual(2, pool.connections_count)
+
+
+class TestPoolRecycling(TestCase):
+    def setUp(self):
+        self.server = FakeSurreal()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def pool(self, **kwargs) -> Pool:
+        first = Surreal(self.server.url, timeout=3).connect()
+        return Pool(first, self.server.url, timeout=3, min_connections=2, **kwargs)
+
+    def test_no_cap(self):
+        with self.pool(max_connections=100) as pool:
+            self.assertEqual(100, pool._max)
+
+    def test_idle_shrink(self):
+        with self.pool(max_connections=4, idle_timeout=0.1) as pool:
+            pool._create_new_connection()
+            pool._create_new_connection()
+            self.assertEqual(4, pool.connections_count)
+            wait_for(lambda: pool.connections_count == 2)
+            time.sleep(0.3)
+            self.assertEqual(2, pool.connections_count)
+            self.assertEqual("RETURN 1", pool.query("RETURN 1").result)
+
+    def test_max_lifetime(self):
+        with self.pool(max_connections=4, max_lifetime=0.1) as pool:
+            first = set(pool._idle)
+            wait_for(lambda: not first & set(pool._idle) and len(pool._idle) == 2)
+            self.assertEqual(2, pool.connections_count)
+            self.assertTrue(all(not connection.is_connected() for connection in first))
+            self.assertEqual(0, pool.health_stats()["evictions"])
+
+    def test_live_query_pins_connection(self):
+        with self.pool(max_connections=4, max_lifetime=0.1) as pool:
+            pool.custom_live("LIVE SELECT * FROM person", callback=print)
+            pinned = [connection for connection in pool._idle if connection in pool._lives.values()]
+            self.assertEqual(1, len(pinned))
+            time.sleep(0.4)
+            self.assertIn(pinned[0], pool._idle)
+            self.assertTrue(pinned[0].is_connected())
+
+    def test_replacement_does_not_block_recycle(self):
+        with self.pool(max_connections=4, max_lifetime=0.1) as pool:
+            released = threading.Event()
+            pool._create_new_connection = lambda: released.wait(5)
+            first = list(pool._idle)
+            try:
+                wait_for(lambda: all(not connection.is_connected() for connection in first), timeout=1)
+                self.assertEqual(0, pool.connections_count)
+            finally:
+                released.set()
+
+
+class TestPoolCheckout(TestCase):
+    def setUp(self):
+        self.server = FakeSurreal()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def pool(self, **kwargs) -> Pool:
+        first = Surreal(self.server.url, timeout=3).connect()
+        return Pool(first, self.server.url, timeout=3, min_connections=2, max_connections=2, **kwargs)
+
+    def test_exhausted(self):
+        with self.pool(acquire_timeout=0.1) as pool:
+            busy = [pool._checkout(), pool._checkout()]
+            with self.assertRaises(PoolExhaustedError):
+                pool.query("RETURN 1")
+            stats = pool.wait_stats()
+            self.assertEqual(3, stats["checkouts"])
+            self.assertEqual(1, stats["waits"])
+            self.assertEqual(1, stats["timeouts"])
+            self.assertEqual(0, stats["waiting"])
+            self.assertGreaterEqual(stats["max_wait"], 0.1)
+            for connection in busy:
+                pool._checkin(connection)
+            self.assertEqual("RETURN 1", pool.query("RETURN 1").result)
+
+    def test_fifo(self):
+        with self.pool() as pool:
+            busy = [pool._checkout(), pool._checkout()]
+            order = []
+            threads = []
+            for name in "abc":
+                thread = threading.Thread(target=lambda n=name: order.append((n, pool._checkout())))
+                thread.start()
+                threads.append(thread)
+                wait_for(lambda count=len(threads): pool.wait_stats()["waiting"] == count)
+            pool._checkin(busy[0])
+            wait_for(lambda: len(order) == 1)
+            pool._checkin(busy[1])
+            wait_for(lambda: len(order) == 2)
+            pool._checkin(order[0][1])
+            for thread in threads:
+                thread.join(1)
+            self.assertEqual(["a", "b", "c"], [name for name, _ in order])
+            self.assertIs(busy[0], order[0][1])
+            self.assertIs(busy[1], order[1][1])
+
+    def test_close_wakes_waiters(self):
+        pool = self.pool()
+        busy = [pool._checkout(), pool._checkout()]
+        errors = []
+
+        def wait():
+            try:
+                pool._checkout()
+            except OperationOnClosedConnectionError as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=wait)
+        thread.start()
+        wait_for(lambda: pool.wait_stats()["waiting"] == 1)
+        pool.close()
+        thread.join(1)
+        self.assertEqual(1, len(errors))
+        for connection in busy:
+            pool._checkin(connection)
+            self.assertFalse(connection.is_connected())
+
+
+class TestPoolStats(TestCase):
+    def setUp(self):
+        self.server = FakeSurreal()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def pool(self, **kwargs) -> Pool:
+        first = Surreal(self.server.url, timeout=3).connect()
+        return Pool(first, self.server.url, timeout=3, min_connections=2, max_connections=2, **kwargs)
+
+    def test_stats(self):
+        def handler(message):
+            if message["params"] == ["ERROR"]:
+                return {"id": message["id"], "error": {"code": -32000, "message": "wrong"}}
+            return default_handler(message)
+
+        self.server.handler = handler
+        with self.pool() as pool:
+            for _ in range(3):
+                pool.query("RETURN 1")
+            pool.query("ERROR")
+            pool.kill("live-id")
+            stats = pool.stats()
+            self.assertEqual(2, stats["connections"])
+            self.assertEqual(0, stats["busy"])
+            self.assertEqual(2, stats["idle"])
+            self.assertEqual(5, stats["wait"]["count"])
+            self.assertEqual(4, stats["methods"]["query"]["count"])
+            self.assertEqual(1, stats["methods"]["query"]["errors"])
+            self.assertEqual(1, stats["methods"]["kill"]["count"])
+            self.assertGreater(stats["methods"]["query"]["p99"], 0)
+            self.assertEqual({"ErrorResult": 1}, stats["errors"])
+            self.assertEqual({"created": 2, "closed": 0, "evictions": 0, "replacements": 0,
+                              "failed_health_checks": 0}, stats["churn"])
+
+    def test_exception_is_counted(self):
+        with self.pool(acquire_timeout=0.1) as pool:
+            pool._stats.observe_call("query", 0.1, "TimeoutError")
+            self.assertEqual({"TimeoutError": 1}, pool.stats()["errors"])
+
+    def test_metrics_callback(self):
+        reports = []
+        with self.pool(metrics_callback=reports.append, metrics_interval=0.05):
+            wait_for(lambda: len(reports) >= 2)
+        self.assertEqual(2, reports[0]["connections"])
+
+    def test_histogram(self):
+        histogram = Histogram()
+        self.assertEqual(0.0, histogram.percentile(50))
+        for _ in range(90):
+            histogram.observe(0.001)
+        for _ in range(10):
+            histogram.observe(1.0)
+        snapshot = histogram.snapshot()
+        self.assertEqual(100, snapshot["count"])
+        self.assertAlmostEqual(0.1009, snapshot["average"])
+        self.assertEqual(1.0, snapshot["max"])
+        self.assertTrue(0.001 <= snapshot["p50"] < 0.002)
+        self.assertTrue(0.001 <= snapshot["p90"] < 0.002)
+        self.assertEqual(1.0, snapshot["p99"])
+        histogram.observe(100)
+        self.assertEqual(100, histogram.percentile(100))
+
+
+class TestPoolMethods(TestCase):
+    def setUp(self):
+        self.server = FakeSurreal()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def pool(self) -> Pool:
+        first = Surreal(self.server.url, timeout=3).connect()
+        return Pool(first, self.server.url, timeout=3, min_connections=2, max_connections=3)
+
+    def test_all_methods(self):
+        methods = [name for name in dir(Connection) if not name.startswith("_")]
+        for name in methods:
+            with self.subTest(name):
+                self.assertTrue(hasattr(Pool, name))
+
+    def test_native_rpc(self):
+        with self.pool() as pool:
+            pool.insert("person", [{"name": "a"}, {"name": "b"}])
+            pool.select("person")
+            pool.merge("person", {"age": 1})
+            self.assertEqual(["insert", "select", "merge"], self.server.methods())
+            self.assertEqual(3, len(pool.stats()["methods"]))
+
+    def test_session_is_applied_to_all(self):
+        with self.pool() as pool:
+            pool.let("a", 1)
+            pool.use("ns", "db")
+            busy = pool._checkout()
+            pool.query("RETURN $a")
+            self.assertEqual(["let", "use", "use", "let", "query"], self.server.methods())
+            pool._checkin(busy)
+            # a new connection gets the session too
+            first, second = pool._checkout(), pool._checkout()
+            self.server.received.clear()
+            pool._create_new_connection()
+            pool.query("RETURN $a")
+            self.assertEqual(["use", "let", "query"], self.server.methods())
+            pool._checkin(first)
+            pool._checkin(second)
+
+    def test_session_keeps_last_values(self):
+        with self.pool() as pool:
+            for value in range(3):
+                pool.let("a", value)
+            pool.let("b", 1)
+            pool.unset("b")
+            self.assertEqual([("let", ("a", 2), {})], pool._session.calls())
+            busy = pool._checkout()
+            self.server.received.clear()
+            pool.query("RETURN $a")
+            self.assertEqual(["let", "query"], self.server.methods())
+            self.assertEqual(["a", 2], self.server.received[0]["params"])
+            pool._checkin(busy)
+
+    def test_unset_is_applied_to_others(self):
+        with self.pool() as pool:
+            pool.let("a", 1)
+            busy = pool._checkout()
+            pool.query("RETURN $a")
+            pool._checkin(busy)
+            busy = pool._checkout()
+            pool.unset("a")
+            other = pool._checkout()
+            pool._checkin(busy)
+            self.server.received.clear()
+            pool.query("RETURN $a")
+            self.assertEqual(["unset", "query"], self.server.methods())
+            pool._checkin(other)
+
+    def test_kill_goes_to_live_connection(self):
+        with self.pool() as pool:
+            live_id = pool.custom_live("LIVE SELECT * FROM person", callback=print).result
+            owner = [connection for connection in pool._idle if connection._lives][0]
+            busy = pool._checkout()
+            if busy is not owner:
+                pool._checkin(busy)
+                busy = pool._checkout()
+            # the owner is busy, kill goes to it anyway
+            self.assertTrue(busy is owner)
+            self.assertFalse(pool.kill(live_id).is_error())
+            self.assertEqual({}, owner._lives)
+            self.assertEqual({}, pool._lives)
+            pool._checkin(busy)
+
+    def test_failed_session_method_is_not_repeated(self):
+        def handler(message):
+            if message["method"] == "let":
+                return {"id": message["id"], "error": {"code": -32000, "message": "wrong"}}
+            return default_handler(message)
+
+        self.server.handler = handler
+        with self.pool() as pool:
+            self.assertTrue(pool.let("a", 1).is_error())
+            busy = pool._checkout()
+            pool.query("RETURN 1")
+            self.assertEqual(["let", "query"], self.server.methods())
+            pool._checkin(busy)
+
+
+if __name__ == '__main__':
+    main()
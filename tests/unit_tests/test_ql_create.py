@@ -1,5 +1,6 @@
 from unittest import TestCase, main
 
+from surrealist import Param, WrongParameterError
 from surrealist.ql.statements.create import Create
 
 
@@ -51,6 +52,37 @@ class TestCreate(TestCase):
         self.assertEqual('CREATE person SET age = 46, username = "john-smith" RETURN interests;',
                          Create(None, "person").set(age=46, username="john-smith").returns("interests").to_str())
 
+    def test_to_query(self):
+        create = Create(None, "person").content({"name": "Tobie", "skills": ["Rust"]})
+        self.assertEqual(("CREATE person CONTENT $p1;", {"p1": {"name": "Tobie", "skills": ["Rust"]}}),
+                         create.to_query())
+
+    def test_run_sends_variables(self):
+        class FakeConnection:
+            def query(self, query, variables=None):
+                return query, variables
+
+        self.assertEqual(("CREATE person SET age = $p1;", {"p1": 46}),
+                         Create(FakeConnection(), "person").set(age=46).run())
+        self.assertEqual(("CREATE person;", None), Create(FakeConnection(), "person").run())
+
+    def test_compile_with_params(self):
+        class FakeConnection:
+            def query(self, query, variables=None):
+                return query, variables
+
+        compiled = Create(FakeConnection(), "person").content({"name": Param("name"), "tags": ["a"]}).compile()
+        self.assertEqual(("CREATE person CONTENT {\"name\": $name, \"tags\": $p1};", {"p1": ["a"], "name": "John"}),
+                         compiled.run(name="John"))
+        with self.assertRaises(WrongParameterError):
+            compiled.run(p1=["b"])
+
+    def test_params_to_str(self):
+        self.assertEqual("CREATE person SET name = $name, age = 5;",
+                         Create(None, "person").set(name=Param("name"), age=5).to_str())
+        self.assertEqual('CREATE person CONTENT {"name": $name};',
+                         Create(None, "person").content({"name": Param("name")}).to_str())
+
 
 if __name__ == "__main__":
     main()
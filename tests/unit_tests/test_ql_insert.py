@@ -73,7 +73,7 @@ class TestInsert(TestCase):
         self.assertTrue(insert.is_valid())
 
     def test_bulk_with_records(self):
-        text = 'INSERT INTO person [{"name": "Jaime", "id": person:jaime}, {"name": "Tobie", "id": person:tobie}];'
+        text = 'INSERT INTO person [{"id": person:jaime, "name": "Jaime"}, {"id": person:tobie, "name": "Tobie"}];'
         data = [{'id': RecordId("person:jaime"), 'name': "Jaime"},
                 {'id': RecordId("person:tobie"), 'name': "Tobie"}]
         insert = Insert(None, "person", data)
@@ -86,6 +86,18 @@ class TestInsert(TestCase):
         self.assertEqual(text, insert.to_str())
         self.assertTrue(insert.is_valid())
 
+    def test_to_query(self):
+        insert = Insert(None, "company", ("name", "founded"), ("SurrealDB", "2021-09-10"), ("Other", "2022-01-01"))
+        self.assertEqual(("INSERT INTO company (name, founded) VALUES ($p1, $p2), ($p3, $p4);",
+                          {"p1": "SurrealDB", "p2": "2021-09-10", "p3": "Other", "p4": "2022-01-01"}),
+                         insert.to_query())
+
+    def test_to_query_record_id_inlined(self):
+        data = [{"name": "first"}, {"name": "second", "author": RecordId("author:john")}]
+        query, variables = Insert(None, "book", data).to_query()
+        self.assertEqual(Insert(None, "book", data).to_str(), query)
+        self.assertEqual({}, variables)
+
 
 if __name__ == '__main__':
     main()
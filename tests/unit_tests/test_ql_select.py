@@ -1,9 +1,28 @@
+import time
 from unittest import TestCase, main
 
-from surrealist import Database
+from surrealist import Database, QueryError, SurrealResult, WrongParameterError
 from surrealist.ql.statements.select import Select
 
 
+class PagesConnection:
+    """ Returns records with ids from 1 to total by pages and stores all queries """
+
+    def __init__(self, total: int):
+        self.total = total
+        self.queries = []
+
+    def query(self, query, variables=None):
+        self.queries.append((query, variables))
+        last = variables["last"] if variables else 0
+        limit = query.split("LIMIT ")[1].rstrip(";")
+        if " START AT " in limit:
+            limit, last = limit.split(" START AT ")
+        limit, last = int(limit), int(last)
+        ids = range(last + 1, min(last + limit, self.total) + 1)
+        return SurrealResult(result=[{"id": i, "num": i} for i in ids], status="OK")
+
+
 class TestSelect(TestCase):
     def test_select_default(self):
         select = Select(None, "person")
@@ -184,6 +203,103 @@ class TestSelect(TestCase):
         text = "SELECT * FROM (SELECT * FROM events WHERE type = 'active') LIMIT 5 PARALLEL;"
         self.assertEqual(text, Select(None, sub_query).limit(5).parallel().to_str())
 
+    def test_iter_by_key(self):
+        connection = PagesConnection(5)
+        pages = list(Select(connection, "person").iter(limit=2, key="num"))
+        self.assertEqual([[1, 2], [3, 4], [5]], [[row["id"] for row in page.result] for page in pages])
+        self.assertEqual([("SELECT * FROM person ORDER BY num LIMIT 2;", None),
+                          ("SELECT * FROM person WHERE num > $last ORDER BY num LIMIT 2;", {"last": 2}),
+                          ("SELECT * FROM person WHERE num > $last ORDER BY num LIMIT 2;", {"last": 4})],
+                         [(query, variables) for query, variables in connection.queries])
+
+    def test_iter_by_id_with_where(self):
+        connection = PagesConnection(2)
+        select = Select(connection, "person").with_index("idx").where("age > 18").OR("admin = true")
+        list(select.iter(limit=1, key="id"))
+        self.assertEqual("SELECT * FROM person WITH INDEX idx WHERE age > 18 OR admin = true ORDER BY id LIMIT 1;",
+                         connection.queries[0][0])
+        self.assertEqual("SELECT * FROM person WITH INDEX idx WHERE (age > 18 OR admin = true) AND id > <record> $last "
+                         "ORDER BY id LIMIT 1;", connection.queries[1][0])
+        self.assertEqual(3, len(connection.queries))
+
+    def test_iter_by_key_other_statements(self):
+        connection = PagesConnection(3)
+        for statement in (Select(connection, "person").order_by("name"), Select(connection, "person").fetch("friends"),
+                          Select(connection, "person").where("age > 18").limit(10)):
+            with self.subTest(statement.to_str()):
+                with self.assertRaises(WrongParameterError):
+                    list(statement.iter(limit=2, key="id"))
+                with self.assertRaises(WrongParameterError):
+                    list(statement.iter(limit=2, key="id", prefetch=2))
+        self.assertEqual([], connection.queries)
+
+    def test_iter_by_missing_key(self):
+        with self.assertRaises(ValueError):
+            list(Select(PagesConnection(3), "person").iter(limit=1, key="name"))
+
+
+    def test_iter_prefetch(self):
+        connection = PagesConnection(7)
+        pages = list(Select(connection, "person").iter(limit=2, prefetch=3))
+        self.assertEqual([[1, 2], [3, 4], [5, 6], [7]], [[row["id"] for row in page.result] for page in pages])
+        self.assertEqual(6, len(connection.queries))  # two pages after the last one were requested in advance
+
+    def test_iter_prefetch_by_key(self):
+        connection = PagesConnection(7)
+        pages = list(Select(connection, "person").iter(limit=2, key="num", prefetch=2))
+        self.assertEqual([[1, 2], [3, 4], [5, 6], [7]], [[row["id"] for row in page.result] for page in pages])
+        self.assertEqual(4, len(connection.queries))
+
+    def test_iter_prefetch_stops_early(self):
+        connection = PagesConnection(1000)
+        iterator = Select(connection, "person").iter(limit=1, key="num", prefetch=2)
+        next(iterator)
+        iterator.close()
+        time.sleep(0.3)
+        count = len(connection.queries)
+        time.sleep(0.3)
+        self.assertEqual(count, len(connection.queries))
+        self.assertLess(count, 10)
+
+    def test_iter_prefetch_errors(self):
+        with self.assertRaises(ValueError):
+            next(Select(PagesConnection(1), "person").iter(prefetch=-1))
+        with self.assertRaises(ValueError):
+            list(Select(PagesConnection(3), "person").iter(limit=1, key="name", prefetch=2))
+
+    def test_iter_stops_on_error(self):
+        for prefetch in (0, 2):
+            with self.subTest(f"prefetch {prefetch}"):
+                connection = PagesConnection(5)
+                connection.query = lambda query, variables=None: SurrealResult(result="error", status="ERR")
+                pages = list(Select(connection, "person").iter(limit=1, prefetch=prefetch))
+                self.assertEqual(1, len(pages))
+                self.assertTrue(pages[0].is_error())
+
+    def test_iter_records(self):
+        records = Select(PagesConnection(5), "person").iter_records(limit=2, prefetch=2)
+        self.assertEqual([1, 2, 3, 4, 5], [row["id"] for row in records])
+
+    def test_iter_records_error(self):
+        connection = PagesConnection(5)
+        connection.query = lambda query, variables=None: SurrealResult(result="error", status="ERR")
+        with self.assertRaises(QueryError):
+            list(Select(connection, "person").iter_records())
+
+    def test_compile(self):
+        connection = PagesConnection(0)
+        connection.query = lambda query, variables=None: connection.queries.append((query, variables))
+        compiled = Select(connection, "person").where("age > $age").limit(10).compile()
+        self.assertEqual("SELECT * FROM person WHERE age > $age LIMIT 10;", compiled.query)
+        compiled.run(age=18)
+        compiled.run(age=30)
+        self.assertEqual([("SELECT * FROM person WHERE age > $age LIMIT 10;", {"age": 18}),
+                          ("SELECT * FROM person WHERE age > $age LIMIT 10;", {"age": 30})], connection.queries)
+
+    def test_compile_invalid(self):
+        with self.assertRaises(WrongParameterError):
+            Select(None, "person").only().compile()
+
 
 if __name__ == '__main__':
     main()
@@ -93,6 +93,16 @@ class TestUpdate(TestCase):
         self.assertEqual(text, upd.to_str())
         self.assertTrue(upd.is_valid())
 
+    def test_to_query(self):
+        update = Update(None, "person").set(age=30, tags=["a", "b"]).where("name = 'John'")
+        self.assertEqual(("UPDATE person SET age = $p1, tags = $p2 WHERE name = 'John';", {"p1": 30, "p2": ["a", "b"]}),
+                         update.to_query())
+        self.assertEqual("UPDATE person SET age = 30, tags = [\"a\", \"b\"] WHERE name = 'John';", update.to_str())
+
+    def test_to_query_merge_with_date(self):
+        update = Update(None, "person", record_id="john").merge({"born": "d'2024-04-18T11:34:41Z'"})
+        self.assertEqual(("UPDATE person:john MERGE {\"born\": \"d'2024-04-18T11:34:41Z'\"};", {}), update.to_query())
+
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,129 @@
+import sys
+import threading
+import time
+from concurrent.futures import Future
+from pathlib import Path
+from unittest import TestCase, main
+
+TESTS = Path(__file__).parent.parent
+SRC = TESTS.parent / "src"
+sys.path.append(str(SRC))
+
+from surrealist import Surreal
+from surrealist.errors import (OperationOnClosedConnectionError,
+                               WebSocketConnectionClosedError)
+from tests.unit_tests.fake_surreal import FakeSurreal, default_handler
+
+
+def wait_for(predicate, timeout=5):
+    end = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > end:
+            raise TimeoutError("Condition is not met")
+        time.sleep(0.01)
+
+
+class TestReconnect(TestCase):
+    def setUp(self):
+        self.server = FakeSurreal()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_restore_session(self):
+        with Surreal(self.server.url, "ns", "db", credentials=("root", "root"), timeout=3).connect() as connection:
+            connection.let("x", 1)
+            connection.let("y", 2)
+            connection.unset("y")
+            self.server.received.clear()
+            self.server.drop_all()
+            wait_for(lambda: self.server.accepted == 2)
+            self.assertEqual("SELECT 1", connection.query("SELECT 1").result)
+            self.assertEqual(["signin", "use", "let", "query"], self.server.methods())
+            self.assertEqual(["x", 1], self.server.received[2]["params"])
+
+    def test_restore_live(self):
+        events = []
+        with Surreal(self.server.url, "ns", "db", credentials=("root", "root"), timeout=3).connect() as connection:
+            live_id = connection.live("person", callback=events.append).result
+            self.assertEqual("live-person", live_id)
+            self.server.received.clear()
+            self.server.drop_all()
+            wait_for(lambda: "live" in self.server.methods())
+            wait_for(lambda: connection._client.is_connected())
+            FakeSurreal.send(self.server.clients[0], {"result": {"id": "live-person", "action": "CREATE"}})
+            wait_for(lambda: events)
+            connection.kill(live_id)
+            self.assertEqual({}, connection._lives)
+
+    def test_in_flight_fails_fast(self):
+        def handler(message):
+            return None if message["method"] == "query" else default_handler(message)
+
+        self.server.handler = handler
+        with Surreal(self.server.url, "ns", "db", timeout=10).connect() as connection:
+            future = connection.submit({"method": "query", "params": ["SELECT 1"]})
+            wait_for(lambda: "query" in self.server.methods())
+            start = time.monotonic()
+            self.server.drop_all()
+            with self.assertRaises(WebSocketConnectionClosedError):
+                future.result(timeout=5)
+            self.assertLess(time.monotonic() - start, 2)
+
+    def test_request_waits_for_reconnect(self):
+        with Surreal(self.server.url, "ns", "db", timeout=3).connect() as connection:
+            self.server.drop_all()
+            wait_for(lambda: connection._client.is_reconnecting())
+            result = []
+            thread = threading.Thread(target=lambda: result.append(connection.version()))
+            thread.start()
+            thread.join(5)
+            self.assertEqual(1, len(result))
+            self.assertTrue(connection.is_connected())
+
+    def test_give_up(self):
+        connection = Surreal(self.server.url, "ns", "db", timeout=3, reconnect_attempts=2).connect()
+        self.server.stop()
+        wait_for(lambda: not connection.is_connected())
+        with self.assertRaises(OperationOnClosedConnectionError):
+            connection.version()
+
+    def test_no_reconnect(self):
+        connection = Surreal(self.server.url, "ns", "db", timeout=3, reconnect_attempts=0).connect()
+        self.server.drop_all()
+        wait_for(lambda: not connection.is_connected())
+        self.assertEqual(1, self.server.accepted)
+
+    def test_close_while_restoring(self):
+        errors = []
+        hook, threading.excepthook = threading.excepthook, errors.append
+        try:
+            connection = Surreal(self.server.url, "ns", "db", timeout=3).connect()
+            client = connection._client
+            client._on_reconnect = client.close
+            self.server.drop_all()
+            wait_for(lambda: self.server.accepted == 2)
+            wait_for(lambda: not connection.is_connected())
+            time.sleep(0.1)
+        finally:
+            threading.excepthook = hook
+        self.assertEqual([], errors)
+
+    def test_close_does_not_reconnect(self):
+        connection = Surreal(self.server.url, "ns", "db", timeout=3).connect()
+        connection.close()
+        time.sleep(0.3)
+        self.assertEqual(1, self.server.accepted)
+        self.assertFalse(connection.is_connected())
+
+    def test_no_request_is_registered_after_close(self):
+        connection = Surreal(self.server.url, "ns", "db", timeout=3).connect()
+        client = connection._client
+        connection.close()
+        with self.assertRaises(WebSocketConnectionClosedError):
+            client._send_now(Future(), {"id": "1", "method": "version"}, None)
+        self.assertEqual({}, client._messages)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,7 @@
 from unittest import TestCase, main
 
-from surrealist import ResultHasNoValuesError
-from surrealist.result import SurrealResult, to_result
+from surrealist import ResultHasNoValuesError, WrongParameterError
+from surrealist.result import SurrealResult, split_result, to_result
 
 params = (
     (
@@ -174,6 +174,47 @@ class TestResult(TestCase):
         self.assertEqual("80a0d6cf-d5ff-41ce-a29a-27f04fb2e3df", res.ws_id)
         self.assertEqual('There was a problem with authentication', res.result)
 
+    def test_split_result(self):
+        websocket = SurrealResult(result=[{"result": [1], "status": "OK", "time": "1ms"},
+                                          {"result": "wrong", "status": "ERR", "time": "2ms"}])
+        http = to_result([{"result": [1], "status": "OK", "time": "1ms"}, {"result": "wrong", "status": "ERR",
+                                                                            "time": "2ms"}])
+        for result in (websocket, http):
+            first, second = split_result(result, ["RETURN 1;", "fail;"])
+            self.assertEqual(([1], "OK", "1ms", "RETURN 1;"), (first.result, first.status, first.time, first.query))
+            self.assertEqual(("wrong", "ERR", "2ms", "fail;"), (second.result, second.status, second.time,
+                                                                 second.query))
+
+    def test_split_result_error(self):
+        results = split_result(SurrealResult(error={"code": -32000, "message": "Parse error"}), ["a;", "b;"])
+        self.assertEqual([("Parse error", "ERR", "a;"), ("Parse error", "ERR", "b;")],
+                         [(result.result, result.status, result.query) for result in results])
+
+    def test_split_result_wrong_count(self):
+        result = SurrealResult(result=[{"result": [1], "status": "OK"}, {"result": [2], "status": "OK"},
+                                       {"result": [3], "status": "OK"}])
+        with self.assertRaises(WrongParameterError):
+            split_result(result, ["RETURN 1;", "RETURN 2; RETURN 3;"])
+
+    def test_from_frame(self):
+        frame = {"id": 1, "result": [{"id": "person:john"}], "level": 10}
+        res = SurrealResult.from_frame(frame)
+        self.assertIs(frame["result"], res.result)
+        self.assertEqual(res, SurrealResult(**frame))
+        self.assertEqual({"level": 10}, res.additional_info)
+        self.assertFalse(hasattr(res, "__dict__"))
+        frame["level"] = 20
+        self.assertEqual({"level": 10}, res.additional_info)
+        self.assertEqual({}, SurrealResult.from_frame({"id": 1, "result": []}).additional_info)
+
+    def test_db_problem_not_error(self):
+        res = SurrealResult(result="There was a problem with the database: Parse error")
+        self.assertEqual(("OK", "Parse error"), (res.status, res.result))
+
+    def test_to_result_nested_not_dict(self):
+        res = to_result({"id": 1, "result": [5]})
+        self.assertEqual((1, [5]), (res.ws_id, res.result))
+
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,125 @@
+import sys
+import time
+from pathlib import Path
+from unittest import TestCase, main
+
+TESTS = Path(__file__).parent.parent
+SRC = TESTS.parent / "src"
+sys.path.append(str(SRC))
+
+from surrealist import RoutingPolicy, Surreal
+from surrealist.connections.routing_pool import RoutingPool, is_read_only
+from tests.unit_tests.fake_surreal import FakeSurreal, default_handler
+
+
+class TestIsReadOnly(TestCase):
+    def test_methods(self):
+        self.assertTrue(is_read_only("select", "person"))
+        self.assertTrue(is_read_only("count", "person"))
+        self.assertFalse(is_read_only("create", "person", {}))
+        self.assertFalse(is_read_only("custom_live", "LIVE SELECT * FROM person"))
+
+    def test_queries(self):
+        for query in ("SELECT * FROM person", "select * from person;", "INFO FOR DB;", "RETURN 1; SELECT * FROM a;",
+                      "SHOW CHANGES FOR TABLE person SINCE 1"):
+            with self.subTest(query):
+                self.assertTrue(is_read_only("query", query))
+        for query in ("CREATE person", "SELECT * FROM person; DELETE person", "SELECT * FROM (UPDATE person)",
+                      "LET $a = 1", "", "SELECT fn::make() FROM person", "BEGIN; SELECT * FROM a; COMMIT"):
+            with self.subTest(query):
+                self.assertFalse(is_read_only("query", query))
+
+
+class TestRoutingPool(TestCase):
+    def setUp(self):
+        self.primary = FakeSurreal()
+        self.replica = FakeSurreal()
+
+    def tearDown(self):
+        self.primary.stop()
+        self.replica.stop()
+
+    def pool(self, urls=None, **kwargs) -> RoutingPool:
+        urls = urls or [self.primary.url, self.replica.url]
+        first = Surreal(urls[0], timeout=1).connect()
+        return RoutingPool(first, urls, timeout=1, min_connections=2, max_connections=2, **kwargs)
+
+    @staticmethod
+    def queries(server: FakeSurreal) -> int:
+        return server.methods().count("query")
+
+    def test_round_robin(self):
+        with self.pool() as pool:
+            for _ in range(4):
+                pool.query("SELECT * FROM person")
+            self.assertEqual(2, self.queries(self.primary))
+            self.assertEqual(2, self.queries(self.replica))
+            self.assertEqual(4, pool.connections_count)
+
+    def test_writes_go_to_primary(self):
+        with self.pool() as pool:
+            for _ in range(4):
+                pool.query("CREATE person")
+            self.assertEqual(4, self.queries(self.primary))
+            self.assertEqual(0, self.queries(self.replica))
+
+    def test_latency(self):
+        def slow(message):
+            time.sleep(0.05)
+            return default_handler(message)
+
+        self.replica.handler = slow
+        with self.pool(routing=RoutingPolicy.LATENCY) as pool:
+            for _ in range(10):
+                pool.query("SELECT * FROM person")
+            self.assertEqual(1, self.queries(self.replica))
+            self.assertEqual(9, self.queries(self.primary))
+
+    def test_session_goes_to_all_nodes(self):
+        with self.pool() as pool:
+            pool.let("a", 1)
+            self.assertEqual(["let"], self.primary.methods())
+            self.assertEqual(["let"], self.replica.methods())
+            pool.let("b", 2)
+            pool.unset("b")
+            self.assertEqual([("let", ("a", 1), {})], pool._session.calls())
+
+    def test_least_outstanding(self):
+        with self.pool(routing=RoutingPolicy.LEAST_OUTSTANDING) as pool:
+            pool._nodes[0].outstanding = 5
+            for _ in range(3):
+                pool.query("SELECT * FROM person")
+            self.assertEqual(3, self.queries(self.replica))
+
+    def test_failed_node_is_ejected(self):
+        with self.pool(eject_time=60) as pool:
+            self.replica.stop()
+            for _ in range(4):
+                self.assertEqual("SELECT 1", pool.query("SELECT 1").result)
+            stats = pool.stats()
+            self.assertEqual(1, stats["nodes"][self.replica.url]["ejections"])
+            self.assertTrue(stats["nodes"][self.replica.url]["ejected"])
+            self.assertFalse(stats["nodes"][self.primary.url]["ejected"])
+            self.assertEqual("round_robin", stats["routing"])
+
+    def test_node_is_down_on_start(self):
+        with self.pool(urls=[self.primary.url, "ws://127.0.0.1:9/rpc"], eject_time=60) as pool:
+            self.assertEqual("SELECT 1", pool.query("SELECT 1").result)
+            self.assertIsNone(pool._nodes[1].pool)
+            self.assertEqual(2, pool.connections_count)
+
+    def test_connecting_node_is_skipped(self):
+        with self.pool(urls=[self.primary.url, "ws://127.0.0.1:9/rpc"], eject_time=0) as pool:
+            node = pool._nodes[1]
+            node.connecting.acquire()
+            try:
+                start = time.monotonic()
+                self.assertEqual("SELECT 1", pool.query("SELECT 1").result)
+                self.assertLess(time.monotonic() - start, 0.5)
+                self.assertIsNone(node.pool)
+            finally:
+                node.connecting.release()
+
+
+if __name__ == '__main__':
+    main()
@@ -3,7 +3,7 @@ from unittest import TestCase, main
 
 from surrealist.utils import (to_datetime, to_surreal_datetime_str, mask_pass, clean_dates,
                               dict_to_json_str,
-                              RecordId, list_to_json_str, tuple_to_json_str)
+                              RecordId, list_to_json_str, tuple_to_json_str, safe_dumps, LogValue, LOG_LIMIT)
 
 
 class TestUtils(TestCase):
@@ -37,15 +37,15 @@ class TestUtils(TestCase):
         self.assertEqual(dict_to_json_str({}), "{}")
         self.assertEqual(dict_to_json_str({"a": 1}), '{"a": 1}')
         self.assertEqual(dict_to_json_str({"a": 1, "b": 2}), '{"a": 1, "b": 2}')
-        self.assertEqual(dict_to_json_str({"a": 1, "b": RecordId("person:john"), "c": 3}), '{"a": 1, "c": 3, "b": person:john}')
-        self.assertEqual(dict_to_json_str({"b": RecordId("person:john"), "c": 3}), '{"c": 3, "b": person:john}')
+        self.assertEqual(dict_to_json_str({"a": 1, "b": RecordId("person:john"), "c": 3}), '{"a": 1, "b": person:john, "c": 3}')
+        self.assertEqual(dict_to_json_str({"b": RecordId("person:john"), "c": 3}), '{"b": person:john, "c": 3}')
         self.assertEqual(dict_to_json_str({"b": RecordId("person:john")}), '{"b": person:john}')
 
     def test_list_to_json_str(self):
         self.assertEqual(list_to_json_str([]), "[]")
         self.assertEqual(list_to_json_str([1, "2"]), '[1, "2"]')
         self.assertEqual(list_to_json_str([1, RecordId("person:john")]), '[1, person:john]')
-        self.assertEqual(list_to_json_str([RecordId("person:john"), 1]), '[1, person:john]')
+        self.assertEqual(list_to_json_str([RecordId("person:john"), 1]), '[person:john, 1]')
         self.assertEqual(list_to_json_str([RecordId("person:john"), RecordId("person:tobie")]), '[person:john, person:tobie]')
         self.assertEqual(list_to_json_str([1, [RecordId("person:john"), RecordId("person:tobie")]]), '[1, [person:john, person:tobie]]')
 
@@ -53,10 +53,44 @@ class TestUtils(TestCase):
         self.assertEqual(tuple_to_json_str(tuple()), "()")
         self.assertEqual(tuple_to_json_str((1, None)), '(1, null)')
         self.assertEqual(tuple_to_json_str((1, RecordId("person:john"))), '(1, person:john)')
-        self.assertEqual(tuple_to_json_str((RecordId("person:john"), 1)), '(1, person:john)')
+        self.assertEqual(tuple_to_json_str((RecordId("person:john"), 1)), '(person:john, 1)')
         self.assertEqual(tuple_to_json_str((RecordId("person:john"), RecordId("person:tobie"))), '(person:john, person:tobie)')
         self.assertEqual(tuple_to_json_str((1, [RecordId("person:john"), RecordId("person:tobie")])), '(1, [person:john, person:tobie])')
 
+    def test_safe_dumps_nested(self):
+        data = {"a": [1, {"b": RecordId("person:john"), "c": ["x", RecordId("person:⟨tobie-1⟩")]}], "d": "person:jane"}
+        self.assertEqual('{"a": [1, {"b": person:john, "c": ["x", person:⟨tobie-1⟩]}], "d": "person:jane"}',
+                         safe_dumps(data))
+        self.assertEqual('"\\u0000"', safe_dumps("\x00"))
+        with self.assertRaises(TypeError):
+            safe_dumps({"a": object()})
+
+    def test_safe_dumps_nested_tuples(self):
+        self.assertEqual("[1, (2, 3)]", list_to_json_str([1, (2, 3)]))
+        self.assertEqual('{"a": [(1.5, 2), [(3, person:john)]]}',
+                         safe_dumps({"a": [(1.5, 2), [(3, RecordId("person:john"))]]}))
+        self.assertEqual("(1, (2, 3))", safe_dumps((1, (2, 3))))
+
+    def test_clean_dates_without_dates(self):
+        text = "SELECT * FROM person WHERE name = 'Ted' AND city = \"Paris\";"
+        self.assertIs(text, clean_dates(text))
+
+    def test_log_value(self):
+        self.assertEqual("{'a': 1}", str(LogValue({"a": 1})))
+        self.assertEqual("text", f"{LogValue('text')}")
+        text = "x" * (LOG_LIMIT + 10)
+        self.assertEqual(f"{'x' * LOG_LIMIT}... ({LOG_LIMIT + 10} in total)", str(LogValue(text)))
+        self.assertEqual("[0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15, 16, 17, 18, 19, ...]",
+                         str(LogValue(list(range(100)))))
+
+    def test_log_value_mask(self):
+        self.assertEqual('{"user": "root", "pass": "123"}', str(LogValue('{"user": "root", "pass": "123"}')))
+        self.assertEqual('{"user": "root", "pass": "******"}',
+                         str(LogValue('{"user": "root", "pass": "123"}', mask=True)))
+        self.assertEqual("[{'pass': '******', 'user': 'root'}]", str(LogValue([{"user": "root", "pass": "123"}], True)))
+        text = f'{"x" * (LOG_LIMIT - 15)}"pass": "{"1" * 20}"}}'
+        self.assertEqual(f'{"x" * (LOG_LIMIT - 15)}"pass": "******... ({len(text)} in total)',
+                         str(LogValue(text, mask=True)))
 
 
 if __name__ == '__main__':